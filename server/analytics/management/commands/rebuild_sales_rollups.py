@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from analytics.utils import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily sales rollups from orders, in batches of days"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First day to rebuild (YYYY-MM-DD)")
+        parser.add_argument("--end", help="Last day to rebuild (YYYY-MM-DD)")
+        parser.add_argument(
+            "--batch-days",
+            type=int,
+            default=31,
+            help="Days recomputed per transaction (default: 31)",
+        )
+
+    def handle(self, *args, **options):
+        start = self._parse(options["start"], "--start")
+        end = self._parse(options["end"], "--end")
+        if options["batch_days"] < 1:
+            raise CommandError("--batch-days must be at least 1")
+
+        days = rebuild_rollups(start, end, batch_days=options["batch_days"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt sales rollups for {days} day(s)")
+        )
+
+    def _parse(self, value, flag):
+        if value is None:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"{flag} must be a date in YYYY-MM-DD format")
+        return day
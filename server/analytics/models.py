@@ -0,0 +1,38 @@
+from django.db import models
+from products.models import Product
+
+
+class DailySales(models.Model):
+    """Store-wide totals for one day, excluding cancelled orders"""
+
+    date = models.DateField(unique=True)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    units = models.IntegerField(default=0)
+    order_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.date}: {self.revenue}"
+
+
+class DailyProductSales(models.Model):
+    """Per-product totals for one day; category is copied at sale time"""
+
+    date = models.DateField()
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    category = models.CharField(max_length=100, blank=True)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    units = models.IntegerField(default=0)
+    order_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("date", "product")
+        indexes = [models.Index(fields=["date", "category"])]
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.date} - {self.product_id}: {self.revenue}"
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+
+class DailySalesSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    order_count = serializers.IntegerField()
+
+
+class CategorySalesSerializer(serializers.Serializer):
+    category = serializers.CharField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    order_count = serializers.IntegerField()
+
+
+class ProductSalesSerializer(serializers.Serializer):
+    product = serializers.IntegerField(source="product_id")
+    title = serializers.CharField(source="product__title")
+    category = serializers.CharField(source="product__category")
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    order_count = serializers.IntegerField()
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+from orders.models import Order
+from .utils import record_orders
+
+
+@receiver(post_init, sender=Order)
+def remember_order_status(sender, instance, **kwargs):
+    """
+    Remember the status the order was loaded with so a later save can tell
+    whether it moved into or out of "cancelled"
+    """
+    instance._rollup_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=Order)
+def update_rollups_on_status_change(sender, instance, created, **kwargs):
+    """
+    Keep the rollups in sync when an order is cancelled (or un-cancelled)
+    through a regular save, e.g. from the admin. New orders are recorded
+    explicitly at checkout, once their items exist.
+    """
+    previous = getattr(instance, "_rollup_status", None)
+    instance._rollup_status = instance.status
+
+    if created or previous is None or previous == instance.status:
+        return
+
+    if instance.status == "cancelled":
+        record_orders([instance.pk], sign=-1)
+    elif previous == "cancelled":
+        record_orders([instance.pk])
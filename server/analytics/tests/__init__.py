@@ -0,0 +1,7 @@
+from .test_utils import SalesRollupTests
+from .test_views import SalesReportViewsTests
+
+__all__ = [
+    "SalesRollupTests",
+    "SalesReportViewsTests",
+]
@@ -0,0 +1,137 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from products.models import Product
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderItem
+from ..models import DailySales, DailyProductSales
+from ..utils import rebuild_rollups, retract_orders
+
+User = get_user_model()
+
+
+class SalesRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="test123"
+        )
+        self.laptop = Product.objects.create(
+            title="Laptop",
+            price=Decimal("500.00"),
+            inventory_count=10,
+            category="Electronics",
+        )
+        self.shirt = Product.objects.create(
+            title="Shirt",
+            price=Decimal("20.00"),
+            inventory_count=10,
+            category="Clothing",
+        )
+        self.today = timezone.localdate()
+
+    def checkout(self, *lines):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        cart, _ = Cart.objects.get_or_create(user=self.user)
+        for product, quantity in lines:
+            CartItem.objects.create(cart=cart, product=product, quantity=quantity)
+        response = client.post(reverse("order-list-create"), {})
+        return Order.objects.get(id=response.data["id"])
+
+    def test_checkout_updates_rollups(self):
+        """Test that checkout adds its lines to the daily rollups"""
+        self.checkout((self.laptop, 1), (self.shirt, 3))
+        self.checkout((self.shirt, 1))
+
+        daily = DailySales.objects.get(date=self.today)
+        self.assertEqual(daily.revenue, Decimal("580.00"))
+        self.assertEqual(daily.units, 5)
+        self.assertEqual(daily.order_count, 2)
+
+        shirt = DailyProductSales.objects.get(date=self.today, product=self.shirt)
+        self.assertEqual(shirt.revenue, Decimal("80.00"))
+        self.assertEqual(shirt.units, 4)
+        self.assertEqual(shirt.order_count, 2)
+        self.assertEqual(shirt.category, "Clothing")
+
+    def test_cancelling_order_retracts_it(self):
+        """Test that saving an order as cancelled removes it from the rollups"""
+        order = self.checkout((self.laptop, 2))
+        self.checkout((self.shirt, 1))
+
+        order.status = "cancelled"
+        order.save()
+
+        daily = DailySales.objects.get(date=self.today)
+        self.assertEqual(daily.revenue, Decimal("20.00"))
+        self.assertEqual(daily.order_count, 1)
+        laptop = DailyProductSales.objects.get(date=self.today, product=self.laptop)
+        self.assertEqual(laptop.units, 0)
+
+        # Moving between non-cancelled states leaves the totals alone
+        order.status = "pending"
+        order.save()
+        order.status = "paid"
+        order.save()
+        self.assertEqual(
+            DailySales.objects.get(date=self.today).revenue, Decimal("1020.00")
+        )
+
+    def test_retract_orders_in_bulk(self):
+        """Test retracting several orders at once"""
+        first = self.checkout((self.laptop, 1))
+        second = self.checkout((self.laptop, 1), (self.shirt, 2))
+
+        retract_orders([first.id, second.id])
+
+        daily = DailySales.objects.get(date=self.today)
+        self.assertEqual(daily.revenue, Decimal("0.00"))
+        self.assertEqual(daily.units, 0)
+        self.assertEqual(daily.order_count, 0)
+
+    def test_rebuild_matches_incremental_totals(self):
+        """Test that a rebuild reproduces the incrementally maintained rows"""
+        self.checkout((self.laptop, 1), (self.shirt, 2))
+        cancelled = self.checkout((self.shirt, 5))
+        cancelled.status = "cancelled"
+        cancelled.save()
+
+        expected = list(
+            DailyProductSales.objects.filter(units__gt=0)
+            .order_by("product_id")
+            .values_list("product_id", "revenue", "units", "order_count")
+        )
+
+        DailySales.objects.all().delete()
+        DailyProductSales.objects.all().delete()
+        days = rebuild_rollups()
+
+        self.assertEqual(days, 1)
+        rebuilt = list(
+            DailyProductSales.objects.order_by("product_id").values_list(
+                "product_id", "revenue", "units", "order_count"
+            )
+        )
+        self.assertEqual(rebuilt, expected)
+        self.assertEqual(DailySales.objects.get(date=self.today).order_count, 1)
+
+    def test_rebuild_without_orders(self):
+        """Test rebuilding an empty store does nothing"""
+        self.assertEqual(rebuild_rollups(), 0)
+        self.assertFalse(DailySales.objects.exists())
+
+    def test_rebuild_includes_orders_created_outside_checkout(self):
+        """Test that rebuild picks up orders created outside checkout"""
+        order = Order.objects.create(user=self.user, total_price=Decimal("40.00"))
+        OrderItem.objects.create(
+            order=order, product=self.shirt, quantity=2, price=Decimal("20.00")
+        )
+        self.assertFalse(DailySales.objects.exists())
+
+        rebuild_rollups(self.today, self.today)
+        self.assertEqual(
+            DailySales.objects.get(date=self.today).revenue, Decimal("40.00")
+        )
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from products.models import Product
+from ..models import DailySales, DailyProductSales
+
+User = get_user_model()
+
+
+class SalesReportViewsTests(APITestCase):
+    def setUp(self):
+        self.daily_url = reverse("sales-daily")
+        self.categories_url = reverse("sales-categories")
+        self.top_url = reverse("sales-top-products")
+        self.user = User.objects.create_user(
+            email="user@example.com", password="test123"
+        )
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+        laptop = Product.objects.create(
+            title="Laptop", price=500, category="Electronics"
+        )
+        phone = Product.objects.create(title="Phone", price=300, category="Electronics")
+        shirt = Product.objects.create(title="Shirt", price=20, category="Clothing")
+
+        for day, product, revenue, units in [
+            (self.yesterday, laptop, "500.00", 1),
+            (self.today, laptop, "1000.00", 2),
+            (self.today, phone, "300.00", 1),
+            (self.today, shirt, "100.00", 5),
+        ]:
+            DailyProductSales.objects.create(
+                date=day,
+                product=product,
+                category=product.category,
+                revenue=Decimal(revenue),
+                units=units,
+                order_count=1,
+            )
+        DailySales.objects.create(
+            date=self.yesterday, revenue=Decimal("500.00"), units=1, order_count=1
+        )
+        DailySales.objects.create(
+            date=self.today, revenue=Decimal("1400.00"), units=8, order_count=2
+        )
+
+    def test_reports_require_staff(self):
+        """Test that only staff can read sales reports"""
+        response = self.client.get(self.daily_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.daily_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_daily_sales(self):
+        """Test revenue by day within a date range"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.daily_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(response.data["results"][1]["revenue"], "1400.00")
+
+        response = self.client.get(self.daily_url, {"start": self.today.isoformat()})
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_sales_by_category(self):
+        """Test revenue by category, highest first"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.categories_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(results[0]["category"], "Electronics")
+        self.assertEqual(results[0]["revenue"], "1800.00")
+        self.assertEqual(results[0]["units"], 4)
+        self.assertEqual(results[1]["category"], "Clothing")
+
+    def test_top_products(self):
+        """Test top products by revenue and by units"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.top_url, {"limit": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [row["title"] for row in response.data["results"]]
+        self.assertEqual(titles, ["Laptop", "Phone"])
+        self.assertEqual(response.data["results"][0]["revenue"], "1500.00")
+
+        response = self.client.get(self.top_url, {"by": "units"})
+        self.assertEqual(response.data["results"][0]["title"], "Shirt")
+
+    def test_invalid_parameters(self):
+        """Test that malformed query parameters are rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+        for url, params in [
+            (self.daily_url, {"start": "not-a-date"}),
+            (self.daily_url, {"start": self.today, "end": self.yesterday}),
+            (self.top_url, {"by": "price"}),
+            (self.top_url, {"limit": "many"}),
+        ]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
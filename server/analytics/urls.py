@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import DailySalesView, CategorySalesView, TopProductsView
+
+urlpatterns = [
+    path("sales/daily/", DailySalesView.as_view(), name="sales-daily"),
+    path("sales/categories/", CategorySalesView.as_view(), name="sales-categories"),
+    path("sales/top-products/", TopProductsView.as_view(), name="sales-top-products"),
+]
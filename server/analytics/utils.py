@@ -0,0 +1,191 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Max,
+    Min,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from config.batching import CHUNK_SIZE, chunks
+from orders.models import Order, OrderItem
+from .models import DailySales, DailyProductSales
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+LINE_TOTAL = ExpressionWrapper(F("price") * F("quantity"), output_field=MONEY)
+
+
+def _day_bounds(start, end):
+    """Aware datetimes covering the whole days from start to end inclusive"""
+    tz = timezone.get_current_timezone()
+    return (
+        datetime.combine(start, time.min, tzinfo=tz),
+        datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+    )
+
+
+def _product_rows(items):
+    return (
+        items.annotate(day=TruncDate("order__created_at"))
+        .order_by()
+        .values("day", "product_id", "product__category")
+        .annotate(
+            revenue=Sum(LINE_TOTAL),
+            units=Sum("quantity"),
+            order_count=Count("order_id", distinct=True),
+        )
+    )
+
+
+def _daily_rows(items):
+    return (
+        items.annotate(day=TruncDate("order__created_at"))
+        .order_by()
+        .values("day")
+        .annotate(
+            revenue=Sum(LINE_TOTAL),
+            units=Sum("quantity"),
+            order_count=Count("order_id", distinct=True),
+        )
+    )
+
+
+def _delta(key, rows, row_key, field, sign, output_field):
+    """CASE expression mapping each row's key to its signed delta for field"""
+    return Case(
+        *[When(**{key: row[row_key]}, then=Value(sign * row[field])) for row in rows],
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+def _increment(queryset, key, rows, row_key, sign):
+    """Add every row's totals onto the matching rollup rows in one UPDATE"""
+    queryset.filter(**{f"{key}__in": [row[row_key] for row in rows]}).update(
+        revenue=F("revenue") + _delta(key, rows, row_key, "revenue", sign, MONEY),
+        units=F("units") + _delta(key, rows, row_key, "units", sign, IntegerField()),
+        order_count=F("order_count")
+        + _delta(key, rows, row_key, "order_count", sign, IntegerField()),
+    )
+
+
+def record_orders(order_ids, sign=1):
+    """
+    Add the lines of the given orders to the daily rollups, or retract them
+    when sign is -1. Rows are upserted with set-based UPDATEs, so concurrent
+    checkouts never overwrite each other's totals.
+    """
+    for chunk in chunks(order_ids):
+        items = OrderItem.objects.filter(order_id__in=chunk)
+
+        by_day = defaultdict(list)
+        for row in _product_rows(items):
+            by_day[row["day"]].append(row)
+
+        for day, rows in by_day.items():
+            for batch in chunks(rows):
+                DailyProductSales.objects.bulk_create(
+                    [
+                        DailyProductSales(
+                            date=day,
+                            product_id=row["product_id"],
+                            category=row["product__category"],
+                        )
+                        for row in batch
+                    ],
+                    ignore_conflicts=True,
+                )
+                _increment(
+                    DailyProductSales.objects.filter(date=day),
+                    "product_id",
+                    batch,
+                    "product_id",
+                    sign,
+                )
+
+        daily = list(_daily_rows(items))
+        if daily:
+            DailySales.objects.bulk_create(
+                [DailySales(date=row["day"]) for row in daily],
+                ignore_conflicts=True,
+            )
+            _increment(DailySales.objects.all(), "date", daily, "day", sign)
+
+
+def record_order(order):
+    """Add a freshly checked-out order to the rollups"""
+    record_orders([order.pk])
+
+
+def retract_orders(order_ids):
+    """Remove orders (e.g. cancelled ones) from the rollups"""
+    record_orders(order_ids, sign=-1)
+
+
+def rebuild_rollups(start=None, end=None, batch_days=31):
+    """
+    Recompute the rollups from Order/OrderItem between start and end
+    (inclusive dates), one batch of days per transaction.
+    Returns the number of days processed.
+    """
+    if start is None or end is None:
+        bounds = Order.objects.aggregate(
+            first=Min("created_at"), last=Max("created_at")
+        )
+        if bounds["first"] is None:
+            return 0
+        start = start or timezone.localdate(bounds["first"])
+        end = end or timezone.localdate(bounds["last"])
+
+    days = 0
+    day = start
+    while day <= end:
+        batch_end = min(day + timedelta(days=batch_days - 1), end)
+        since, until = _day_bounds(day, batch_end)
+        items = OrderItem.objects.exclude(order__status="cancelled").filter(
+            order__created_at__gte=since, order__created_at__lt=until
+        )
+
+        with transaction.atomic():
+            DailyProductSales.objects.filter(date__range=(day, batch_end)).delete()
+            DailySales.objects.filter(date__range=(day, batch_end)).delete()
+            DailyProductSales.objects.bulk_create(
+                [
+                    DailyProductSales(
+                        date=row["day"],
+                        product_id=row["product_id"],
+                        category=row["product__category"],
+                        revenue=row["revenue"],
+                        units=row["units"],
+                        order_count=row["order_count"],
+                    )
+                    for row in _product_rows(items)
+                ],
+                batch_size=CHUNK_SIZE,
+            )
+            DailySales.objects.bulk_create(
+                [
+                    DailySales(
+                        date=row["day"],
+                        revenue=row["revenue"],
+                        units=row["units"],
+                        order_count=row["order_count"],
+                    )
+                    for row in _daily_rows(items)
+                ],
+                batch_size=CHUNK_SIZE,
+            )
+
+        days += (batch_end - day).days + 1
+        day = batch_end + timedelta(days=1)
+
+    return days
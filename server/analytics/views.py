@@ -0,0 +1,116 @@
+from datetime import timedelta
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import DailySales, DailyProductSales
+from .serializers import (
+    DailySalesSerializer,
+    CategorySalesSerializer,
+    ProductSalesSerializer,
+)
+
+DEFAULT_RANGE_DAYS = 30
+MAX_TOP_PRODUCTS = 100
+
+
+class SalesReportView(APIView):
+    """
+    Base for the dashboard endpoints. Every report reads only the rollup
+    tables, so its cost depends on the date range, not on order volume.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_date_range(self, request):
+        end = request.query_params.get("end")
+        start = request.query_params.get("start")
+        end = parse_date(end) if end else timezone.localdate()
+        if end is None:
+            return None, None, "Invalid end date, expected YYYY-MM-DD"
+        start = (
+            parse_date(start) if start else end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        )
+        if start is None:
+            return None, None, "Invalid start date, expected YYYY-MM-DD"
+        if start > end:
+            return None, None, "start must not be after end"
+        return start, end, None
+
+    def get(self, request, *args, **kwargs):
+        start, end, error = self.get_date_range(request)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        return self.report(request, start, end)
+
+
+class DailySalesView(SalesReportView):
+    def report(self, request, start, end):
+        rows = DailySales.objects.filter(date__range=(start, end))
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "results": DailySalesSerializer(rows, many=True).data,
+            }
+        )
+
+
+class CategorySalesView(SalesReportView):
+    def report(self, request, start, end):
+        rows = (
+            DailyProductSales.objects.filter(date__range=(start, end))
+            .order_by()
+            .values("category")
+            .annotate(
+                revenue=Sum("revenue"),
+                units=Sum("units"),
+                order_count=Sum("order_count"),
+            )
+            .order_by("-revenue")
+        )
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "results": CategorySalesSerializer(rows, many=True).data,
+            }
+        )
+
+
+class TopProductsView(SalesReportView):
+    def report(self, request, start, end):
+        sort = request.query_params.get("by", "revenue")
+        if sort not in ("revenue", "units"):
+            return Response(
+                {"error": "by must be 'revenue' or 'units'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), MAX_TOP_PRODUCTS)
+        except ValueError:
+            return Response(
+                {"error": "limit must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = (
+            DailyProductSales.objects.filter(date__range=(start, end))
+            .order_by()
+            .values("product_id", "product__title", "product__category")
+            .annotate(
+                revenue=Sum("revenue"),
+                units=Sum("units"),
+                order_count=Sum("order_count"),
+            )
+            .order_by(f"-{sort}")[: max(limit, 0)]
+        )
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "results": ProductSalesSerializer(rows, many=True).data,
+            }
+        )
@@ -0,0 +1,272 @@
+"""
+Sync (WSGI) vs async (ASGI) catalog read throughput at high concurrency.
+
+Seeds an isolated database with a generated catalog and user carts, then
+serves the same catalog traffic three ways, in-process:
+
+* ``wsgi``: the DRF views through the WSGI app from a pool of --threads
+  threads (a threaded WSGI worker);
+* ``asgi-sync``: the same DRF views through the ASGI app (Django runs each
+  sync view in a thread);
+* ``asgi-async``: the async catalog views (/api/catalog/..., /api/cart/summary/)
+  through the ASGI app on one event loop with --concurrency requests in
+  flight.
+
+Every response is followed by --client-delay-ms of "slow mobile client":
+a WSGI worker thread stays blocked while it sends the response, an ASGI
+server awaits the socket, so the thread is free for other requests.
+
+    python -m benchmarks.async_catalog --requests 2000 --concurrency 1000 \\
+        --output async_catalog.json
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import (
+    ASGIClient,
+    WSGIClient,
+    access_token,
+    git_revision,
+    isolated_database,
+    setup_django,
+    summarize_latencies,
+    write_results,
+)
+
+MODES = ("wsgi", "asgi-sync", "asgi-async")
+SCENARIOS = ("product_list", "product_detail", "categories", "cart")
+
+# Sync and async URL for each scenario; the sync cart endpoint is the full
+# cart detail, the closest equivalent of the async summary
+PATHS = {
+    "product_list": (
+        "/api/products/?page={page}",
+        "/api/catalog/products/?page={page}",
+    ),
+    "product_detail": ("/api/products/{product}/", "/api/catalog/products/{product}/"),
+    "categories": (
+        "/api/products/categories/list/",
+        "/api/catalog/products/categories/list/",
+    ),
+    "cart": ("/api/cart/", "/api/cart/summary/"),
+}
+
+
+def seed(options):
+    from django.contrib.auth import get_user_model
+    from products.datagen import generate
+    from products.models import Product
+
+    generate(
+        products=options.products,
+        users=options.users,
+        orders=0,
+        carts=options.users,
+        seed=options.seed,
+        workers=1,
+        log=lambda message: None,
+    )
+    product_ids = list(
+        Product.objects.filter(is_active=True).values_list("id", flat=True)
+    )
+    users = get_user_model().objects.filter(carts__isnull=False).only("id")
+    tokens = [access_token(user) for user in users]
+    return product_ids, tokens
+
+
+def plan(options, product_ids, tokens):
+    """The same (scenario, path index args, token) sequence for every mode"""
+    from django.conf import settings
+
+    rng = random.Random(options.seed)
+    pages = max(1, len(product_ids) // settings.REST_FRAMEWORK["PAGE_SIZE"])
+    requests = []
+    for i in range(options.requests):
+        scenario = SCENARIOS[i % len(SCENARIOS)]
+        requests.append(
+            (
+                scenario,
+                {
+                    "page": rng.randint(1, min(pages, 20)),
+                    "product": rng.choice(product_ids),
+                },
+                rng.choice(tokens) if scenario == "cart" else None,
+            )
+        )
+    return requests
+
+
+def record(samples, scenario, started, status):
+    samples[scenario].append((time.perf_counter() - started, status))
+
+
+def run_wsgi(options, requests):
+    client = WSGIClient()
+    samples = defaultdict(list)
+    delay = options.client_delay_ms / 1000
+
+    def call(scenario, args, token):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        started = time.perf_counter()
+        status, _ = client.request(
+            "GET", PATHS[scenario][0].format(**args), None, headers
+        )
+        time.sleep(delay)  # the worker thread is busy sending to a slow client
+        record(samples, scenario, started, status)
+
+    with ThreadPoolExecutor(max_workers=options.threads) as pool:
+        list(pool.map(lambda request: call(*request), requests))
+    return samples
+
+
+async def run_asgi(options, requests, use_async_views):
+    client = ASGIClient()
+    samples = defaultdict(list)
+    delay = options.client_delay_ms / 1000
+    in_flight = asyncio.Semaphore(options.concurrency)
+    path_index = 1 if use_async_views else 0
+
+    async def call(scenario, args, token):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        async with in_flight:
+            started = time.perf_counter()
+            status, _ = await client.request(
+                "GET", PATHS[scenario][path_index].format(**args), None, headers
+            )
+            await asyncio.sleep(delay)  # the event loop serves others meanwhile
+            record(samples, scenario, started, status)
+
+    await asyncio.gather(*(call(*request) for request in requests))
+    return samples
+
+
+def summarize(samples, duration):
+    scenarios = {}
+    for scenario in SCENARIOS:
+        values = samples.get(scenario, [])
+        statuses = defaultdict(int)
+        for _, status in values:
+            statuses[str(status)] += 1
+        scenarios[scenario] = {
+            "requests": len(values),
+            "status_counts": dict(statuses),
+            **summarize_latencies([latency for latency, _ in values]),
+        }
+    total = sum(len(values) for values in samples.values())
+    return {
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(total / duration, 2) if duration else 0.0,
+        "errors": sum(
+            1 for values in samples.values() for _, status in values if status >= 400
+        ),
+        "scenarios": scenarios,
+    }
+
+
+def run(options):
+    from django.db import connection
+
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+    with isolated_database(options.database) as database:
+        product_ids, tokens = seed(options)
+        connection.close()
+        requests = plan(options, product_ids, tokens)
+
+        modes = {}
+        for mode in options.modes:
+            started = time.perf_counter()
+            if mode == "wsgi":
+                samples = run_wsgi(options, requests)
+            else:
+                samples = asyncio.run(
+                    run_asgi(options, requests, use_async_views=mode == "asgi-async")
+                )
+            modes[mode] = summarize(samples, time.perf_counter() - started)
+
+    return {
+        "benchmark": "async_catalog",
+        "revision": git_revision(),
+        "database": {"vendor": connection.vendor, "name": str(database)},
+        "config": {
+            "products": options.products,
+            "users": options.users,
+            "requests": options.requests,
+            "threads": options.threads,
+            "concurrency": options.concurrency,
+            "client_delay_ms": options.client_delay_ms,
+            "seed": options.seed,
+        },
+        "modes": modes,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32, help="WSGI worker threads")
+    parser.add_argument(
+        "--concurrency", type=int, default=1000, help="ASGI requests in flight"
+    )
+    parser.add_argument(
+        "--client-delay-ms",
+        type=float,
+        default=200.0,
+        help="Time each response takes to reach the (slow) client",
+    )
+    parser.add_argument(
+        "--modes",
+        type=lambda value: value.split(","),
+        default=list(MODES),
+        help=f"Comma-separated subset of {','.join(MODES)}",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database", help="SQLite file for the throwaway benchmark database"
+    )
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    return parser
+
+
+def print_summary(results):
+    print(
+        f"{'mode':<11} {'scenario':<15} {'reqs':>6} {'p50':>9} {'p95':>9} "
+        f"{'p99':>9} {'errors':>6}"
+    )
+    for mode, stats in results["modes"].items():
+        for scenario, scenario_stats in stats["scenarios"].items():
+            errors = sum(
+                count
+                for status, count in scenario_stats["status_counts"].items()
+                if int(status) >= 400
+            )
+            print(
+                f"{mode:<11} {scenario:<15} {scenario_stats['requests']:>6} "
+                f"{scenario_stats['p50_ms']:>9} {scenario_stats['p95_ms']:>9} "
+                f"{scenario_stats['p99_ms']:>9} {errors:>6}"
+            )
+        print(f"{mode:<11} {'total rps':<15} {stats['throughput_rps']:>6}")
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    unknown = set(options.modes) - set(MODES)
+    if unknown:
+        raise SystemExit(f"Unknown modes: {', '.join(sorted(unknown))}")
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
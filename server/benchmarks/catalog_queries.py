@@ -0,0 +1,178 @@
+"""
+Sorted and filtered catalog pages on a large catalog.
+
+Seeds --products active products (plus 10% inactive ones), then requests
+GET /api/products/ through the WSGI app with each ordering and the price
+and stock filters. For each case it records request latency, time spent in
+the database per request and the SQLite query plan of the page query, to
+check that pages are read off the product_active_* indexes.
+
+    python -m benchmarks.catalog_queries --products 1000000 --output catalog.json
+"""
+
+import argparse
+import random
+import time
+
+from .common import (
+    QueryCounter,
+    WSGIClient,
+    git_revision,
+    isolated_database,
+    setup_django,
+    summarize_latencies,
+    write_results,
+)
+
+CASES = {
+    "default": "",
+    "newest": "ordering=newest",
+    "price": "ordering=price",
+    "-price": "ordering=-price",
+    "-popularity": "ordering=-popularity",
+    "title": "ordering=title",
+    "price_range": "min_price=100&max_price=120&ordering=price",
+    "in_stock_by_price": "in_stock=true&ordering=price",
+    "deep_page": "ordering=-popularity&page=200",
+}
+
+
+def seed(count, seed_value):
+    from products.models import Product
+
+    rng = random.Random(seed_value)
+    batch = []
+    for i in range(count + count // 10):
+        batch.append(
+            Product(
+                title=f"Product {rng.randrange(10**6):06d}",
+                price=rng.randrange(100, 100000) / 100,
+                inventory_count=rng.choice((0, 1, 5, 20, 100)),
+                category=f"Category {i % 50}",
+                popularity=rng.expovariate(0.1),
+                is_active=i < count,
+            )
+        )
+        if len(batch) == 5000:
+            Product.objects.bulk_create(batch)
+            batch = []
+    Product.objects.bulk_create(batch)
+
+
+def page_plan(query):
+    """EXPLAIN QUERY PLAN of the page query behind GET /api/products/?query"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    with CaptureQueriesContext(connection) as queries:
+        APIClient().get(f"/api/products/?{query}")
+    sql = next(
+        query["sql"] for query in queries.captured_queries if " LIMIT " in query["sql"]
+    )
+    if connection.vendor != "sqlite":
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def measure(options):
+    from django.db import connection
+
+    client = WSGIClient()
+    counter = QueryCounter()
+    results = {}
+    for name, query in CASES.items():
+        latencies, db_times = [], []
+        with connection.execute_wrapper(counter):
+            for i in range(options.warmup + options.requests):
+                counter.reset()
+                start = time.perf_counter()
+                status, _ = client.request("GET", f"/api/products/?{query}")
+                elapsed = time.perf_counter() - start
+                assert status == 200, (name, status)
+                if i >= options.warmup:
+                    latencies.append(elapsed)
+                    db_times.append(counter.db_time)
+        results[name] = {
+            "query": query,
+            "latency": summarize_latencies(latencies),
+            "db": summarize_latencies(db_times),
+            "plan": page_plan(query),
+        }
+    return results
+
+
+def run(options):
+    from django.db import connection
+
+    with isolated_database(options.database) as database:
+        start = time.perf_counter()
+        seed(options.products, options.seed)
+        seed_seconds = time.perf_counter() - start
+        if options.analyze:
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        cases = measure(options)
+        connection.close()
+
+    return {
+        "benchmark": "catalog_queries",
+        "revision": git_revision(),
+        "database": {"vendor": connection.vendor, "name": str(database)},
+        "config": {
+            "products": options.products,
+            "requests": options.requests,
+            "warmup": options.warmup,
+            "analyze": options.analyze,
+            "seed": options.seed,
+        },
+        "seed_seconds": round(seed_seconds, 1),
+        "cases": cases,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--products", type=int, default=100000, help="Active products to seed"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Timed requests per case"
+    )
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Run ANALYZE after seeding, as a maintained database would have",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--database", help="SQLite file for the throwaway benchmark database"
+    )
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    return parser
+
+
+def print_summary(results):
+    print(f"{'case':<18} {'p50 ms':>8} {'p95 ms':>8} {'db p50':>8}  plan")
+    for name, case in results["cases"].items():
+        print(
+            f"{name:<18} {case['latency']['p50_ms']:>8} "
+            f"{case['latency']['p95_ms']:>8} {case['db']['p50_ms']:>8}  "
+            f"{'; '.join(case['plan'])}"
+        )
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Helpers shared by the benchmark scripts in this package.
+
+Every benchmark runs against a throwaway copy of the configured database
+(created the same way the test runner creates its test database), so it is
+safe to point at a development settings module.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+
+import django
+
+BENCHMARK_PASSWORD = "benchmark-pass-123"
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+    # Benchmark what production runs: no per-query logging from DEBUG
+    from django.conf import settings
+
+    settings.DEBUG = False
+    # Every simulated client shares one address and a few accounts replay
+    # the same writes; rate limiting is measured on its own in rate_limit.py
+    settings.RATE_LIMIT_ENABLED = False
+
+
+@contextmanager
+def isolated_database(name=None, keep=False):
+    """
+    Create a fresh, migrated database for the duration of the block.
+
+    SQLite databases are created as files (not in memory) so that worker
+    threads each get their own connection to the same data.
+    """
+    from django.db import connection
+
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    if connection.vendor == "sqlite" and not test_settings.get("NAME"):
+        test_settings["NAME"] = name or str(
+            Path(connection.settings_dict["NAME"]).with_name("benchmark.sqlite3")
+        )
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=keep
+    )
+    test_name = connection.settings_dict["NAME"]
+    try:
+        yield test_name
+    finally:
+        if not keep:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if connection.vendor == "sqlite":
+                # WAL mode leaves these next to the database file
+                for suffix in ("-wal", "-shm"):
+                    Path(f"{test_name}{suffix}").unlink(missing_ok=True)
+
+
+def create_users(count, prefix="bench", is_staff=False):
+    """Bulk-create users sharing one pre-hashed password"""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    User = get_user_model()
+    password = make_password(BENCHMARK_PASSWORD)
+    User.objects.bulk_create(
+        [
+            User(
+                email=f"{prefix}{i}@example.com",
+                first_name="Bench",
+                last_name=str(i),
+                password=password,
+                is_staff=is_staff,
+            )
+            for i in range(count)
+        ],
+        batch_size=500,
+    )
+    return list(User.objects.filter(email__startswith=prefix).order_by("id").only("id"))
+
+
+def access_token(user):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    return str(RefreshToken.for_user(user).access_token)
+
+
+class WSGIClient:
+    """
+    Minimal thread-safe client that calls the WSGI application directly.
+
+    Unlike django.test.Client it does not touch global signal handlers, so
+    many threads can share it while each uses its own database connection.
+    """
+
+    def __init__(self, application=None):
+        if application is None:
+            from django.core.wsgi import get_wsgi_application
+
+            application = get_wsgi_application()
+        self.application = application
+
+    def request(self, method, path, data=None, headers=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        path, _, query = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": BytesIO(body),
+            "wsgi.errors": BytesIO(),
+            "wsgi.url_scheme": "http",
+            "wsgi.version": (1, 0),
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in (headers or {}).items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+
+        status_holder = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            status_holder["status"] = int(status.split(" ", 1)[0])
+            status_holder["headers"] = response_headers
+
+        chunks = self.application(environ, start_response)
+        try:
+            content = b"".join(chunks)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+        return status_holder["status"], content
+
+
+class ASGIClient:
+    """
+    Minimal client that calls the ASGI application directly on the running
+    event loop, the async counterpart of WSGIClient.
+    """
+
+    def __init__(self, application=None):
+        if application is None:
+            from django.core.asgi import get_asgi_application
+
+            application = get_asgi_application()
+        self.application = application
+
+    async def request(self, method, path, data=None, headers=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 50000),
+            "headers": [
+                (b"host", b"testserver"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *(
+                    (name.lower().encode(), value.encode())
+                    for name, value in (headers or {}).items()
+                ),
+            ],
+        }
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if request_sent:
+                # Nothing more will arrive; wait like a server would
+                await asyncio.Event().wait()
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        response = {"status": None, "chunks": []}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["chunks"].append(message.get("body", b""))
+
+        await self.application(scope, receive, send)
+        return response["status"], b"".join(response["chunks"])
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting queries, DB time and lock contention.
+
+    A statement counts as a lock wait when it fails with "database is
+    locked" or runs longer than lock_threshold seconds, which for the
+    millisecond-scale statements of this app means it sat blocked.
+    """
+
+    def __init__(self, lock_threshold=0.02):
+        self.lock_threshold = lock_threshold
+        self.reset()
+
+    def reset(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.lock_errors = 0
+        self.lock_waits = 0
+        self.lock_wait_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        from django.db import OperationalError
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as exc:
+            if "locked" in str(exc):
+                self.lock_errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += elapsed
+            if elapsed >= self.lock_threshold:
+                self.lock_waits += 1
+                self.lock_wait_time += elapsed
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def summarize_latencies(latencies):
+    """Latency distribution in milliseconds"""
+    values = sorted(latencies)
+    if not values:
+        return {
+            "p50_ms": 0.0,
+            "p95_ms": 0.0,
+            "p99_ms": 0.0,
+            "mean_ms": 0.0,
+            "max_ms": 0.0,
+        }
+    return {
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results, path):
+    """Write results as JSON to path, or to stdout when path is "-" """
+    payload = json.dumps(results, indent=2, sort_keys=True, default=str)
+    if path == "-":
+        print(payload)
+    else:
+        Path(path).write_text(payload + "\n")
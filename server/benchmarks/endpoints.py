@@ -0,0 +1,314 @@
+"""
+Endpoint benchmarks with regression gating.
+
+For each dataset size, generates a deterministic dataset in a throwaway
+database and times the main API endpoints through the in-process test
+client. Records latency percentiles, queries per request and peak Python
+memory per request, writes JSON, and optionally compares against a stored
+baseline, exiting non-zero when an endpoint regressed.
+
+    python -m benchmarks.endpoints --sizes small,medium --output current.json
+    python -m benchmarks.endpoints --sizes small --baseline baseline.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from datetime import date
+from itertools import count
+
+from .common import (
+    BENCHMARK_PASSWORD,
+    QueryCounter,
+    access_token,
+    git_revision,
+    isolated_database,
+    setup_django,
+    summarize_latencies,
+    write_results,
+)
+
+SIZES = {
+    "small": {"products": 1000, "users": 200, "orders": 2000, "carts": 100},
+    "medium": {"products": 10000, "users": 2000, "orders": 20000, "carts": 500},
+    "large": {"products": 100000, "users": 10000, "orders": 200000, "carts": 2000},
+}
+DATA_SEED = 42
+DATA_END_DATE = date(2025, 6, 30)
+
+
+class Scenario:
+    """One endpoint call; prepare() runs untimed before each request"""
+
+    def __init__(self, name, method, path, data=None, user=None, prepare=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.user = user
+        self.prepare = prepare
+
+    def call(self, client, headers):
+        path = self.path() if callable(self.path) else self.path
+        data = self.data() if callable(self.data) else self.data
+        if self.method == "GET":
+            return client.get(path, data, **headers)
+        return client.post(path, data, content_type="application/json", **headers)
+
+
+def build_scenarios():
+    from django.db.models import Count
+    from django.contrib.auth import get_user_model
+    from cart.models import Cart, CartItem
+    from products.models import Product
+
+    User = get_user_model()
+    product = Product.objects.filter(is_active=True).order_by("id").first()
+    category = product.category
+    shopper = Cart.objects.filter(user__isnull=False).order_by("id").first().user
+    buyer = (
+        User.objects.annotate(orders=Count("order")).order_by("-orders", "id").first()
+    )
+    # Fresh user for cart writes so repeated adds never run out of stock
+    writer = User.objects.create_user(
+        email="bench-writer@example.com", password=BENCHMARK_PASSWORD
+    )
+    checkout_user = User.objects.create_user(
+        email="bench-checkout@example.com", password=BENCHMARK_PASSWORD
+    )
+    in_stock = list(
+        Product.objects.filter(is_active=True, inventory_count__gte=100)
+        .order_by("id")
+        .values_list("id", flat=True)[:500]
+    )
+    Product.objects.filter(id__in=in_stock).update(inventory_count=1_000_000)
+    next_product = iter(in_stock * 1000).__next__
+    emails = count()
+
+    def fill_checkout_cart():
+        cart, _ = Cart.objects.get_or_create(user=checkout_user)
+        CartItem.objects.create(cart=cart, product_id=in_stock[0], quantity=1)
+
+    return [
+        Scenario("product_list", "GET", "/api/products/"),
+        Scenario(
+            "product_list_category", "GET", "/api/products/", {"category": category}
+        ),
+        Scenario("product_search", "GET", "/api/products/", {"search": "wireless"}),
+        Scenario("product_detail", "GET", f"/api/products/{product.id}/"),
+        Scenario("categories", "GET", "/api/products/categories/list/"),
+        Scenario("cart_detail", "GET", "/api/cart/", user=shopper),
+        Scenario(
+            "add_to_cart",
+            "POST",
+            "/api/cart/add/",
+            lambda: {"product": next_product(), "quantity": 1},
+            user=writer,
+        ),
+        Scenario("order_list", "GET", "/api/orders/", user=buyer),
+        Scenario(
+            "checkout",
+            "POST",
+            "/api/orders/",
+            {"shipping_address": "1 Benchmark Way"},
+            user=checkout_user,
+            prepare=fill_checkout_cart,
+        ),
+        Scenario(
+            "register",
+            "POST",
+            "/api/auth/signup/",
+            lambda: {
+                "email": f"bench-register-{next(emails)}@example.com",
+                "password": BENCHMARK_PASSWORD,
+                "first_name": "Bench",
+                "last_name": "Mark",
+            },
+        ),
+    ]
+
+
+def run_scenario(scenario, iterations, warmup, memory_iterations):
+    from django.db import connection
+    from django.test import Client
+
+    client = Client()
+    headers = {}
+    if scenario.user is not None:
+        headers["HTTP_AUTHORIZATION"] = f"Bearer {access_token(scenario.user)}"
+
+    counter = QueryCounter()
+    latencies = []
+    queries = []
+    statuses = set()
+    with connection.execute_wrapper(counter):
+        for i in range(warmup + iterations):
+            if scenario.prepare:
+                scenario.prepare()
+            counter.reset()
+            start = time.perf_counter()
+            response = scenario.call(client, headers)
+            elapsed = time.perf_counter() - start
+            if i >= warmup:
+                latencies.append(elapsed)
+                queries.append(counter.queries)
+                statuses.add(response.status_code)
+
+    # Memory is measured separately: tracemalloc slows everything down
+    peaks = []
+    for _ in range(memory_iterations):
+        if scenario.prepare:
+            scenario.prepare()
+        tracemalloc.start()
+        scenario.call(client, headers)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "statuses": sorted(statuses),
+        "queries": max(queries) if queries else 0,
+        "peak_memory_kb": round(max(peaks) / 1024, 1) if peaks else 0.0,
+        **summarize_latencies(latencies),
+    }
+
+
+def run(options):
+    from django.db import connection
+    from products.datagen import generate
+
+    results = {}
+    for size in options.sizes:
+        with isolated_database():
+            started = time.perf_counter()
+            generate(
+                **SIZES[size],
+                seed=DATA_SEED,
+                end_date=DATA_END_DATE,
+                log=lambda message: None,
+            )
+            print(
+                f"[{size}] dataset ready in {time.perf_counter() - started:.1f}s",
+                file=sys.stderr,
+            )
+
+            results[size] = {}
+            for scenario in build_scenarios():
+                if options.only and scenario.name not in options.only:
+                    continue
+                results[size][scenario.name] = run_scenario(
+                    scenario,
+                    options.iterations,
+                    options.warmup,
+                    options.memory_iterations,
+                )
+                stats = results[size][scenario.name]
+                print(
+                    f"[{size}] {scenario.name:<22} p50={stats['p50_ms']:>8}ms "
+                    f"p95={stats['p95_ms']:>8}ms queries={stats['queries']:>3} "
+                    f"peak={stats['peak_memory_kb']:>8}KB",
+                    file=sys.stderr,
+                )
+
+    return {
+        "benchmark": "endpoints",
+        "revision": git_revision(),
+        "database": connection.vendor,
+        "config": {
+            "sizes": {size: SIZES[size] for size in options.sizes},
+            "iterations": options.iterations,
+            "warmup": options.warmup,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """
+    List regressions of current against baseline. Latency regresses when
+    p50 or p95 grows by more than threshold (a fraction) and by at least
+    min_delta_ms; query count regresses on any increase.
+    """
+    regressions = []
+    for size, scenarios in current["results"].items():
+        for name, stats in scenarios.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            for metric in ("p50_ms", "p95_ms"):
+                delta = stats[metric] - before[metric]
+                if delta >= min_delta_ms and stats[metric] > before[metric] * (
+                    1 + threshold
+                ):
+                    regressions.append(
+                        f"{size}/{name}: {metric} {before[metric]} -> {stats[metric]}"
+                    )
+            if stats["queries"] > before["queries"]:
+                regressions.append(
+                    f"{size}/{name}: queries {before['queries']} -> {stats['queries']}"
+                )
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: value.split(","),
+        default=["small"],
+        help=f"Comma-separated dataset sizes: {', '.join(SIZES)}",
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda value: value.split(","),
+        help="Comma-separated scenario names to run",
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--memory-iterations", type=int, default=3)
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative latency increase (default: 0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="Ignore latency increases smaller than this (default: 1ms)",
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    unknown = [size for size in options.sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(
+            results, baseline, options.threshold, options.min_delta_ms
+        )
+        if regressions:
+            print("Regressions against baseline:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"No regressions against {options.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
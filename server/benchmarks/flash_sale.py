@@ -0,0 +1,291 @@
+"""
+Flash-sale load test: many users racing to buy the same few products.
+
+Seeds an isolated database with N users and M low-stock products, then
+drives the cart and checkout endpoints through the WSGI application
+in-process from a pool of threads, all starting at once. Reports latency
+percentiles, throughput, query counts and lock contention per endpoint,
+plus how many units were sold beyond the available stock.
+
+    python -m benchmarks.flash_sale --users 200 --products 3 --stock 50 \\
+        --threads 32 --output flash_sale.json
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from .common import (
+    QueryCounter,
+    WSGIClient,
+    access_token,
+    create_users,
+    git_revision,
+    isolated_database,
+    setup_django,
+    summarize_latencies,
+    write_results,
+)
+
+ENDPOINTS = ("cart_detail", "add_to_cart", "checkout")
+
+
+class Recorder:
+    """Collects per-endpoint samples from all worker threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def add(self, endpoint, latency, status, counter):
+        with self.lock:
+            self.samples[endpoint].append(
+                (
+                    latency,
+                    status,
+                    counter.queries,
+                    counter.db_time,
+                    counter.lock_errors,
+                    counter.lock_waits,
+                    counter.lock_wait_time,
+                )
+            )
+
+    def summary(self, duration):
+        endpoints = {}
+        for endpoint in ENDPOINTS:
+            samples = self.samples.get(endpoint, [])
+            statuses = defaultdict(int)
+            for sample in samples:
+                statuses[str(sample[1])] += 1
+            count = len(samples)
+            endpoints[endpoint] = {
+                "requests": count,
+                "throughput_rps": round(count / duration, 2) if duration else 0.0,
+                "status_counts": dict(statuses),
+                "server_errors": sum(1 for s in samples if s[1] >= 500),
+                "queries_per_request": (
+                    round(sum(s[2] for s in samples) / count, 2) if count else 0.0
+                ),
+                "db_time_ms_per_request": (
+                    round(sum(s[3] for s in samples) / count * 1000, 3)
+                    if count
+                    else 0.0
+                ),
+                "lock_errors": sum(s[4] for s in samples),
+                "lock_waits": sum(s[5] for s in samples),
+                "lock_wait_ms": round(sum(s[6] for s in samples) * 1000, 3),
+                **summarize_latencies([s[0] for s in samples]),
+            }
+        return endpoints
+
+
+class _NoBarrier:
+    def wait(self):
+        pass
+
+
+def seed(options):
+    from products.models import Product
+
+    users = create_users(options.users, prefix="flashsale")
+    Product.objects.bulk_create(
+        [
+            Product(
+                title=f"Flash Sale Item {i}",
+                price=Decimal("49.99"),
+                inventory_count=options.stock,
+                category="Flash Sale",
+            )
+            for i in range(options.products)
+        ]
+    )
+    product_ids = list(Product.objects.order_by("id").values_list("id", flat=True))
+    tokens = [access_token(user) for user in users]
+    return tokens, product_ids
+
+
+def shopper(client, recorder, token, product_ids, options, index, start_barrier):
+    """One user's session: view cart, add hot items, check out"""
+    from django.db import connection
+
+    rng = random.Random(options.seed + index)
+    headers = {"Authorization": f"Bearer {token}"}
+    counter = QueryCounter(options.lock_threshold_ms / 1000)
+
+    def call(endpoint, method, path, data=None):
+        counter.reset()
+        start = time.perf_counter()
+        status, _ = client.request(method, path, data, headers)
+        recorder.add(endpoint, time.perf_counter() - start, status, counter)
+        return status
+
+    start_barrier.wait()
+    try:
+        with connection.execute_wrapper(counter):
+            call("cart_detail", "GET", "/api/cart/")
+            for _ in range(options.items_per_user):
+                call(
+                    "add_to_cart",
+                    "POST",
+                    "/api/cart/add/",
+                    {
+                        "product": rng.choice(product_ids),
+                        "quantity": rng.randint(1, options.max_quantity),
+                    },
+                )
+            call(
+                "checkout",
+                "POST",
+                "/api/orders/",
+                {"shipping_address": f"{index} Flash Sale Street"},
+            )
+    finally:
+        connection.close()
+
+
+def stock_report(product_ids, stock):
+    """Compare units sold with the stock that was available"""
+    from django.db.models import Sum
+    from orders.models import OrderItem
+    from products.models import Product
+
+    sold = dict(
+        OrderItem.objects.filter(product_id__in=product_ids)
+        .values("product_id")
+        .annotate(total=Sum("quantity"))
+        .values_list("product_id", "total")
+    )
+    remaining = dict(
+        Product.objects.filter(id__in=product_ids).values_list("id", "inventory_count")
+    )
+    oversold_units = sum(max(0, sold.get(pid, 0) - stock) for pid in product_ids)
+    # Stock that disappeared without an order (or the reverse) means lost
+    # updates between concurrent checkouts
+    inventory_drift = sum(
+        abs((stock - sold.get(pid, 0)) - remaining[pid]) for pid in product_ids
+    )
+    return {
+        "units_available": stock * len(product_ids),
+        "units_sold": sum(sold.values()),
+        "oversold_units": oversold_units,
+        "oversold_products": sum(1 for pid in product_ids if sold.get(pid, 0) > stock),
+        "inventory_drift": inventory_drift,
+    }
+
+
+def run(options):
+    from django.db import connection
+
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+    with isolated_database(options.database) as database:
+        tokens, product_ids = seed(options)
+        connection.close()
+
+        client = WSGIClient()
+        recorder = Recorder()
+        start_barrier = threading.Barrier(min(options.threads, len(tokens)) or 1)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options.threads) as pool:
+            futures = [
+                pool.submit(
+                    shopper,
+                    client,
+                    recorder,
+                    token,
+                    product_ids,
+                    options,
+                    index,
+                    # Only the first wave lines up; later users arrive as
+                    # threads free up, like a queue forming at the door
+                    start_barrier if index < options.threads else _NoBarrier(),
+                )
+                for index, token in enumerate(tokens)
+            ]
+            for future in futures:
+                future.result()
+        duration = time.perf_counter() - started
+
+        endpoints = recorder.summary(duration)
+        stock = stock_report(product_ids, options.stock)
+
+    return {
+        "benchmark": "flash_sale",
+        "revision": git_revision(),
+        "database": {"vendor": connection.vendor, "name": str(database)},
+        "config": {
+            "users": options.users,
+            "products": options.products,
+            "stock": options.stock,
+            "threads": options.threads,
+            "items_per_user": options.items_per_user,
+            "max_quantity": options.max_quantity,
+            "seed": options.seed,
+            "lock_threshold_ms": options.lock_threshold_ms,
+        },
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(
+            sum(e["requests"] for e in endpoints.values()) / duration, 2
+        ),
+        "endpoints": endpoints,
+        "stock": stock,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--products", type=int, default=3)
+    parser.add_argument("--stock", type=int, default=50, help="Units per product")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--items-per-user", type=int, default=2)
+    parser.add_argument("--max-quantity", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--lock-threshold-ms",
+        type=float,
+        default=20.0,
+        help="Statements slower than this count as lock waits",
+    )
+    parser.add_argument(
+        "--database", help="SQLite file for the throwaway benchmark database"
+    )
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    return parser
+
+
+def print_summary(results):
+    print(
+        f"{'endpoint':<12} {'reqs':>6} {'rps':>8} {'p50':>8} {'p95':>8} "
+        f"{'p99':>8} {'queries':>8} {'locks':>6} {'5xx':>5}"
+    )
+    for name, stats in results["endpoints"].items():
+        print(
+            f"{name:<12} {stats['requests']:>6} {stats['throughput_rps']:>8} "
+            f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} "
+            f"{stats['queries_per_request']:>8} "
+            f"{stats['lock_errors'] + stats['lock_waits']:>6} "
+            f"{stats['server_errors']:>5}"
+        )
+    print(f"stock: {json.dumps(results['stock'])}")
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
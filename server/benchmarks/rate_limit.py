@@ -0,0 +1,220 @@
+"""
+Token-bucket rate limiting overhead on the fast (allowed) path.
+
+Measures:
+
+* the bucket store alone: take() per call across many keys, for the local
+  store and, with --redis, the Redis store;
+* the three throttles of a cart write (per IP, user and session key) as
+  run by DRF's check_throttles(), enabled vs disabled;
+* POST /api/cart/add/ through the WSGI app with rate limiting enabled vs
+  disabled, in alternating rounds, with rates high enough that nothing is
+  throttled.
+
+    python -m benchmarks.rate_limit --output rate_limit.json
+"""
+
+import argparse
+import statistics
+import time
+
+from .common import (
+    WSGIClient,
+    access_token,
+    create_users,
+    git_revision,
+    isolated_database,
+    setup_django,
+    summarize_latencies,
+    write_results,
+)
+
+UNLIMITED = "1000000000/s"
+
+
+def per_call_us(function, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        function(i)
+    return round((time.perf_counter() - start) / calls * 1e6, 3)
+
+
+def measure_stores(options):
+    from config.throttling import LocalBucketStore, RedisBucketStore, parse_rate
+
+    capacity, rate = parse_rate(UNLIMITED)
+    stores = {"local": LocalBucketStore()}
+    if options.redis:
+        stores["redis"] = RedisBucketStore(options.redis, LocalBucketStore())
+
+    results = {}
+    for name, store in stores.items():
+        keys = [f"bench:{i}" for i in range(options.keys)]
+        results[name] = per_call_us(
+            lambda i: store.take(keys[i % len(keys)], capacity, rate), options.calls
+        )
+    return results
+
+
+def measure_throttles(options):
+    from django.conf import settings
+    from rest_framework.test import APIRequestFactory
+    from cart.views import AddToCartView
+
+    factory = APIRequestFactory()
+    view = AddToCartView()
+    view.format_kwarg = None
+    view.args, view.kwargs = (), {}
+
+    def check(i):
+        view.check_throttles(requests[i % len(requests)])
+
+    requests = []
+    for i in range(options.keys):
+        request = view.initialize_request(
+            factory.post(
+                "/api/cart/add/",
+                {"product": 1},
+                format="json",
+                REMOTE_ADDR=f"10.0.{i // 250}.{i % 250}",
+                HTTP_X_SESSION_KEY=f"session-{i}",
+            )
+        )
+        request.data  # parsed once, as the view would have by now
+        requests.append(request)
+
+    results = {}
+    for enabled in (False, True):
+        settings.RATE_LIMIT_ENABLED = enabled
+        results["enabled" if enabled else "disabled"] = per_call_us(
+            check, options.calls
+        )
+    results["overhead_us"] = round(results["enabled"] - results["disabled"], 3)
+    return results
+
+
+def measure_endpoint(options):
+    from django.conf import settings
+    from products.models import Product
+
+    product = Product.objects.create(
+        title="Benchmark Product", price=10, inventory_count=10**9
+    )
+    users = create_users(options.users)
+    tokens = [access_token(user) for user in users]
+    client = WSGIClient()
+    latencies = {"disabled": [], "enabled": []}
+
+    for round_number in range(options.rounds):
+        for enabled in (False, True):
+            settings.RATE_LIMIT_ENABLED = enabled
+            samples = latencies["enabled" if enabled else "disabled"]
+            for i in range(options.requests):
+                token = tokens[(round_number + i) % len(tokens)]
+                start = time.perf_counter()
+                status, _ = client.request(
+                    "POST",
+                    "/api/cart/add/",
+                    {"product": product.id, "quantity": 1},
+                    {"Authorization": f"Bearer {token}"},
+                )
+                samples.append(time.perf_counter() - start)
+                assert status == 201, status
+
+    results = {name: summarize_latencies(values) for name, values in latencies.items()}
+    results["median_overhead_ms"] = round(
+        (
+            statistics.median(latencies["enabled"])
+            - statistics.median(latencies["disabled"])
+        )
+        * 1000,
+        3,
+    )
+    return results
+
+
+def run(options):
+    from django.conf import settings
+    from django.db import connection
+    from django.test import override_settings
+
+    rates = {
+        key: UNLIMITED for key in settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+    }
+    with override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+    ), isolated_database(options.database) as database:
+        stores = measure_stores(options)
+        throttles = measure_throttles(options)
+        endpoint = measure_endpoint(options)
+        connection.close()
+
+    return {
+        "benchmark": "rate_limit",
+        "revision": git_revision(),
+        "database": {"vendor": connection.vendor, "name": str(database)},
+        "config": {
+            "keys": options.keys,
+            "calls": options.calls,
+            "users": options.users,
+            "requests": options.requests,
+            "rounds": options.rounds,
+            "redis": bool(options.redis),
+        },
+        "store_take_us": stores,
+        "check_throttles_us": throttles,
+        "add_to_cart": endpoint,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--keys", type=int, default=10000, help="Distinct clients (buckets)"
+    )
+    parser.add_argument(
+        "--calls", type=int, default=200000, help="Calls per store/throttle timing"
+    )
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument(
+        "--requests", type=int, default=100, help="Requests per round and mode"
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--redis", help="Also time the Redis store at this URL")
+    parser.add_argument(
+        "--database", help="SQLite file for the throwaway benchmark database"
+    )
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    return parser
+
+
+def print_summary(results):
+    for name, us in results["store_take_us"].items():
+        print(f"store take ({name}): {us} us")
+    throttles = results["check_throttles_us"]
+    print(
+        f"check_throttles: {throttles['disabled']} us disabled, "
+        f"{throttles['enabled']} us enabled (+{throttles['overhead_us']} us)"
+    )
+    endpoint = results["add_to_cart"]
+    print(f"{'add_to_cart':<12} {'p50':>8} {'p95':>8} {'mean':>8}")
+    for name in ("disabled", "enabled"):
+        stats = endpoint[name]
+        print(
+            f"{name:<12} {stats['p50_ms']:>8} {stats['p95_ms']:>8} "
+            f"{stats['mean_ms']:>8}"
+        )
+    print(f"median overhead: {endpoint['median_overhead_ms']} ms")
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Verify primary/replica routing and read-your-writes against two SQLite files.
+
+Creates a throwaway primary database and a replica file, "replicates" by
+copying the primary with SQLite's backup API whenever the script says so,
+and checks through the WSGI app that:
+
+* catalog reads hit the replica and not the primary;
+* a staff user sees a product they just created (pinned to the primary)
+  while anonymous readers get the stale replica until it is replicated;
+* a customer sees their new order in their order history right after
+  checkout, and reads go back to the replica once the pin expires.
+
+    python -m benchmarks.replica_routing --output replica_routing.json
+
+Exits with status 1 if any check fails.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from contextlib import ExitStack, closing
+from decimal import Decimal
+from pathlib import Path
+
+from .common import (
+    QueryCounter,
+    WSGIClient,
+    access_token,
+    create_users,
+    git_revision,
+    isolated_database,
+    setup_django,
+    write_results,
+)
+
+REPLICA = "replica1"
+
+
+class Verifier:
+    def __init__(self, primary_name, replica_name):
+        self.primary_name = primary_name
+        self.replica_name = replica_name
+        self.client = WSGIClient()
+        self.counters = {"default": QueryCounter(), REPLICA: QueryCounter()}
+        self.checks = []
+
+    def replicate(self):
+        from django.db import connections
+
+        connections[REPLICA].close()
+        with closing(sqlite3.connect(self.primary_name)) as source, closing(
+            sqlite3.connect(self.replica_name)
+        ) as target:
+            source.backup(target)
+
+    def request(self, method, path, data=None, token=None):
+        from django.db import connections
+
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        for counter in self.counters.values():
+            counter.reset()
+        with ExitStack() as stack:
+            for alias, counter in self.counters.items():
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            status, content = self.client.request(method, path, data, headers)
+        queries = {alias: c.queries for alias, c in self.counters.items()}
+        return status, json.loads(content or b"null"), queries
+
+    def check(self, name, passed, **details):
+        self.checks.append({"check": name, "passed": bool(passed), **details})
+
+
+def run(options):
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.db import connections
+    from config.routers import PIN_KEY
+    from products.models import Product
+
+    if connections["default"].vendor != "sqlite":
+        raise SystemExit("This check needs SQLite for the primary")
+
+    with isolated_database(options.database) as primary_name:
+        staff = create_users(1, prefix="replicastaff", is_staff=True)[0]
+        customer = create_users(1, prefix="replicacustomer")[0]
+        product = Product.objects.create(
+            title="Replicated Item",
+            price=Decimal("10.00"),
+            inventory_count=5,
+            category="Replica",
+        )
+        staff_token, customer_token = access_token(staff), access_token(customer)
+
+        verifier = Verifier(primary_name, settings.DATABASES[REPLICA]["NAME"])
+        verifier.replicate()
+        try:
+            status, _, queries = verifier.request("GET", "/api/products/")
+            verifier.check(
+                "catalog reads use the replica",
+                status == 200 and queries[REPLICA] and not queries["default"],
+                queries=queries,
+            )
+
+            status, body, queries = verifier.request(
+                "POST",
+                "/api/products/",
+                {
+                    "title": "Fresh Item",
+                    "price": "12.00",
+                    "inventory_count": 3,
+                    "category": "Replica",
+                },
+                token=staff_token,
+            )
+            fresh = f"/api/products/{body['id']}/" if status == 201 else None
+            verifier.check(
+                "writes go to the primary",
+                status == 201 and not queries[REPLICA],
+                queries=queries,
+            )
+            status, _, queries = verifier.request("GET", fresh, token=staff_token)
+            verifier.check(
+                "writer reads their own write",
+                status == 200 and not queries[REPLICA],
+                queries=queries,
+            )
+            status, _, queries = verifier.request("GET", fresh)
+            verifier.check(
+                "other readers see the replica until it catches up",
+                status == 404 and queries[REPLICA],
+                queries=queries,
+            )
+            verifier.replicate()
+            status, _, queries = verifier.request("GET", fresh)
+            verifier.check(
+                "other readers see the write once replicated",
+                status == 200 and queries[REPLICA],
+                queries=queries,
+            )
+
+            verifier.request(
+                "POST",
+                "/api/cart/add/",
+                {"product": product.id, "quantity": 1},
+                token=customer_token,
+            )
+            status, body, queries = verifier.request(
+                "POST",
+                "/api/orders/",
+                {"shipping_address": "1 Replica Road"},
+                token=customer_token,
+            )
+            order_id = body.get("id") if status == 201 else None
+            verifier.check(
+                "checkout runs on the primary",
+                status == 201 and not queries[REPLICA],
+                queries=queries,
+            )
+            status, body, queries = verifier.request(
+                "GET", "/api/orders/", token=customer_token
+            )
+            verifier.check(
+                "order history shows the new order right after checkout",
+                status == 200 and order_id in order_ids(body) and not queries[REPLICA],
+                queries=queries,
+            )
+
+            cache.delete(PIN_KEY.format(customer.pk))  # the pin expires
+            status, body, queries = verifier.request(
+                "GET", "/api/orders/", token=customer_token
+            )
+            verifier.check(
+                "order history returns to the replica after the pin expires",
+                status == 200 and order_id not in order_ids(body) and queries[REPLICA],
+                queries=queries,
+            )
+            verifier.replicate()
+            status, body, queries = verifier.request(
+                "GET", "/api/orders/", token=customer_token
+            )
+            verifier.check(
+                "replicated order history shows the order",
+                status == 200 and order_id in order_ids(body),
+                queries=queries,
+            )
+        finally:
+            connections[REPLICA].close()
+            Path(verifier.replica_name).unlink(missing_ok=True)
+
+    return {
+        "benchmark": "replica_routing",
+        "revision": git_revision(),
+        "passed": all(check["passed"] for check in verifier.checks),
+        "checks": verifier.checks,
+    }
+
+
+def order_ids(body):
+    results = body.get("results", body) if isinstance(body, dict) else body
+    return {order["id"] for order in results or []}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database", help="SQLite file for the throwaway primary database"
+    )
+    parser.add_argument(
+        "--replica",
+        default=str(
+            Path(__file__).resolve().parent.parent / "benchmark-replica.sqlite3"
+        ),
+        help="SQLite file used as the replica (overwritten)",
+    )
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    return parser
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    # Settings register replicas from the environment at import time
+    os.environ["DATABASE_REPLICAS"] = options.replica
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        for check in results["checks"]:
+            print(f"{'ok  ' if check['passed'] else 'FAIL'} {check['check']}")
+    sys.exit(0 if results["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
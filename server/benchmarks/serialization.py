@@ -0,0 +1,240 @@
+"""
+JSON rendering, parsing and compression benchmarks for API payloads.
+
+Seeds an isolated database with generated data, then for product list pages
+and order histories of several sizes measures:
+
+* render time: DRF's JSONRenderer vs the orjson renderer;
+* parse time: DRF's JSONParser vs the orjson parser, on the rendered body;
+* compressed size and time for gzip (level 6) and brotli (the middleware's
+  quality level);
+
+and finally requests /api/products/ and /api/orders/ through the WSGI app
+with each Accept-Encoding, recording latency and bytes on the wire.
+
+    python -m benchmarks.serialization --output serialization.json
+"""
+
+import argparse
+import statistics
+import time
+from io import BytesIO
+
+from .common import (
+    WSGIClient,
+    access_token,
+    git_revision,
+    isolated_database,
+    setup_django,
+    summarize_latencies,
+    write_results,
+)
+
+PRODUCT_PAGE_SIZES = (12, 100, 1000)
+ORDER_HISTORY_SIZES = (12, 100)
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 3)
+
+
+def payloads(options):
+    """(name, data) pairs shaped like the API's paginated responses"""
+    from orders.models import Order
+    from orders.serializers import OrderSerializer
+    from products.models import Product
+    from products.serializers import ProductSerializer
+
+    products = list(Product.objects.order_by("-created_at")[: max(PRODUCT_PAGE_SIZES)])
+    for size in PRODUCT_PAGE_SIZES:
+        yield f"products_{size}", page(
+            ProductSerializer(products[:size], many=True).data
+        )
+
+    orders = list(
+        Order.objects.filter(user=top_customer())
+        .prefetch_related("items__product")
+        .order_by("-created_at")[: max(ORDER_HISTORY_SIZES)]
+    )
+    for size in ORDER_HISTORY_SIZES:
+        yield f"orders_{size}", page(OrderSerializer(orders[:size], many=True).data)
+
+
+def top_customer():
+    """The user with the longest order history"""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+
+    return (
+        get_user_model()
+        .objects.annotate(order_count=Count("order"))
+        .order_by("-order_count")
+        .first()
+    )
+
+
+def page(results):
+    return {"count": len(results), "next": None, "previous": None, "results": results}
+
+
+def measure_payload(data, repeat):
+    import brotli
+    from django.utils.text import compress_string
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from config.middleware import CompressionMiddleware
+    from config.parsers import ORJSONParser
+    from config.renderers import ORJSONRenderer
+
+    drf_renderer, orjson_renderer = JSONRenderer(), ORJSONRenderer()
+    body = orjson_renderer.render(data)
+    assert body == drf_renderer.render(data), "renderers disagree"
+    quality = CompressionMiddleware.brotli_quality
+
+    gzipped = compress_string(body)
+    brotlied = brotli.compress(body, quality=quality)
+    return {
+        "bytes": len(body),
+        "render_ms": {
+            "drf": median_ms(lambda: drf_renderer.render(data), repeat),
+            "orjson": median_ms(lambda: orjson_renderer.render(data), repeat),
+        },
+        "parse_ms": {
+            "drf": median_ms(lambda: JSONParser().parse(BytesIO(body)), repeat),
+            "orjson": median_ms(lambda: ORJSONParser().parse(BytesIO(body)), repeat),
+        },
+        "gzip": {
+            "bytes": len(gzipped),
+            "ratio": round(len(body) / len(gzipped), 2),
+            "ms": median_ms(lambda: compress_string(body), repeat),
+        },
+        "br": {
+            "bytes": len(brotlied),
+            "ratio": round(len(body) / len(brotlied), 2),
+            "ms": median_ms(lambda: brotli.compress(body, quality=quality), repeat),
+        },
+    }
+
+
+def measure_endpoints(options, token):
+    client = WSGIClient()
+    headers = {"Authorization": f"Bearer {token}"}
+    endpoints = {}
+    for name, path in (
+        ("product_list", "/api/products/"),
+        ("order_history", "/api/orders/"),
+    ):
+        for encoding in ENCODINGS:
+            latencies, size = [], 0
+            for i in range(options.requests):
+                start = time.perf_counter()
+                status, content = client.request(
+                    "GET",
+                    f"{path}?page={i % 5 + 1}",
+                    None,
+                    {**headers, "Accept-Encoding": encoding},
+                )
+                latencies.append(time.perf_counter() - start)
+                size += len(content)
+                assert status == 200, (path, status)
+            endpoints[f"{name}:{encoding}"] = {
+                "mean_bytes": round(size / options.requests),
+                **summarize_latencies(latencies),
+            }
+    return endpoints
+
+
+def run(options):
+    from django.db import connection
+    from products.datagen import generate
+
+    with isolated_database(options.database) as database:
+        generate(
+            products=options.products,
+            users=options.users,
+            orders=options.orders,
+            carts=0,
+            seed=options.seed,
+            log=lambda message: None,
+        )
+        results = {
+            name: measure_payload(data, options.repeat)
+            for name, data in payloads(options)
+        }
+        endpoints = measure_endpoints(options, access_token(top_customer()))
+        connection.close()
+
+    return {
+        "benchmark": "serialization",
+        "revision": git_revision(),
+        "database": {"vendor": connection.vendor, "name": str(database)},
+        "config": {
+            "products": options.products,
+            "users": options.users,
+            "orders": options.orders,
+            "repeat": options.repeat,
+            "requests": options.requests,
+            "seed": options.seed,
+        },
+        "payloads": results,
+        "endpoints": endpoints,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=4000)
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Runs per payload measurement"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Requests per endpoint and encoding"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database", help="SQLite file for the throwaway benchmark database"
+    )
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    return parser
+
+
+def print_summary(results):
+    print(
+        f"{'payload':<14} {'bytes':>9} {'render drf':>11} {'orjson':>8} "
+        f"{'parse drf':>10} {'orjson':>8} {'gzip':>8} {'ms':>7} {'br':>8} {'ms':>7}"
+    )
+    for name, stats in results["payloads"].items():
+        print(
+            f"{name:<14} {stats['bytes']:>9} {stats['render_ms']['drf']:>11} "
+            f"{stats['render_ms']['orjson']:>8} {stats['parse_ms']['drf']:>10} "
+            f"{stats['parse_ms']['orjson']:>8} {stats['gzip']['bytes']:>8} "
+            f"{stats['gzip']['ms']:>7} {stats['br']['bytes']:>8} {stats['br']['ms']:>7}"
+        )
+    print()
+    print(f"{'endpoint':<24} {'bytes':>8} {'p50':>8} {'p95':>8}")
+    for name, stats in results["endpoints"].items():
+        print(
+            f"{name:<24} {stats['mean_bytes']:>8} {stats['p50_ms']:>8} "
+            f"{stats['p95_ms']:>8}"
+        )
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare SQLite connection profiles under the flash-sale workload.
+
+Runs benchmarks.flash_sale once per profile in settings.SQLITE_PROFILES
+(default journal vs the WAL/IMMEDIATE production profile) with identical
+options and reports throughput, lock errors and server errors side by side.
+
+    python -m benchmarks.sqlite_profile --users 300 --threads 32 \\
+        --output sqlite_profiles.json
+"""
+
+import json
+
+from . import flash_sale
+from .common import git_revision, setup_django, write_results
+
+PROFILES = ("default", "production")
+
+
+def run(options):
+    from django.conf import settings
+    from django.db import connection
+
+    if connection.vendor != "sqlite":
+        raise SystemExit("The configured database is not SQLite")
+
+    runs = {}
+    for profile in PROFILES:
+        connection.close()
+        settings.DATABASES["default"]["OPTIONS"] = dict(
+            settings.SQLITE_PROFILES[profile]
+        )
+        runs[profile] = flash_sale.run(options)
+
+    base, tuned = runs["default"], runs["production"]
+    return {
+        "benchmark": "sqlite_profile",
+        "revision": git_revision(),
+        "profiles": runs,
+        "comparison": {
+            "throughput_gain": (
+                round(tuned["throughput_rps"] / base["throughput_rps"], 2)
+                if base["throughput_rps"]
+                else None
+            ),
+            "successful_checkouts": {
+                profile: runs[profile]["endpoints"]["checkout"]["status_counts"].get(
+                    "201", 0
+                )
+                for profile in PROFILES
+            },
+            "lock_errors": {
+                profile: sum(
+                    e["lock_errors"] for e in runs[profile]["endpoints"].values()
+                )
+                for profile in PROFILES
+            },
+            "server_errors": {
+                profile: sum(
+                    e["server_errors"] for e in runs[profile]["endpoints"].values()
+                )
+                for profile in PROFILES
+            },
+        },
+    }
+
+
+def main(argv=None):
+    options = flash_sale.build_parser().parse_args(argv)
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        for profile, profile_results in results["profiles"].items():
+            print(f"--- {profile}")
+            flash_sale.print_summary(profile_results)
+        print(f"comparison: {json.dumps(results['comparison'])}")
+
+
+if __name__ == "__main__":
+    main()
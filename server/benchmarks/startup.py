@@ -0,0 +1,176 @@
+"""
+Worker startup cost and OpenAPI schema latency.
+
+Each sample is a fresh interpreter (python -m benchmarks.startup --probe
+MODE) that times django.setup() and loading the URLconf, and reports its
+resident memory, the number of loaded modules (and how many of them are
+drf_spectacular), then times GET /api/schema/ cold and warm. Modes:
+
+* eager: drf_spectacular's views are imported with the URLconf and the
+  schema is generated on every request, as before the schema was prebuilt;
+* lazy: the current URLconf without a prebuilt schema, so the first
+  request generates it (development);
+* prebuilt: the current URLconf serving files from build_openapi_schema.
+
+    python -m benchmarks.startup --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .common import git_revision, setup_django, write_results
+
+MODES = ("eager", "lazy", "prebuilt")
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    import resource
+
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def probe(mode, warm_requests):
+    """Runs in the child process; returns one sample"""
+    start = time.perf_counter()
+    setup_django()
+    setup_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    if mode == "eager":
+        from drf_spectacular.views import SpectacularAPIView
+
+        schema_view = SpectacularAPIView.as_view()
+    else:
+        from config.schema import schema_view
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    urlconf_ms = (time.perf_counter() - start) * 1000
+
+    sample = {
+        "setup_ms": round(setup_ms, 3),
+        "urlconf_ms": round(urlconf_ms, 3),
+        "rss_mb": rss_mb(),
+        "modules": len(sys.modules),
+        "spectacular_modules": sum(
+            name.startswith("drf_spectacular") for name in sys.modules
+        ),
+    }
+
+    from django.test import RequestFactory
+
+    factory = RequestFactory()
+    latencies = []
+    for _ in range(1 + warm_requests):
+        request = factory.get("/api/schema/")
+        start = time.perf_counter()
+        response = schema_view(request)
+        if hasattr(response, "render"):
+            response.render()
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.status_code
+    sample["schema_cold_ms"] = round(latencies[0], 3)
+    sample["schema_warm_ms"] = round(statistics.median(latencies[1:]), 3)
+    sample["rss_after_schema_mb"] = rss_mb()
+    return sample
+
+
+def spawn(mode, options, schema_dir):
+    env = {**os.environ, "OPENAPI_SCHEMA_DIR": schema_dir}
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.startup",
+            "--probe",
+            mode,
+            "--requests",
+            str(options.requests),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def run(options):
+    from config.schema import write_schema
+
+    with tempfile.TemporaryDirectory() as prebuilt, tempfile.TemporaryDirectory() as empty:
+        write_schema(prebuilt)
+        directories = {"eager": empty, "lazy": empty, "prebuilt": prebuilt}
+        samples = {mode: [] for mode in MODES}
+        # Interleave the modes so drift (caches, CPU frequency) hits all alike
+        for _ in range(options.runs):
+            for mode in MODES:
+                samples[mode].append(spawn(mode, options, directories[mode]))
+
+    modes = {
+        mode: {
+            key: statistics.median(sample[key] for sample in runs) for key in runs[0]
+        }
+        for mode, runs in samples.items()
+    }
+    return {
+        "benchmark": "startup",
+        "revision": git_revision(),
+        "config": {"runs": options.runs, "requests": options.requests},
+        "modes": modes,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=7, help="Fresh processes per mode")
+    parser.add_argument(
+        "--requests", type=int, default=20, help="Warm schema requests per process"
+    )
+    parser.add_argument("--probe", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--output", default="-", help="JSON output path (- for stdout)")
+    return parser
+
+
+def print_summary(results):
+    columns = (
+        "setup_ms",
+        "urlconf_ms",
+        "rss_mb",
+        "modules",
+        "spectacular_modules",
+        "schema_cold_ms",
+        "schema_warm_ms",
+    )
+    print(f"{'mode':<10}" + "".join(f"{column:>20}" for column in columns))
+    for mode, stats in results["modes"].items():
+        print(f"{mode:<10}" + "".join(f"{stats[column]:>20}" for column in columns))
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.probe:
+        print(json.dumps(probe(options.probe, options.requests)))
+        return
+    setup_django()
+    results = run(options)
+    write_results(results, options.output)
+    if options.output != "-":
+        print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
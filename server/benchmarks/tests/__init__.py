@@ -0,0 +1,5 @@
+from .test_endpoints import EndpointBenchmarkCompareTests
+
+__all__ = [
+    "EndpointBenchmarkCompareTests",
+]
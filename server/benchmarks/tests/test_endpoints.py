@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+from ..common import percentile, summarize_latencies
+from ..endpoints import compare
+
+
+def results(**scenarios):
+    return {"results": {"small": scenarios}}
+
+
+def stats(p50, p95, queries):
+    return {"p50_ms": p50, "p95_ms": p95, "queries": queries}
+
+
+class EndpointBenchmarkCompareTests(SimpleTestCase):
+    def test_no_regression_within_threshold(self):
+        """Test that small or noisy changes pass the gate"""
+        baseline = results(product_list=stats(10.0, 20.0, 2))
+        current = results(product_list=stats(11.5, 20.5, 2))
+
+        self.assertEqual(compare(current, baseline, 0.2, 1.0), [])
+
+    def test_latency_regression(self):
+        """Test that a large latency increase is reported"""
+        baseline = results(product_list=stats(10.0, 20.0, 2))
+        current = results(product_list=stats(15.0, 20.0, 2))
+
+        self.assertEqual(
+            compare(current, baseline, 0.2, 1.0),
+            ["small/product_list: p50_ms 10.0 -> 15.0"],
+        )
+
+    def test_tiny_absolute_changes_are_ignored(self):
+        """Test that sub-millisecond changes never fail the gate"""
+        baseline = results(categories=stats(0.5, 0.6, 1))
+        current = results(categories=stats(0.9, 1.0, 1))
+
+        self.assertEqual(compare(current, baseline, 0.2, 1.0), [])
+
+    def test_query_count_regression(self):
+        """Test that any extra query is a regression"""
+        baseline = results(order_list=stats(10.0, 20.0, 3))
+        current = results(order_list=stats(10.0, 20.0, 4), new_endpoint=stats(1, 1, 9))
+
+        self.assertEqual(
+            compare(current, baseline, 0.2, 1.0),
+            ["small/order_list: queries 3 -> 4"],
+        )
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles"""
+        values = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 0.05)
+        self.assertEqual(percentile(values, 99), 0.099)
+        self.assertEqual(summarize_latencies([])["p50_ms"], 0.0)
@@ -0,0 +1,54 @@
+from django.db.models import Count, DecimalField, F, Sum
+from django.views.decorators.http import require_safe
+from rest_framework import exceptions
+from products.async_views import api_error, api_response
+from users.authentication import authenticate_async
+from .models import Cart, CartItem
+
+
+@require_safe
+async def cart_summary(request):
+    """
+    Item count and totals of the current cart for badges and checkout
+    buttons, without the items themselves. Async (ASGI-native) and
+    read-only: unlike the cart detail view it never creates a cart.
+    """
+    try:
+        user = await authenticate_async(request)
+    except exceptions.APIException as exc:
+        return api_error(exc)
+
+    if user.is_authenticated:
+        carts = Cart.objects.filter(user=user)
+    else:
+        # Mobile apps send the key in a header, web clients use the session
+        session_key = request.headers.get("X-Session-Key") or (
+            request.session.session_key
+        )
+        carts = (
+            Cart.objects.filter(session_key=session_key)
+            if session_key
+            else Cart.objects.none()
+        )
+    cart = await carts.only("id").afirst()
+
+    totals = {"items": 0, "total_items": 0, "subtotal": 0}
+    if cart is not None:
+        totals = await CartItem.objects.filter(cart=cart).aaggregate(
+            items=Count("id"),
+            total_items=Sum("quantity"),
+            subtotal=Sum(
+                F("quantity") * F("product__price"),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+
+    return api_response(
+        {
+            "id": cart.id if cart else None,
+            "items": totals["items"],
+            "total_items": totals["total_items"] or 0,
+            "subtotal": totals["subtotal"] or 0,
+            "total": totals["subtotal"] or 0,
+        }
+    )
@@ -1,9 +1,11 @@
 from .test_models import CartModelTests
 from .test_views import CartViewsTests
 from .test_edge_cases import CartEdgeCasesTests
+from .test_async_views import CartSummaryTests
 
 __all__ = [
     "CartModelTests",
     "CartViewsTests",
     "CartEdgeCasesTests",
+    "CartSummaryTests",
 ]
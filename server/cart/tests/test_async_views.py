@@ -0,0 +1,71 @@
+from decimal import Decimal
+from asgiref.sync import iscoroutinefunction
+from django.test import TestCase
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from products.models import Product
+from ..models import Cart, CartItem
+
+User = get_user_model()
+
+
+class CartSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="user@example.com", password="x")
+        cls.auth = {
+            "Authorization": "Bearer "
+            + str(RefreshToken.for_user(cls.user).access_token)
+        }
+        cls.laptop = Product.objects.create(
+            title="Laptop", price=Decimal("999.99"), inventory_count=5
+        )
+        cls.mouse = Product.objects.create(
+            title="Mouse", price=Decimal("25.50"), inventory_count=50
+        )
+        cls.cart = Cart.objects.create(user=cls.user)
+        CartItem.objects.create(cart=cls.cart, product=cls.laptop, quantity=1)
+        CartItem.objects.create(cart=cls.cart, product=cls.mouse, quantity=2)
+        cls.url = reverse("cart-summary")
+
+    def test_view_is_async(self):
+        self.assertTrue(iscoroutinefunction(resolve(self.url).func))
+
+    async def test_user_cart_summary(self):
+        response = await self.async_client.get(self.url, headers=self.auth)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": self.cart.id,
+                "items": 2,
+                "total_items": 3,
+                "subtotal": 1050.99,
+                "total": 1050.99,
+            },
+        )
+
+    async def test_session_cart_summary(self):
+        cart = await Cart.objects.acreate(session_key="mobile-session")
+        await CartItem.objects.acreate(cart=cart, product=self.mouse, quantity=4)
+
+        response = await self.async_client.get(
+            self.url, headers={"X-Session-Key": "mobile-session"}
+        )
+
+        self.assertEqual(response.json()["id"], cart.id)
+        self.assertEqual(response.json()["total_items"], 4)
+        self.assertEqual(response.json()["subtotal"], 102.0)
+
+    async def test_missing_cart_is_not_created(self):
+        """Test that the summary is read-only"""
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(
+            response.json(),
+            {"id": None, "items": 0, "total_items": 0, "subtotal": 0, "total": 0},
+        )
+        self.assertEqual(await Cart.objects.acount(), 1)
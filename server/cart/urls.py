@@ -6,9 +6,11 @@ from .views import (
     RemoveFromCartView,
     merge_carts_view,
 )
+from .async_views import cart_summary
 
 urlpatterns = [
     path("", CartDetailView.as_view(), name="cart-detail"),
+    path("summary/", cart_summary, name="cart-summary"),
     path("add/", AddToCartView.as_view(), name="add-to-cart"),
     path(
         "items/<int:pk>/update/",
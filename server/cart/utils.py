@@ -1,6 +1,8 @@
 from .models import Cart, CartItem
 from products.models import Product
+from products.popularity import record
 from django.db import transaction
+from monitoring.metrics import record_oversell_prevented
 
 
 def get_or_create_cart(request):
@@ -73,6 +75,7 @@ def add_to_cart(cart, product_id, quantity=1):
         return None, "Product not found"
 
     if product.inventory_count < quantity:
+        record_oversell_prevented("cart")
         return None, "Not enough stock available"
 
     # Check if item already exists in cart
@@ -83,10 +86,12 @@ def add_to_cart(cart, product_id, quantity=1):
     if not created:
         new_quantity = cart_item.quantity + quantity
         if product.inventory_count < new_quantity:
+            record_oversell_prevented("cart")
             return None, "Exceeds available stock"
         cart_item.quantity = new_quantity
         cart_item.save()
 
+    transaction.on_commit(lambda: record(product.id, "cart_add"))
     return cart_item, None
 
 
@@ -104,6 +109,7 @@ def update_cart_item(cart, item_id, quantity):
         return None, "Item removed from cart"
 
     if cart_item.product.inventory_count < quantity:
+        record_oversell_prevented("cart")
         return None, "Not enough stock available"
 
     cart_item.quantity = quantity
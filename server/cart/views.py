@@ -6,6 +6,7 @@ from .serializers import CartSerializer, CartItemSerializer
 from .utils import get_or_create_cart, add_to_cart, update_cart_item, merge_carts
 from products.models import Product
 from django.db import transaction
+from config.throttling import TOKEN_BUCKET_THROTTLES
 
 
 def get_cart_from_request(request):
@@ -37,6 +38,8 @@ class CartDetailView(generics.RetrieveAPIView):
 class AddToCartView(generics.CreateAPIView):
     serializer_class = CartItemSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = TOKEN_BUCKET_THROTTLES
+    throttle_scope = "cart"
 
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -0,0 +1,11 @@
+"""Helpers for queries and writes over many rows."""
+
+# Keeps IN lists and CASE expressions well under SQLite's variable limit
+CHUNK_SIZE = 500
+
+
+def chunks(values, size=CHUNK_SIZE):
+    """Consecutive lists of up to size items from values"""
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
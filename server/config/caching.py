@@ -0,0 +1,259 @@
+"""
+Shared caching helpers on top of Django's cache framework.
+
+get_or_set() and aget_or_set() store each value with its logical expiry
+and the time it took to compute, and keep it in the backend for
+CACHE_STALE_TIMEOUT seconds longer than that:
+
+- Single flight: when an entry expires, the first caller to take the
+  rebuild lock (an atomic cache.add()) recomputes it while everyone else
+  keeps serving the stale value. On a cold miss the others wait for the
+  rebuild instead of all querying the database at once, and one of them
+  takes the lock over if the rebuild fails. Each lock holds a random token
+  so that a caller only ever releases its own lock.
+- Probabilistic early expiry: shortly before expiry each read recomputes
+  with a probability that grows as the deadline nears and with how
+  expensive the value is, so hot keys are usually rebuilt before they
+  expire at all.
+- Namespaced keys: versioned_key() embeds a per-namespace version, and
+  bump_namespace() moves every key in it to a new version at once.
+
+Hits, misses and rebuilds are counted per logical key in cache_stats.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+
+LOCK_KEY = "lock:{}"
+NAMESPACE_KEY = "namespace:{}"
+
+# How often callers waiting for a cold miss to be rebuilt look again
+WAIT_INTERVAL = 0.05
+
+
+class CacheStats:
+    """
+    Per-key cache outcome counters, kept in this process. Observers are
+    called with (name, outcome) for every outcome recorded, e.g. to export
+    them as metrics.
+    """
+
+    OUTCOMES = ("hit", "stale", "miss", "early", "wait")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}
+        self.observers = []
+
+    def record(self, name, outcome):
+        with self._lock:
+            counts = self._keys.get(name)
+            if counts is None:
+                counts = self._keys[name] = dict.fromkeys(self.OUTCOMES, 0)
+            counts[outcome] += 1
+        for observer in self.observers:
+            observer(name, outcome)
+
+    def snapshot(self):
+        with self._lock:
+            keys = {name: dict(counts) for name, counts in self._keys.items()}
+        for counts in keys.values():
+            total = sum(counts.values())
+            served = counts["hit"] + counts["stale"] + counts["wait"]
+            counts["hit_ratio"] = round(served / total, 3) if total else 0.0
+        return dict(sorted(keys.items()))
+
+    def reset(self):
+        with self._lock:
+            self._keys.clear()
+
+
+cache_stats = CacheStats()
+
+
+def namespace_version(namespace, alias="default"):
+    return caches[alias].get_or_set(NAMESPACE_KEY.format(namespace), 1, None)
+
+
+async def anamespace_version(namespace, alias="default"):
+    return await caches[alias].aget_or_set(NAMESPACE_KEY.format(namespace), 1, None)
+
+
+def bump_namespace(namespace, alias="default"):
+    """Invalidate every versioned_key() in namespace"""
+    cache = caches[alias]
+    key = NAMESPACE_KEY.format(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Never read yet (or evicted): any version newer than 1 will do
+        cache.set(key, 2, None)
+
+
+def versioned_key(namespace, *parts, alias="default"):
+    version = namespace_version(namespace, alias)
+    return ":".join([namespace, f"v{version}", *map(str, parts)])
+
+
+async def aversioned_key(namespace, *parts, alias="default"):
+    version = await anamespace_version(namespace, alias)
+    return ":".join([namespace, f"v{version}", *map(str, parts)])
+
+
+def _entry(value, timeout, delta):
+    return (value, time.time() + timeout, delta)
+
+
+def _expire_early(expires, delta, beta):
+    """
+    Whether to rebuild a still-valid entry now. The chance rises
+    exponentially towards expiry, scaled by the entry's rebuild time.
+    """
+    if beta <= 0:
+        return False
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires
+
+
+def _options(timeout, stale_timeout, lock_timeout):
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+    if lock_timeout is None:
+        lock_timeout = settings.CACHE_LOCK_TIMEOUT
+    return timeout + stale_timeout, lock_timeout
+
+
+def _release(cache, lock_key, token):
+    # After lock_timeout the lock may belong to another caller. get() then
+    # delete() is not atomic, but only a lock expiring between the two can
+    # still be released by mistake.
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+async def _arelease(cache, lock_key, token):
+    if await cache.aget(lock_key) == token:
+        await cache.adelete(lock_key)
+
+
+def get_or_set(
+    key,
+    compute,
+    timeout,
+    *,
+    name=None,
+    beta=1.0,
+    stale_timeout=None,
+    lock_timeout=None,
+    alias="default",
+):
+    """
+    Return the cached value for key, calling compute() to (re)build it
+    with single-flight and early-expiry protection. name is the key the
+    hit/miss counters are recorded under; it defaults to key.
+    """
+    cache = caches[alias]
+    name = name or key
+    lifetime, lock_timeout = _options(timeout, stale_timeout, lock_timeout)
+    lock_key = LOCK_KEY.format(key)
+    token = uuid.uuid4().hex
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires, delta = entry
+        expired = time.time() >= expires
+        if not expired and not _expire_early(expires, delta, beta):
+            cache_stats.record(name, "hit")
+            return value
+        if not cache.add(lock_key, token, lock_timeout):
+            cache_stats.record(name, "stale")
+            return value
+        cache_stats.record(name, "miss" if expired else "early")
+    elif cache.add(lock_key, token, lock_timeout):
+        cache_stats.record(name, "miss")
+    else:
+        deadline = time.monotonic() + lock_timeout
+        while True:
+            if time.monotonic() >= deadline:
+                # The rebuild is stuck; compute without the lock
+                cache_stats.record(name, "miss")
+                return compute()
+            time.sleep(WAIT_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                cache_stats.record(name, "wait")
+                return entry[0]
+            # The lock is gone without a value: the rebuild failed
+            if cache.add(lock_key, token, lock_timeout):
+                cache_stats.record(name, "miss")
+                break
+
+    try:
+        start = time.perf_counter()
+        value = compute()
+        cache.set(key, _entry(value, timeout, time.perf_counter() - start), lifetime)
+        return value
+    finally:
+        _release(cache, lock_key, token)
+
+
+async def aget_or_set(
+    key,
+    compute,
+    timeout,
+    *,
+    name=None,
+    beta=1.0,
+    stale_timeout=None,
+    lock_timeout=None,
+    alias="default",
+):
+    """get_or_set() for async views; compute is a coroutine function"""
+    cache = caches[alias]
+    name = name or key
+    lifetime, lock_timeout = _options(timeout, stale_timeout, lock_timeout)
+    lock_key = LOCK_KEY.format(key)
+    token = uuid.uuid4().hex
+
+    entry = await cache.aget(key)
+    if entry is not None:
+        value, expires, delta = entry
+        expired = time.time() >= expires
+        if not expired and not _expire_early(expires, delta, beta):
+            cache_stats.record(name, "hit")
+            return value
+        if not await cache.aadd(lock_key, token, lock_timeout):
+            cache_stats.record(name, "stale")
+            return value
+        cache_stats.record(name, "miss" if expired else "early")
+    elif await cache.aadd(lock_key, token, lock_timeout):
+        cache_stats.record(name, "miss")
+    else:
+        deadline = time.monotonic() + lock_timeout
+        while True:
+            if time.monotonic() >= deadline:
+                cache_stats.record(name, "miss")
+                return await compute()
+            await asyncio.sleep(WAIT_INTERVAL)
+            entry = await cache.aget(key)
+            if entry is not None:
+                cache_stats.record(name, "wait")
+                return entry[0]
+            if await cache.aadd(lock_key, token, lock_timeout):
+                cache_stats.record(name, "miss")
+                break
+
+    try:
+        start = time.perf_counter()
+        value = await compute()
+        await cache.aset(
+            key, _entry(value, timeout, time.perf_counter() - start), lifetime
+        )
+        return value
+    finally:
+        await _arelease(cache, lock_key, token)
@@ -0,0 +1,43 @@
+"""
+Gunicorn settings for multi-worker deployments:
+
+    gunicorn -c python:config.gunicorn config.wsgi
+
+Workers share Prometheus metrics through PROMETHEUS_MULTIPROC_DIR, which
+must be set before any worker imports prometheus_client and must start out
+empty, so stale samples from a previous run are not added in.
+"""
+
+import os
+import shutil
+import tempfile
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "kenkeputa-metrics"),
+)
+
+
+def on_starting(server):
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def worker_exit(server, worker):
+    # Runs in the worker: write the popularity counts still buffered
+    from products.popularity import popularity_buffer
+
+    popularity_buffer.flush()
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    # Drop the exited worker's live gauges (in-progress requests)
+    multiprocess.mark_process_dead(worker.pid)
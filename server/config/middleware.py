@@ -0,0 +1,207 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import FileResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+from .routers import SAFE_METHODS, pin_primary, start_routing, stop_routing
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let views that opted into replica reads use a replica on safe requests,
+    and pin a user to the primary after any successful write so their next
+    reads see it (see config.routers).
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        routing, token = start_routing(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_routing(token)
+        self._pin_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        routing, token = start_routing(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_routing(token)
+        self._pin_writer(request, response)
+        return response
+
+    def _pin_writer(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_primary(getattr(request, "user", None))
+
+
+def accepted_encodings(header):
+    """Accept-Encoding as {coding: q}"""
+    encodings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[coding.strip().lower()] = q
+    return encodings
+
+
+def negotiate_encoding(header, allow_brotli=True):
+    """Best of br/gzip the client accepts (br on a tie), or None"""
+    accepted = accepted_encodings(header)
+    best, best_q = None, 0.0
+    for coding in ("br", "gzip") if brotli and allow_brotli else ("gzip",):
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+# Media types worth compressing; anything else (images, archives, profiler
+# binaries) is already compressed or too rare to matter
+COMPRESSIBLE_TYPES = frozenset(
+    (
+        "application/json",
+        "application/x-ndjson",
+        "application/yaml",
+        "application/vnd.oai.openapi",
+        "application/javascript",
+        "application/xml",
+    )
+)
+
+
+def compressible(content_type):
+    media_type = content_type.partition(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith("+json")
+        or media_type in COMPRESSIBLE_TYPES
+    )
+
+
+def may_hold_secrets(request, response):
+    """
+    Whether a response can hold secrets a cross-site page could make the
+    browser fetch (BREACH): requests sending cookies, which the browser adds
+    on its own, and responses setting them. Bearer tokens are never sent
+    cross-site.
+    """
+    return bool(request.COOKIES or response.cookies)
+
+
+def brotli_sequence(sequence, quality):
+    compressor = brotli.Compressor(quality=quality)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Brotli or gzip, negotiated from Accept-Encoding (honouring q values),
+    for text-like responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes
+    and for text-like streaming responses other than files. Brotli uses a
+    mid quality level: the top levels cost far more CPU than they save bytes
+    on dynamic JSON.
+
+    gzip hides the compressed length from BREACH with random padding
+    (max_random_bytes); brotli has nothing like it, so responses that may
+    hold secrets get gzip even when the client prefers brotli.
+    """
+
+    brotli_quality = 5
+
+    def process_response(self, request, response):
+        if (
+            response.has_header("Content-Encoding")
+            or isinstance(response, FileResponse)
+            or not compressible(response.get("Content-Type", ""))
+            or (
+                not response.streaming
+                and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE
+            )
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            allow_brotli=not may_hold_secrets(request, response),
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(response, encoding)
+            # The compressed size is only known once it has been streamed
+            del response.headers["Content-Length"]
+        else:
+            compressed = self.compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # Compression changes the bytes, so a strong ETag becomes weak
+        # (RFC 9110 8.8.1); If-None-Match still matches it weakly
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def compress(self, content, encoding):
+        if encoding == "br":
+            return brotli.compress(content, quality=self.brotli_quality)
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
+
+    def compress_stream(self, response, encoding):
+        # Read streaming_content once: it is a fresh map over the iterator
+        content = response.streaming_content
+        if response.is_async:
+            if encoding == "br":
+                return self._abrotli(content)
+            return self._agzip(content)
+        if encoding == "br":
+            return brotli_sequence(content, self.brotli_quality)
+        return compress_sequence(content, max_random_bytes=self.max_random_bytes)
+
+    async def _abrotli(self, content):
+        compressor = brotli.Compressor(quality=self.brotli_quality)
+        async for item in content:
+            data = compressor.process(item)
+            if data:
+                yield data
+        yield compressor.finish()
+
+    async def _agzip(self, content):
+        async for item in content:
+            yield compress_string(item, max_random_bytes=self.max_random_bytes)
@@ -0,0 +1,37 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Types orjson has no native support for (Decimal, timedelta, lazy strings,
+# querysets, ...) fall back to DRF's encoder, so they render as before
+_fallback = JSONEncoder().default
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data):
+    """
+    Serialize like DRF's JSONRenderer: compact, UTF-8, "Z" for UTC
+    datetimes, Decimals as numbers, and U+2028/U+2029 escaped so the
+    output is also valid JavaScript.
+    """
+    content = orjson.dumps(data, default=_fallback, option=OPTIONS)
+    if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+    return content
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. Requests for indented output
+    (``Accept: application/json; indent=4``) go through DRF's renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,124 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the primary ("default"). Reads go to a read replica only
+while a view that opted in (``replica_reads = True`` on a class-based view,
+the ``@replica_reads`` decorator on a function view) is handling a safe
+(GET/HEAD/OPTIONS) request, only for models in DATABASE_REPLICA_APPS, and
+only when none of these apply:
+
+* a transaction is open on the primary (checkout reads stock under a lock);
+* the user wrote something in the last DATABASE_REPLICA_PIN_SECONDS
+  (read-your-writes: their next reads must see their own changes).
+
+The per-request state lives in a ContextVar set by
+config.middleware.ReplicaRoutingMiddleware, so code outside a request
+(management commands, signals, shells) always uses the primary.
+"""
+
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_KEY = "db:pin-primary:user:{}"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_routing = ContextVar("db_routing", default=None)
+
+
+def replica_reads(view):
+    """Mark a function view as safe to serve from a replica"""
+    view.replica_reads = True
+    return view
+
+
+def pin_primary(user):
+    """Send this user's replica-eligible reads to the primary for a while"""
+    if user is not None and user.is_authenticated:
+        cache.set(PIN_KEY.format(user.pk), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    return (
+        user is not None
+        and user.is_authenticated
+        and cache.get(PIN_KEY.format(user.pk), False)
+    )
+
+
+class RequestRouting:
+    """Routing decisions for the request being handled"""
+
+    def __init__(self, request):
+        self.request = request
+        self._replica_reads = None
+        self._replica = None
+        self._pinned = None
+
+    @property
+    def replica_reads(self):
+        # resolver_match is set once URL resolution picked the view
+        if self._replica_reads is None:
+            match = getattr(self.request, "resolver_match", None)
+            if match is None:
+                return False
+            view = getattr(match.func, "cls", match.func)
+            self._replica_reads = self.request.method in SAFE_METHODS and getattr(
+                view, "replica_reads", False
+            )
+        return self._replica_reads
+
+    @property
+    def replica(self):
+        # One replica per request so a page and its count agree
+        if self._replica is None and settings.DATABASE_REPLICA_ALIASES:
+            self._replica = random.choice(settings.DATABASE_REPLICA_ALIASES)
+        return self._replica
+
+    @property
+    def pinned(self):
+        # request.user is the authenticated API user once DRF has run
+        # authentication, which happens before any view reads
+        if self._pinned is None:
+            self._pinned = is_pinned(getattr(self.request, "user", None))
+        return self._pinned
+
+
+def start_routing(request):
+    routing = RequestRouting(request)
+    return routing, _routing.set(routing)
+
+
+def stop_routing(token):
+    _routing.reset(token)
+
+
+def current_routing():
+    return _routing.get()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if (
+            routing is None
+            or not routing.replica_reads
+            or model._meta.app_label not in settings.DATABASE_REPLICA_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or routing.pinned
+        ):
+            return DEFAULT_DB_ALIAS
+        return routing.replica or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        return db not in settings.DATABASE_REPLICA_ALIASES
@@ -0,0 +1,127 @@
+"""
+OpenAPI schema, built ahead of time.
+
+`manage.py build_openapi_schema` (run at build or deploy time) renders the
+schema to OPENAPI_SCHEMA_DIR as openapi.yaml and openapi.json. /api/schema/
+serves those files from memory with an ETag and public caching headers,
+instead of introspecting every view and serializer on each request. When
+no prebuilt schema exists (e.g. in development) it is generated on the
+first request and kept for the life of the process.
+
+drf_spectacular's generator, renderers and docs views are only imported to
+generate the schema or to render the Swagger and Redoc pages (see
+lazy_view), not when the URLconf loads.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+
+FORMATS = {
+    "yaml": ("openapi.yaml", "application/vnd.oai.openapi"),
+    "json": ("openapi.json", "application/vnd.oai.openapi+json"),
+}
+
+_schemas = {}
+_lock = threading.Lock()
+
+
+def generate_schema():
+    """Render the schema in every format: {"yaml": bytes, "json": bytes}"""
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+    import users.schema  # noqa: F401 - registers the JWT security scheme
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+def write_schema(directory=None):
+    """Build the schema files; returns their paths"""
+    directory = Path(directory or settings.OPENAPI_SCHEMA_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for schema_format, body in generate_schema().items():
+        path = directory / FORMATS[schema_format][0]
+        path.write_bytes(body)
+        paths.append(path)
+    return paths
+
+
+def load_schema(schema_format):
+    """(body, etag) for schema_format, read or generated once per process"""
+    schema = _schemas.get(schema_format)
+    if schema is not None:
+        return schema
+    with _lock:
+        if not _schemas:
+            directory = Path(settings.OPENAPI_SCHEMA_DIR)
+            paths = {name: directory / FORMATS[name][0] for name in FORMATS}
+            if all(path.is_file() for path in paths.values()):
+                bodies = {name: path.read_bytes() for name, path in paths.items()}
+            else:
+                bodies = generate_schema()
+            for name, body in bodies.items():
+                etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+                _schemas[name] = (body, etag)
+    return _schemas[schema_format]
+
+
+def clear_schema_cache():
+    with _lock:
+        _schemas.clear()
+
+
+def requested_format(request):
+    schema_format = request.GET.get("format")
+    if schema_format in FORMATS:
+        return schema_format
+    accept = request.headers.get("Accept", "")
+    return "json" if "json" in accept and "yaml" not in accept else "yaml"
+
+
+def _client_has(request, etag):
+    """If-None-Match check that also accepts the weak ETags compression sends"""
+    header = request.headers.get("If-None-Match", "")
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in header.split(",")
+    )
+
+
+@require_safe
+def schema_view(request):
+    """The OpenAPI schema as YAML (default) or JSON (?format=json)"""
+    schema_format = requested_format(request)
+    body, etag = load_schema(schema_format)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}",
+        "Vary": "Accept",
+    }
+    if _client_has(request, etag):
+        return HttpResponseNotModified(headers=headers)
+    return HttpResponse(body, content_type=FORMATS[schema_format][1], headers=headers)
+
+
+def lazy_view(view_path, **initkwargs):
+    """
+    A class-based view that is imported on its first request rather than
+    when the URLconf loads
+    """
+    view = None
+
+    def lazy(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return lazy
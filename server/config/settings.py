@@ -54,15 +54,22 @@ INSTALLED_APPS = [
     "products",
     "cart",
     "orders",
+    "wishlist",
+    "analytics",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.MetricsMiddleware",
+    "monitoring.middleware.RequestTimingMiddleware",
+    "config.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -126,13 +133,59 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# SQLite connection profiles. "production" uses WAL journaling (readers no
+# longer block the writer), fsyncs only at checkpoints, a 64 MiB page cache,
+# 256 MiB of memory-mapped I/O and in-memory temp tables, waits up to
+# SQLITE_BUSY_TIMEOUT_MS for locks instead of failing, and opens every
+# transaction.atomic() block (checkout, cart updates) with BEGIN IMMEDIATE so
+# concurrent writers queue for the lock instead of failing to upgrade it.
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "init_command": ";".join(
+            [
+                "PRAGMA journal_mode=WAL",
+                "PRAGMA synchronous=NORMAL",
+                "PRAGMA cache_size=-65536",
+                "PRAGMA mmap_size=268435456",
+                "PRAGMA temp_store=MEMORY",
+                f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+            ]
+        ),
+        "transaction_mode": "IMMEDIATE",
+    },
+}
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "default" if DEBUG else "production")
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": dict(SQLITE_PROFILES[SQLITE_PROFILE]),
     }
 }
 
+# Read replicas: comma-separated database names (SQLite file paths locally),
+# configured like the primary and registered as "replica1", "replica2", ...
+# Views with replica_reads = True read models from DATABASE_REPLICA_APPS on a
+# replica; a user who writes reads from the primary for
+# DATABASE_REPLICA_PIN_SECONDS afterwards (see config/routers.py).
+DATABASE_REPLICAS = [
+    name for name in os.getenv("DATABASE_REPLICAS", "").split(",") if name.strip()
+]
+for index, name in enumerate(DATABASE_REPLICAS, start=1):
+    DATABASES[f"replica{index}"] = {
+        **DATABASES["default"],
+        "NAME": name.strip(),
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_REPLICA_ALIASES = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_APPS = {"products", "orders"}
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "10"))
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+
 # DATABASES = {
 #     "default": {
 #         "ENGINE": "django.db.backends.postgresql",
@@ -169,7 +222,16 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.StatelessJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 12,
@@ -178,6 +240,19 @@ REST_FRAMEWORK = {
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
     ],
+    # Token buckets per "<throttle_scope>_<ip|user|session>" (config/throttling.py)
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "20/min",
+        "login_user": "5/min",
+        "register_ip": "10/hour",
+        "cart_ip": "300/min",
+        "cart_user": "60/min",
+        "cart_session": "60/min",
+    },
+    # Reverse proxies in front of the app; throttles identify clients by the
+    # X-Forwarded-For entry this many hops from the right, or by REMOTE_ADDR
+    # when 0, so a client cannot pick its own address
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
 
@@ -187,6 +262,11 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
 }
 
+# Prebuilt OpenAPI schema (manage.py build_openapi_schema) served by
+# /api/schema/; clients may cache it for OPENAPI_SCHEMA_MAX_AGE seconds.
+OPENAPI_SCHEMA_DIR = os.getenv("OPENAPI_SCHEMA_DIR", str(BASE_DIR / "openapi"))
+OPENAPI_SCHEMA_MAX_AGE = 60 * 60
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -194,6 +274,141 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Cache backend: "locmem" (per process), "file" (shared by the processes of
+# one host) or "redis" (any Redis-compatible server; needs the redis package).
+# CACHE_LOCATION is the directory or server URL. Bumping CACHE_VERSION
+# abandons every existing entry, e.g. after a deploy that changes payloads.
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", ""),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / ".cache"),
+    ),
+    "redis": (
+        "django.core.cache.backends.redis.RedisCache",
+        "redis://127.0.0.1:6379/0",
+    ),
+}
+CACHE_BACKEND, CACHE_DEFAULT_LOCATION = CACHE_BACKENDS[
+    os.getenv("CACHE_BACKEND", "locmem")
+]
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", CACHE_DEFAULT_LOCATION),
+        "KEY_PREFIX": "kenkeputa",
+        "VERSION": int(os.getenv("CACHE_VERSION", "1")),
+    }
+}
+
+# config.caching: expired entries are kept (and served while one caller
+# rebuilds them) for CACHE_STALE_TIMEOUT more seconds; a rebuild lock is
+# released after CACHE_LOCK_TIMEOUT seconds even if its holder died.
+CACHE_STALE_TIMEOUT = 300
+CACHE_LOCK_TIMEOUT = 10
+
+# Rate limiting (config/throttling.py). Buckets are shared through Redis
+# when RATE_LIMIT_REDIS_URL is set (it defaults to the cache's server with
+# CACHE_BACKEND=redis), otherwise kept per process.
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True") == "True"
+RATE_LIMIT_REDIS_URL = os.getenv(
+    "RATE_LIMIT_REDIS_URL",
+    CACHES["default"]["LOCATION"] if CACHE_BACKEND.endswith("RedisCache") else "",
+)
+
+# Product category list caching (seconds). Saving or deleting a product
+# invalidates it at once.
+CATEGORY_CACHE_TIMEOUT = 300
+# Catalog page counts (products.pagination), per category/stock filter (not
+# for searches or price bounds). Saving or deleting a product refreshes them
+# at once; stock changes within this many seconds.
+CATALOG_COUNT_CACHE_TIMEOUT = 60
+
+# Most product ids one GET /api/wishlist/contains/ may ask about
+WISHLIST_CONTAINS_MAX_IDS = 100
+
+# Product popularity (products.popularity): views, add-to-carts and purchases
+# are buffered per process and written every POPULARITY_FLUSH_INTERVAL
+# seconds, POPULARITY_FLUSH_BATCH products per UPDATE. The score is the
+# weighted sum of the three counters.
+POPULARITY_FLUSH_INTERVAL = float(os.getenv("POPULARITY_FLUSH_INTERVAL", "10"))
+POPULARITY_FLUSH_BATCH = 500
+POPULARITY_WEIGHTS = {"view": 1, "cart_add": 5, "purchase": 20}
+
+# "Frequently bought together" (products.recommendations): the top
+# RELATED_PRODUCTS_TOP_K products bought in at least RELATED_PRODUCTS_MIN_ORDERS
+# orders with each product. `manage.py build_related_products` keeps the
+# co-occurrence matrix in RELATED_PRODUCTS_MATRIX between runs, and re-reads
+# the orders created up to RELATED_PRODUCTS_ORDER_OVERLAP seconds before the
+# newest one counted, to catch checkouts that committed late.
+RELATED_PRODUCTS_TOP_K = 10
+RELATED_PRODUCTS_MIN_ORDERS = 1
+RELATED_PRODUCTS_ORDER_OVERLAP = 600
+RELATED_PRODUCTS_MATRIX = os.getenv(
+    "RELATED_PRODUCTS_MATRIX", str(BASE_DIR / "data" / "cooccurrence.npz")
+)
+
+# Similar products by title, description and category (products.similarity):
+# the top SIMILAR_PRODUCTS_TOP_K with a TF-IDF cosine of at least
+# SIMILAR_PRODUCTS_MIN_SCORE. `manage.py build_similar_products` keeps the
+# term counts and neighbours in SIMILAR_PRODUCTS_INDEX between runs.
+SIMILAR_PRODUCTS_TOP_K = 10
+SIMILAR_PRODUCTS_MIN_SCORE = 0.1
+SIMILAR_PRODUCTS_INDEX = os.getenv(
+    "SIMILAR_PRODUCTS_INDEX", str(BASE_DIR / "data" / "similarity.npz")
+)
+
+# Seconds a user's email/active/staff/password state is cached for token
+# authentication. Saving or deleting the user drops the entry at once in the
+# saving process; with the per-process locmem cache, other processes keep
+# theirs until it expires (check --deploy warns about this, users.W001).
+USER_AUTH_CACHE_TIMEOUT = 60
+
+# Request instrumentation: fraction of requests timed into the per-view
+# histograms and given a Server-Timing header. Keep it low in production.
+REQUEST_TIMING_SAMPLE_RATE = float(
+    os.getenv("REQUEST_TIMING_SAMPLE_RATE", "1.0" if DEBUG else "0.05")
+)
+REQUEST_TIMING_SERIALIZERS = True
+
+# Slow-query log (monitoring/slow_queries.py): statements taking at least
+# SLOW_QUERY_THRESHOLD_MS (empty to disable) are appended to SLOW_QUERY_LOG
+# with their view, calling code and query plan. EXPLAIN ANALYZE re-runs the
+# query, so it is opt-in (PostgreSQL only).
+SLOW_QUERY_THRESHOLD_MS = os.getenv("SLOW_QUERY_THRESHOLD_MS", "100")
+SLOW_QUERY_THRESHOLD_MS = (
+    float(SLOW_QUERY_THRESHOLD_MS) if SLOW_QUERY_THRESHOLD_MS else None
+)
+SLOW_QUERY_LOG = os.getenv(
+    "SLOW_QUERY_LOG", str(BASE_DIR / "logs" / "slow_queries.jsonl")
+)
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "False") == "True"
+SLOW_QUERY_EXPLAIN_INTERVAL = 300
+
+# On-demand profiling (monitoring/profiling.py): staff profile tokens are
+# valid for PROFILE_TOKEN_MAX_AGE seconds; the newest PROFILE_KEEP reports
+# are kept in PROFILE_DIR.
+PROFILE_DIR = os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles"))
+PROFILE_TOKEN_MAX_AGE = 60 * 60
+PROFILE_SAMPLE_INTERVAL = 0.001
+PROFILE_KEEP = 50
+
+# Prometheus metrics at /metrics (monitoring.metrics; needs prometheus_client).
+# Set PROMETHEUS_MULTIPROC_DIR to aggregate across worker processes.
+# Scrapes must send "Authorization: Bearer <METRICS_TOKEN>"; with no token
+# set, /metrics is refused unless DEBUG is on.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Text-like responses at least this large (bytes) are compressed with brotli
+# or gzip when the client accepts it; streaming ones always are.
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+
+# Order detail response caching (seconds). Delivered and cancelled orders
+# never change, so their entries can live much longer.
+ORDER_CACHE_TIMEOUT = 60
+FINAL_ORDER_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -215,6 +430,15 @@ STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are named by the SHA-256 of their content (config.storage), so
+# identical files are stored once and can be cached as immutable.
+STORAGES = {
+    "default": {"BACKEND": "config.storage.ContentAddressedStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+}
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
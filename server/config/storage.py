@@ -0,0 +1,149 @@
+"""
+Content-addressed media storage.
+
+Uploads are stored as <upload_to>/<hh>/<sha256><ext>, where hh is the first
+two hex digits of the hash. Uploading the same file twice stores it once,
+and since a name never changes content, media can be cached forever:
+serve_media() sends Cache-Control: immutable with the hash as ETag.
+
+Files uploaded before this storage was enabled keep their names until
+`manage.py rehash_media` moves them (see rehash_field()).
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import uuid
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db.models import FileField
+from django.http import HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import parse_etags
+from django.views.static import serve
+
+HASHED_NAME = re.compile(r"(?:^|/)[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(?:\.\w+)?$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def content_digest(content):
+    digest = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def name_digest(name):
+    """The content hash in a content-addressed name, or None"""
+    match = HASHED_NAME.search(name)
+    return match["digest"] if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files after the SHA-256 of their content"""
+
+    def hashed_name(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        digest = content_digest(content)
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def get_available_name(self, name, max_length=None):
+        # _save() renames by content, so the upload name is never kept
+        return name
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            return name
+        # Write under a unique name and rename into place, so a concurrent
+        # upload of the same file never sees it half written
+        temporary = super()._save(f"{name}.{uuid.uuid4().hex}.tmp", content)
+        os.replace(self.path(temporary), self.path(name))
+        return name
+
+
+def _client_has(request, etag):
+    """If-None-Match check that also accepts the weak ETags compression sends"""
+    etags = {
+        candidate.removeprefix("W/")
+        for candidate in parse_etags(request.headers.get("If-None-Match", ""))
+    }
+    return "*" in etags or etag in etags
+
+
+def serve_media(request, path, document_root=None):
+    """
+    django.views.static.serve() with long-lived caching for content-addressed
+    files. Other files are served as before, revalidated by Last-Modified.
+    """
+    document_root = document_root or settings.MEDIA_ROOT
+    digest = name_digest(path)
+    if digest is None:
+        return serve(request, path, document_root=document_root)
+
+    etag = f'"{digest}"'
+    # Resolved like serve() does; a file deleted since gets its 404
+    fullpath = safe_join(document_root, posixpath.normpath(path).lstrip("/"))
+    if _client_has(request, etag) and os.path.isfile(fullpath):
+        response = HttpResponseNotModified()
+    else:
+        response = serve(request, path, document_root=document_root)
+    response["ETag"] = etag
+    response["Cache-Control"] = IMMUTABLE
+    return response
+
+
+def content_addressed_fields():
+    """(model, field) for every file field stored content-addressed"""
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, FileField) and isinstance(
+                field.storage, ContentAddressedStorage
+            ):
+                yield model, field
+
+
+def rehash_field(model, field, batch_size=500, dry_run=False):
+    """
+    Move the files of one field to content-addressed names, batch_size rows
+    at a time, and point the rows at them. Returns counts of rows rehashed,
+    already hashed and whose file is missing, and the old names moved off.
+    """
+    storage = field.storage
+    counts = {"rehashed": 0, "hashed": 0, "missing": 0}
+    replaced = []
+    queryset = (
+        model._default_manager.exclude(**{field.name: ""})
+        .exclude(**{f"{field.name}__isnull": True})
+        .order_by("pk")
+    )
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(batch.values_list("pk", field.name)[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        for pk, name in rows:
+            if name_digest(name):
+                counts["hashed"] += 1
+                continue
+            if not storage.exists(name):
+                counts["missing"] += 1
+                continue
+            counts["rehashed"] += 1
+            if dry_run:
+                continue
+            with storage.open(name) as content:
+                new_name = storage.save(name, content)
+            # update() leaves auto_now timestamps and save signals alone
+            model._default_manager.filter(pk=pk).update(**{field.name: new_name})
+            replaced.append(name)
+    return counts, replaced
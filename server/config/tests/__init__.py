@@ -0,0 +1,21 @@
+from .test_caching import CachingTests
+from .test_compression import CompressionMiddlewareTests
+from .test_renderers import ORJSONParserTests, ORJSONRendererTests
+from .test_schema import OpenAPISchemaTests
+from .test_routers import ReplicaRouterTests
+from .test_sqlite_profile import SQLiteProfileTests
+from .test_storage import ContentAddressedStorageTests
+from .test_throttling import LocalBucketStoreTests, TokenBucketThrottleTests
+
+__all__ = [
+    "CachingTests",
+    "CompressionMiddlewareTests",
+    "ContentAddressedStorageTests",
+    "LocalBucketStoreTests",
+    "OpenAPISchemaTests",
+    "ORJSONParserTests",
+    "ORJSONRendererTests",
+    "ReplicaRouterTests",
+    "SQLiteProfileTests",
+    "TokenBucketThrottleTests",
+]
@@ -0,0 +1,162 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from config import caching
+from config.caching import (
+    aget_or_set,
+    bump_namespace,
+    cache_stats,
+    get_or_set,
+    versioned_key,
+)
+
+
+@override_settings(CACHE_STALE_TIMEOUT=60, CACHE_LOCK_TIMEOUT=5)
+class CachingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        cache_stats.reset()
+        self.calls = 0
+
+    def compute(self, value="fresh", delay=0):
+        def compute():
+            self.calls += 1
+            time.sleep(delay)
+            return value
+
+        return compute
+
+    def expire(self, key):
+        """Push key's logical expiry into the past, leaving the stale value"""
+        value, _, delta = cache.get(key)
+        cache.set(key, (value, time.time() - 1, delta), 60)
+
+    def hammer(self, key, compute, workers=8):
+        """Call get_or_set from many threads released at the same moment"""
+        barrier = threading.Barrier(workers)
+
+        def read(_):
+            barrier.wait()
+            return get_or_set(key, compute, 30, name="hot", beta=0)
+
+        with ThreadPoolExecutor(workers) as pool:
+            return list(pool.map(read, range(workers)))
+
+    def test_hit_after_first_compute(self):
+        self.assertEqual(get_or_set("k", self.compute(), 30), "fresh")
+        self.assertEqual(get_or_set("k", self.compute("other"), 30), "fresh")
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(cache_stats.snapshot()["k"]["hit"], 1)
+        self.assertEqual(cache_stats.snapshot()["k"]["miss"], 1)
+
+    def test_concurrent_expiry_recomputes_once_and_serves_stale(self):
+        get_or_set("hot", self.compute("old"), 30, beta=0)
+        self.expire("hot")
+        self.calls = 0
+
+        results = self.hammer("hot", self.compute("new", delay=0.2))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results.count("new"), 1)
+        self.assertEqual(results.count("old"), 7)
+        self.assertEqual(cache_stats.snapshot()["hot"]["stale"], 7)
+        self.assertEqual(get_or_set("hot", self.compute(), 30, beta=0), "new")
+
+    def test_concurrent_cold_miss_waits_for_single_rebuild(self):
+        results = self.hammer("cold", self.compute("new", delay=0.2))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ["new"] * 8)
+        self.assertEqual(cache_stats.snapshot()["hot"]["wait"], 7)
+
+    def test_failed_rebuild_releases_lock(self):
+        get_or_set("k", self.compute("old"), 30)
+        self.expire("k")
+
+        def broken():
+            raise RuntimeError("database down")
+
+        with self.assertRaises(RuntimeError):
+            get_or_set("k", broken, 30)
+        self.assertEqual(get_or_set("k", self.compute("new"), 30), "new")
+
+    def test_waiters_take_over_a_failed_cold_rebuild(self):
+        """Test that callers waiting on a failed rebuild retry the lock"""
+        started = threading.Event()
+
+        def broken():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("database down")
+
+        with ThreadPoolExecutor(1) as pool:
+            failed = pool.submit(get_or_set, "cold", broken, 30)
+            started.wait()
+            begun = time.monotonic()
+            value = get_or_set("cold", self.compute("new"), 30)
+
+        self.assertEqual(value, "new")
+        # Well before the 5s lock timeout
+        self.assertLess(time.monotonic() - begun, 1)
+        with self.assertRaises(RuntimeError):
+            failed.result()
+
+    def test_expired_lock_is_not_released_by_its_old_holder(self):
+        """Test that a slow rebuild leaves the lock another caller took"""
+        lock_key = caching.LOCK_KEY.format("k")
+
+        def slow():
+            # Our lock expired and another caller took it meanwhile
+            cache.set(lock_key, "someone else", 5)
+            return "value"
+
+        get_or_set("k", slow, 30)
+        self.assertEqual(cache.get(lock_key), "someone else")
+
+    def test_early_expiry_is_probabilistic(self):
+        get_or_set("k", self.compute("old"), 30)
+        value, _, _ = cache.get("k")
+        # One second left on an entry that took one second to build: a
+        # rebuild is due once -log(1 - random()) reaches 1
+        cache.set("k", (value, time.time() + 1, 1.0), 60)
+
+        with mock.patch.object(caching.random, "random", return_value=0.0):
+            self.assertEqual(get_or_set("k", self.compute("new"), 30), "old")
+        with mock.patch.object(caching.random, "random", return_value=0.99):
+            self.assertEqual(get_or_set("k", self.compute("new"), 30), "new")
+        self.assertEqual(cache_stats.snapshot()["k"]["early"], 1)
+
+    def test_beta_zero_disables_early_expiry(self):
+        get_or_set("k", self.compute("old"), 30, beta=0)
+        value, _, _ = cache.get("k")
+        cache.set("k", (value, time.time() + 0.5, 1000.0), 60)
+        self.assertEqual(get_or_set("k", self.compute("new"), 30, beta=0), "old")
+
+    def test_bump_namespace_changes_keys(self):
+        key = versioned_key("products", "categories")
+        self.assertEqual(key, versioned_key("products", "categories"))
+        bump_namespace("products")
+        self.assertNotEqual(key, versioned_key("products", "categories"))
+        self.assertEqual(versioned_key("orders", 1), "orders:v1:1")
+
+    def test_bump_unread_namespace(self):
+        bump_namespace("fresh")
+        self.assertEqual(versioned_key("fresh", "x"), "fresh:v2:x")
+
+    async def test_async_single_flight(self):
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return "value"
+
+        self.assertEqual(await aget_or_set("a", compute, 30), "value")
+        self.assertEqual(await aget_or_set("a", compute, 30, beta=0), "value")
+        self.assertEqual(calls, 1)
+        self.assertEqual(cache_stats.snapshot()["a"]["hit"], 1)
@@ -0,0 +1,126 @@
+import gzip
+import tempfile
+
+import brotli
+from django.http import FileResponse
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from config.middleware import CompressionMiddleware, compressible, negotiate_encoding
+from orders.models import Order, OrderItem
+from products.models import Product
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTests(APITestCase):
+    def setUp(self):
+        for i in range(12):
+            Product.objects.create(
+                title=f"Product {i}",
+                description="A fairly long product description " * 3,
+                price=10 + i,
+                inventory_count=5,
+                category="Electronics",
+            )
+        self.url = reverse("product-list")
+
+    def test_negotiation(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate, br"), "br")
+        self.assertEqual(negotiate_encoding("gzip;q=1.0, br;q=0.5"), "gzip")
+        self.assertEqual(negotiate_encoding("br;q=0, gzip"), "gzip")
+        self.assertEqual(negotiate_encoding("*"), "br")
+        self.assertIsNone(negotiate_encoding("identity"))
+        self.assertIsNone(negotiate_encoding("gzip;q=0"))
+        self.assertIsNone(negotiate_encoding(""))
+        self.assertIsNone(negotiate_encoding("br", allow_brotli=False))
+        self.assertEqual(negotiate_encoding("br, gzip", allow_brotli=False), "gzip")
+
+    def test_compressible_types(self):
+        self.assertTrue(compressible("application/json"))
+        self.assertTrue(compressible("text/csv; charset=utf-8"))
+        self.assertTrue(compressible("application/vnd.oai.openapi+json"))
+        self.assertTrue(compressible("application/x-ndjson"))
+        self.assertFalse(compressible("image/png"))
+        self.assertFalse(compressible("application/octet-stream"))
+        self.assertFalse(compressible(""))
+
+    def test_brotli(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+
+    def test_gzip(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_identity(self):
+        response = self.client.get(self.url)
+
+        self.assertNotIn("Content-Encoding", response)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(
+            reverse("product-list-categories"), HTTP_ACCEPT_ENCODING="br"
+        )
+
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_streaming_export_is_compressed(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        order = Order.objects.create(user=admin, total_price=10)
+        OrderItem.objects.create(
+            order=order, product=Product.objects.first(), quantity=1, price=10
+        )
+        self.client.force_authenticate(user=admin)
+
+        plain = self.client.get(reverse("order-export-csv"))
+        response = self.client.get(
+            reverse("order-export-csv"), HTTP_ACCEPT_ENCODING="br"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(
+            brotli.decompress(b"".join(response.streaming_content)),
+            b"".join(plain.streaming_content),
+        )
+
+    def test_file_responses_are_not_compressed(self):
+        with tempfile.NamedTemporaryFile(suffix=".txt") as file:
+            file.write(b"text " * 1000)
+            file.flush()
+            response = CompressionMiddleware(lambda request: None).process_response(
+                RequestFactory().get("/", HTTP_ACCEPT_ENCODING="br"),
+                FileResponse(open(file.name, "rb")),
+            )
+            response.close()
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_cookies_get_gzip_instead_of_brotli(self):
+        """Test that responses that may hold secrets keep gzip's padding"""
+        self.client.cookies["sessionid"] = "session"
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br, gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br")
+
+        self.assertNotIn("Content-Encoding", response)
@@ -0,0 +1,63 @@
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from config.parsers import ORJSONParser
+from config.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_renderer(self):
+        """Test that output is byte-for-byte what JSONRenderer produces"""
+        data = ReturnDict(
+            {
+                "price": "999.99",
+                "subtotal": Decimal("1050.99"),
+                "created_at": datetime.datetime(
+                    2025, 1, 15, 10, 30, 0, 123456, tzinfo=datetime.timezone.utc
+                ),
+                "shipped_at": datetime.datetime(
+                    2025, 1, 15, 11, 0, tzinfo=ZoneInfo("Africa/Lagos")
+                ),
+                "naive": datetime.datetime(2025, 1, 15, 10, 30),
+                "date": datetime.date(2025, 1, 15),
+                "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "label": gettext_lazy("Electronics"),
+                "title": "Caf\u00e9 \u2028 line",
+                "counts": {1: 2},
+                "items": [{"quantity": 2, "is_active": True, "image": None}],
+            },
+            serializer=None,
+        )
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_requests_use_drf_renderer(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=2", {})
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_matches_drf_parser(self):
+        body = b'{"ids": [1, 2], "status": "shipped", "price": 19.99, "note": null}'
+
+        self.assertEqual(
+            ORJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body))
+        )
+
+    def test_invalid_json(self):
+        for body in (b"{not json", b'{"price": NaN}'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                ORJSONParser().parse(BytesIO(body))
@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import ResolverMatch
+
+from cart.models import Cart
+from cart.views import CartDetailView
+from orders.models import Order
+from products.models import Product
+from products.views import ProductViewSet
+from users.models import User
+from config.middleware import ReplicaRoutingMiddleware
+from config.routers import is_pinned, pin_primary
+
+
+@override_settings(
+    DATABASE_REPLICA_ALIASES=["replica1"], DATABASE_REPLICA_PIN_SECONDS=10
+)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User(pk=1, email="reader@example.com")
+        self.product_view = ProductViewSet.as_view({"get": "list", "post": "create"})
+
+    def route(self, method="get", view=None, user=None, status=200):
+        """
+        Run a request through the middleware and report which database
+        each model would be read from while the view runs
+        """
+        request = getattr(self.factory, method)("/")
+        request.user = user or self.user
+        seen = {}
+
+        def get_response(request):
+            request.resolver_match = ResolverMatch(view or self.product_view, (), {})
+            seen["product"] = Product.objects.all().db
+            seen["order"] = Order.objects.all().db
+            seen["cart"] = Cart.objects.all().db
+            return HttpResponse(status=status)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        middleware(request)
+        return seen
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(Product.objects.all().db, "default")
+
+    def test_opted_in_view_reads_catalog_and_orders_from_replica(self):
+        seen = self.route()
+
+        self.assertEqual(seen["product"], "replica1")
+        self.assertEqual(seen["order"], "replica1")
+        self.assertEqual(seen["cart"], "default")
+
+    def test_views_without_opt_in_read_from_primary(self):
+        seen = self.route(view=CartDetailView.as_view())
+
+        self.assertEqual(seen["product"], "default")
+
+    def test_writes_use_primary_and_pin_the_user(self):
+        seen = self.route(method="post", status=201)
+
+        self.assertEqual(seen["product"], "default")
+        self.assertTrue(is_pinned(self.user))
+        self.assertEqual(self.route()["product"], "default")
+
+    def test_failed_writes_do_not_pin(self):
+        self.route(method="post", status=400)
+
+        self.assertFalse(is_pinned(self.user))
+
+    def test_pin_only_applies_to_the_writer(self):
+        pin_primary(self.user)
+
+        other = User(pk=2, email="other@example.com")
+        self.assertEqual(self.route(user=other)["product"], "replica1")
+
+    def test_reads_inside_transactions_use_primary(self):
+        with mock.patch.object(connections["default"], "in_atomic_block", True):
+            seen = self.route()
+
+        self.assertEqual(seen["product"], "default")
+
+    @override_settings(DATABASE_REPLICA_ALIASES=[])
+    def test_without_replicas_everything_uses_primary(self):
+        self.assertEqual(self.route()["product"], "default")
@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from config import schema
+
+PREBUILT = {"yaml": b"openapi: 3.0.3\n", "json": b'{"openapi": "3.0.3"}'}
+
+
+class OpenAPISchemaTests(SimpleTestCase):
+    def setUp(self):
+        schema.clear_schema_cache()
+        self.addCleanup(schema.clear_schema_cache)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        override = override_settings(OPENAPI_SCHEMA_DIR=self.directory.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def prebuild(self):
+        for name, body in PREBUILT.items():
+            (Path(self.directory.name) / schema.FORMATS[name][0]).write_bytes(body)
+
+    def test_serves_prebuilt_schema_without_generating(self):
+        self.prebuild()
+        with mock.patch.object(schema, "generate_schema") as generate:
+            yaml = self.client.get(reverse("schema"))
+            as_json = self.client.get(reverse("schema"), {"format": "json"})
+            negotiated = self.client.get(
+                reverse("schema"), HTTP_ACCEPT="application/json"
+            )
+
+        generate.assert_not_called()
+        self.assertEqual(yaml.content, PREBUILT["yaml"])
+        self.assertEqual(yaml["Content-Type"], "application/vnd.oai.openapi")
+        self.assertEqual(as_json.content, PREBUILT["json"])
+        self.assertEqual(negotiated.content, PREBUILT["json"])
+        self.assertEqual(
+            yaml["Cache-Control"],
+            f"public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}",
+        )
+
+    def test_generated_once_when_not_prebuilt(self):
+        with mock.patch.object(
+            schema, "generate_schema", return_value=PREBUILT
+        ) as generate:
+            self.client.get(reverse("schema"))
+            response = self.client.get(reverse("schema"), {"format": "json"})
+
+        generate.assert_called_once()
+        self.assertEqual(response.content, PREBUILT["json"])
+
+    def test_etag_revalidation(self):
+        self.prebuild()
+        etag = self.client.get(reverse("schema"))["ETag"]
+
+        response = self.client.get(reverse("schema"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        response = self.client.get(reverse("schema"), HTTP_IF_NONE_MATCH=f"W/{etag}")
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            reverse("schema"), {"format": "json"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_only_safe_methods(self):
+        self.prebuild()
+        self.assertEqual(self.client.post(reverse("schema")).status_code, 405)
+
+    def test_generated_schema_documents_stateless_jwt(self):
+        document = json.loads(schema.generate_schema()["json"])
+        self.assertEqual(
+            document["components"]["securitySchemes"]["jwtAuth"]["scheme"], "bearer"
+        )
+
+    def test_operation_ids_do_not_collide(self):
+        # drf_spectacular renames colliding ids with numeral suffixes
+        document = json.loads(schema.generate_schema()["json"])
+        operation_ids = [
+            operation["operationId"]
+            for path in document["paths"].values()
+            for operation in path.values()
+        ]
+        self.assertFalse([name for name in operation_ids if name[-1].isdigit()])
+
+    def test_urlconf_does_not_import_docs_views(self):
+        code = (
+            "import sys, django; django.setup(); "
+            "from django.urls import resolve; resolve('/api/products/'); "
+            "print(any(name in sys.modules for name in "
+            "('drf_spectacular.views', 'drf_spectacular.generators')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
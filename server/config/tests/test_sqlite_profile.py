@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    def open_connection(self, profile):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_dict = dict(connection.settings_dict)
+        settings_dict.update(
+            NAME=str(Path(directory.name) / "profile.sqlite3"),
+            OPTIONS=dict(settings.SQLITE_PROFILES[profile]),
+        )
+        wrapper = DatabaseWrapper(settings_dict, alias="profile")
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_production_profile_applies_pragmas(self):
+        wrapper = self.open_connection("production")
+
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -65536)
+        self.assertEqual(self.pragma(wrapper, "temp_store"), 2)  # MEMORY
+        self.assertEqual(
+            self.pragma(wrapper, "busy_timeout"), settings.SQLITE_BUSY_TIMEOUT_MS
+        )
+
+    def test_production_profile_begins_immediate_transactions(self):
+        wrapper = self.open_connection("production")
+
+        self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
+
+    def test_default_profile_keeps_rollback_journal(self):
+        wrapper = self.open_connection("default")
+
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "delete")
+        self.assertIsNone(wrapper.transaction_mode)
@@ -0,0 +1,123 @@
+import hashlib
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+
+from config.storage import IMMUTABLE, name_digest, serve_media
+from products.models import Product
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+DIGEST = hashlib.sha256(PNG).hexdigest()
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_files_are_named_by_content_and_stored_once(self):
+        first = Product.objects.create(title="First", price=10)
+        first.image.save("photo.PNG", ContentFile(PNG))
+        second = Product.objects.create(title="Second", price=10)
+        second.image.save("other-name.png", ContentFile(PNG))
+
+        expected = f"products/{DIGEST[:2]}/{DIGEST}.png"
+        self.assertEqual(first.image.name, expected)
+        self.assertEqual(second.image.name, expected)
+        self.assertEqual(name_digest(expected), DIGEST)
+        stored = [path for path in Path(self.media_root).rglob("*") if path.is_file()]
+        self.assertEqual(stored, [Path(self.media_root) / expected])
+
+    def test_hashed_media_is_served_immutable(self):
+        name = default_storage.save("products/photo.png", ContentFile(PNG))
+        factory = RequestFactory()
+
+        response = serve_media(factory.get(f"/media/{name}"), name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], IMMUTABLE)
+        self.assertEqual(response["ETag"], f'"{DIGEST}"')
+        self.assertEqual(b"".join(response.streaming_content), PNG)
+
+        response = serve_media(
+            factory.get(f"/media/{name}", HTTP_IF_NONE_MATCH=f'"{DIGEST}"'), name
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["Cache-Control"], IMMUTABLE)
+
+    def test_not_modified_only_for_an_exact_etag_of_an_existing_file(self):
+        name = default_storage.save("products/photo.png", ContentFile(PNG))
+        factory = RequestFactory()
+
+        for header in (f'W/"{DIGEST}"', f'"other", "{DIGEST}"', "*"):
+            response = serve_media(
+                factory.get(f"/media/{name}", HTTP_IF_NONE_MATCH=header), name
+            )
+            self.assertEqual(response.status_code, 304, header)
+
+        # The ETag inside a malformed header is not a match
+        response = serve_media(
+            factory.get(f"/media/{name}", HTTP_IF_NONE_MATCH=f'"{DIGEST}"x'), name
+        )
+        self.assertEqual(response.status_code, 200)
+
+        default_storage.delete(name)
+        with self.assertRaises(Http404):
+            serve_media(
+                factory.get(f"/media/{name}", HTTP_IF_NONE_MATCH=f'"{DIGEST}"'), name
+            )
+
+    def test_legacy_media_is_not_marked_immutable(self):
+        legacy = Path(self.media_root) / "products" / "photo.png"
+        legacy.parent.mkdir(parents=True)
+        legacy.write_bytes(PNG)
+
+        response = serve_media(
+            RequestFactory().get("/media/products/photo.png"), "products/photo.png"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Cache-Control", response)
+
+    def test_rehash_media_command(self):
+        for index in range(3):
+            legacy = Path(self.media_root) / "products" / f"photo{index}.png"
+            legacy.parent.mkdir(parents=True, exist_ok=True)
+            legacy.write_bytes(PNG)
+            Product.objects.create(
+                title=f"Legacy {index}", price=10, image=f"products/photo{index}.png"
+            )
+        Product.objects.create(title="Gone", price=10, image="products/missing.png")
+        Product.objects.create(title="No image", price=10)
+
+        out = StringIO()
+        call_command("rehash_media", "--dry-run", stdout=out)
+        self.assertIn(
+            "products.Product.image: 3 rehashed, 0 already hashed, 1 missing",
+            out.getvalue(),
+        )
+        self.assertTrue((Path(self.media_root) / "products" / "photo0.png").exists())
+
+        out = StringIO()
+        call_command(
+            "rehash_media", "--batch-size", "2", "--delete-originals", stdout=out
+        )
+        self.assertIn("Deleted 3 original file(s)", out.getvalue())
+        expected = f"products/{DIGEST[:2]}/{DIGEST}.png"
+        self.assertEqual(Product.objects.filter(image=expected).count(), 3)
+        stored = sorted(
+            path for path in Path(self.media_root).rglob("*") if path.is_file()
+        )
+        self.assertEqual(stored, [Path(self.media_root) / expected])
+
+        out = StringIO()
+        call_command("rehash_media", stdout=out)
+        self.assertIn("0 rehashed, 3 already hashed, 1 missing", out.getvalue())
@@ -0,0 +1,182 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.models import Product
+from config import throttling
+from config.throttling import LocalBucketStore, local_store, parse_rate
+
+User = get_user_model()
+
+RATES = {
+    "login_ip": "3/min",
+    "login_user": "2/min",
+    "register_ip": "1/hour",
+    "cart_ip": "100/min",
+    "cart_user": "2/min",
+    "cart_session": "2/min",
+}
+
+
+class LocalBucketStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.store = LocalBucketStore(max_keys=2)
+        self.now = 1000.0
+        patcher = mock.patch.object(
+            throttling.time, "monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("20/min"), (20, 20 / 60))
+        self.assertEqual(parse_rate("10/hour"), (10, 10 / 3600))
+        self.assertEqual(parse_rate("5/s"), (5, 5))
+
+    def test_burst_then_refill(self):
+        for _ in range(3):
+            self.assertEqual(self.store.take("k", 3, 1.0), (True, 0.0))
+        allowed, wait = self.store.take("k", 3, 1.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 1.0)
+
+        self.now += 0.5
+        allowed, wait = self.store.take("k", 3, 1.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 0.5)
+
+        self.now += 0.5
+        self.assertTrue(self.store.take("k", 3, 1.0)[0])
+
+    def test_refill_is_capped_at_capacity(self):
+        self.store.take("k", 2, 1.0)
+        self.now += 3600
+        self.assertTrue(self.store.take("k", 2, 1.0)[0])
+        self.assertTrue(self.store.take("k", 2, 1.0)[0])
+        self.assertFalse(self.store.take("k", 2, 1.0)[0])
+
+    def test_least_recently_used_bucket_is_dropped(self):
+        self.store.take("a", 1, 0.001)
+        self.store.take("b", 1, 0.001)
+        self.store.take("a", 1, 0.001)
+        self.store.take("c", 1, 0.001)
+
+        # "a" was used after "b", so "b" was evicted and starts full again
+        self.assertFalse(self.store.take("a", 1, 0.001)[0])
+        self.assertTrue(self.store.take("b", 1, 0.001)[0])
+
+
+@override_settings(
+    REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": RATES}
+)
+class TokenBucketThrottleTests(APITestCase):
+    def setUp(self):
+        local_store.reset()
+        self.addCleanup(local_store.reset)
+        # Freeze the clock so slow password hashing does not refill buckets
+        patcher = mock.patch.object(throttling.time, "monotonic", return_value=1000.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(
+            email="shopper@example.com", password="test123"
+        )
+        self.product = Product.objects.create(
+            title="Throttled Product", price=10, inventory_count=100
+        )
+
+    def login(self, email="shopper@example.com", ip="10.0.0.1", **headers):
+        return self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": email, "password": "wrong-password"},
+            REMOTE_ADDR=ip,
+            **headers,
+        )
+
+    def add_to_cart(self, **headers):
+        return self.client.post(
+            reverse("add-to-cart"), {"product": self.product.id}, **headers
+        )
+
+    def test_login_is_limited_per_ip_with_retry_after(self):
+        for i in range(3):
+            self.assertEqual(
+                self.login(email=f"user{i}@example.com").status_code,
+                status.HTTP_401_UNAUTHORIZED,
+            )
+
+        response = self.login(email="user9@example.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "20")
+        self.assertNotEqual(
+            self.login(email="user9@example.com", ip="10.0.0.2").status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+    def test_forwarded_for_does_not_change_the_ip(self):
+        for i in range(3):
+            self.login(email=f"user{i}@example.com", HTTP_X_FORWARDED_FOR=f"1.2.3.{i}")
+
+        response = self.login(email="user9@example.com", HTTP_X_FORWARDED_FOR="1.2.3.9")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_is_limited_per_account_across_ips(self):
+        self.login(ip="10.0.0.1")
+        self.login(ip="10.0.0.2")
+
+        response = self.login(email="Shopper@Example.com ", ip="10.0.0.3")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+
+    def test_register_is_limited_per_ip(self):
+        data = {
+            "email": "new@example.com",
+            "first_name": "New",
+            "last_name": "User",
+            "password": "SecurePass123!",
+        }
+        self.assertEqual(
+            self.client.post(reverse("signup"), data).status_code,
+            status.HTTP_201_CREATED,
+        )
+        response = self.client.post(
+            reverse("signup"), {**data, "email": "other@example.com"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "3600")
+
+    def test_cart_is_limited_per_session_key(self):
+        for _ in range(2):
+            self.assertEqual(
+                self.add_to_cart(HTTP_X_SESSION_KEY="cart-a").status_code,
+                status.HTTP_201_CREATED,
+            )
+        self.assertEqual(
+            self.add_to_cart(HTTP_X_SESSION_KEY="cart-a").status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        self.assertEqual(
+            self.add_to_cart(HTTP_X_SESSION_KEY="cart-b").status_code,
+            status.HTTP_201_CREATED,
+        )
+
+    def test_cart_is_limited_per_user(self):
+        self.client.force_authenticate(user=self.user)
+        self.add_to_cart(HTTP_X_SESSION_KEY="cart-a")
+        self.add_to_cart(HTTP_X_SESSION_KEY="cart-b")
+
+        response = self.add_to_cart(HTTP_X_SESSION_KEY="cart-c")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertEqual(
+                self.add_to_cart(HTTP_X_SESSION_KEY="cart-a").status_code,
+                status.HTTP_201_CREATED,
+            )
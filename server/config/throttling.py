@@ -0,0 +1,208 @@
+"""
+Token-bucket rate limiting for DRF views.
+
+A view opts in with a throttle_scope and throttle_classes; each throttle
+class keys its buckets on one identity (client IP, account or cart session
+key) and looks up its rate as "<scope>_<kind>" in DEFAULT_THROTTLE_RATES,
+e.g. "login_ip": "20/min" is a bucket of 20 tokens refilled at 20 per
+minute. Scopes without a rate for a kind are not limited on it.
+
+Unlike DRF's SimpleRateThrottle, which keeps every request timestamp in
+the cache, a bucket is two numbers updated in O(1). Buckets live in Redis
+(one atomic Lua call per check) when RATE_LIMIT_REDIS_URL is set and the
+redis package is installed, otherwise in a bounded in-process LRU; if
+Redis is unreachable checks fall back to the local store.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+# Atomically refill and take one token; returns {allowed, seconds to wait}.
+# Uses the server clock so app servers with skewed clocks agree.
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed, wait = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+
+def parse_rate(rate):
+    """ "20/min" -> (capacity 20, refill 20 / 60 tokens per second)"""
+    count, period = rate.split("/")
+    count = int(count)
+    return count, count / PERIODS[period.strip()[0]]
+
+
+class LocalBucketStore:
+    """Buckets in this process, least recently used dropped past max_keys"""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def take(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                self._buckets.move_to_end(key)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True, 0.0
+            self._buckets[key] = (tokens, now)
+            return False, (1 - tokens) / rate
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBucketStore:
+    """Buckets shared by every process, updated by a server-side script"""
+
+    def __init__(self, url, fallback):
+        self.client = redis.Redis.from_url(url, socket_timeout=0.1)
+        self.script = self.client.register_script(TAKE_SCRIPT)
+        self.fallback = fallback
+
+    def take(self, key, capacity, rate):
+        try:
+            allowed, wait = self.script(keys=[f"throttle:{key}"], args=[capacity, rate])
+        except redis.RedisError as exc:
+            logger.warning("Rate limit store unavailable, using local buckets: %s", exc)
+            return self.fallback.take(key, capacity, rate)
+        return bool(allowed), float(wait)
+
+    def reset(self):
+        self.fallback.reset()
+
+
+local_store = LocalBucketStore()
+_store = None
+_store_lock = threading.Lock()
+
+
+def bucket_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = settings.RATE_LIMIT_REDIS_URL
+                if url and redis is not None:
+                    _store = RedisBucketStore(url, local_store)
+                else:
+                    _store = local_store
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class; subclasses set kind and implement get_key()"""
+
+    kind = None
+
+    def get_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        if not settings.RATE_LIMIT_ENABLED:
+            return True
+        scope = getattr(view, "throttle_scope", None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}_{self.kind}")
+        if rate is None:
+            return True
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        allowed, self.wait_time = bucket_store().take(
+            f"{scope}:{self.kind}:{key}", capacity, refill
+        )
+        return allowed
+
+    def wait(self):
+        # Whole seconds, rounded up, so Retry-After never invites an early retry
+        return math.ceil(self.wait_time) if self.wait_time else None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    kind = "ip"
+
+    def get_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Per account: the authenticated user, or for login and signup the email
+    being tried, so a credential-stuffing run against one account is slowed
+    down however many addresses it comes from.
+    """
+
+    kind = "user"
+
+    def get_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if isinstance(email, str) and email.strip():
+            return email.strip().lower()
+        return None
+
+
+class SessionTokenBucketThrottle(TokenBucketThrottle):
+    """Per anonymous cart: the X-Session-Key header or the session cookie"""
+
+    kind = "session"
+
+    def get_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        session = getattr(request, "session", None)
+        return request.headers.get("X-Session-Key") or getattr(
+            session, "session_key", None
+        )
+
+
+TOKEN_BUCKET_THROTTLES = [
+    IPTokenBucketThrottle,
+    UserTokenBucketThrottle,
+    SessionTokenBucketThrottle,
+]
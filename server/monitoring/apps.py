@@ -0,0 +1,22 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from config.caching import cache_stats
+        from . import metrics, slow_queries, timing
+
+        connection_created.connect(timing.install_execute_wrapper)
+        connection_created.connect(slow_queries.install_execute_wrapper)
+        connection_created.connect(metrics.install_execute_wrapper)
+        cache_stats.observers.append(metrics.record_cache)
+
+        if settings.REQUEST_TIMING_SERIALIZERS:
+            from .timing import instrument_serializers
+
+            instrument_serializers()
@@ -0,0 +1,38 @@
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from config.schema import FORMATS, generate_schema, write_schema
+
+
+class Command(BaseCommand):
+    help = "Prebuild the OpenAPI schema served at /api/schema/, e.g. at deploy time"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir", help="Directory to write to (default: OPENAPI_SCHEMA_DIR)"
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the prebuilt schema is missing or out of date",
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(options["output_dir"] or settings.OPENAPI_SCHEMA_DIR)
+        if options["check"]:
+            stale = [
+                FORMATS[name][0]
+                for name, body in generate_schema().items()
+                if not (directory / FORMATS[name][0]).is_file()
+                or (directory / FORMATS[name][0]).read_bytes() != body
+            ]
+            if stale:
+                raise CommandError(
+                    f"Prebuilt schema out of date: {', '.join(stale)}; "
+                    "run manage.py build_openapi_schema"
+                )
+            self.stdout.write(self.style.SUCCESS("Prebuilt schema is up to date"))
+            return
+
+        for path in write_schema(directory):
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
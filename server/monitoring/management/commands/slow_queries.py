@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from monitoring.slow_queries import aggregate, read_log
+
+SORT_KEYS = {
+    "total": "total_ms",
+    "count": "count",
+    "max": "max_ms",
+    "mean": "mean_ms",
+}
+
+
+class Command(BaseCommand):
+    help = "Show the slowest queries from the slow-query log, grouped by fingerprint"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--log", help="Slow-query log to read (default: SLOW_QUERY_LOG)"
+        )
+        parser.add_argument("--since", help="First day to include (YYYY-MM-DD)")
+        parser.add_argument(
+            "--sort",
+            choices=SORT_KEYS,
+            default="total",
+            help="Rank by total time (default), count, max or mean time",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=10, help="Offenders to show (default: 10)"
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Also print each query plan"
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            day = parse_date(options["since"])
+            if day is None:
+                raise CommandError("--since must be a date in YYYY-MM-DD format")
+            since = day.isoformat()
+
+        groups = aggregate(read_log(options["log"] or settings.SLOW_QUERY_LOG, since))
+        if not groups:
+            self.stdout.write("No slow queries logged")
+            return
+
+        groups.sort(key=lambda group: group[SORT_KEYS[options["sort"]]], reverse=True)
+        for rank, group in enumerate(groups[: options["limit"]], start=1):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"#{rank} {group['count']} call(s), total {group['total_ms']} ms, "
+                    f"mean {group['mean_ms']} ms, max {group['max_ms']} ms"
+                )
+            )
+            self.stdout.write(f"  {group['fingerprint']}")
+            for label, counts in (
+                ("view", group["views"]),
+                ("at", group["locations"]),
+            ):
+                for value, count in counts.most_common(3):
+                    self.stdout.write(f"  {label}: {value} ({count})")
+            if options["plans"] and group["plan"]:
+                self.stdout.write("  plan:")
+                for line in group["plan"].splitlines():
+                    self.stdout.write(f"    {line}")
+            self.stdout.write("")
@@ -0,0 +1,159 @@
+"""
+Prometheus metrics, served at /metrics.
+
+Every request is counted and timed by MetricsMiddleware, labelled with the
+API area (products, catalog, cart, orders, auth, ...) and the view name.
+Database queries, cache outcomes (config.caching), checkouts and oversells
+prevented are counted where they happen.
+
+Under a multi-process server, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory before the workers start (config/gunicorn.py does this): each
+worker then writes its samples to mmap-backed files there, and /metrics
+sums them across all live workers. Without it, /metrics reports the
+process that answers the scrape.
+
+Metrics are off when prometheus_client is not installed.
+"""
+
+import os
+import time
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram, multiprocess
+except ImportError:  # metrics disabled
+    prometheus_client = None
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+if prometheus_client is not None:
+    REQUESTS = Counter(
+        "http_requests",
+        "HTTP requests handled",
+        ["area", "view", "method", "status"],
+    )
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "Time to produce a response, excluding streaming",
+        ["area", "view", "method"],
+        buckets=LATENCY_BUCKETS,
+    )
+    IN_PROGRESS = Gauge(
+        "http_requests_in_progress",
+        "Requests being handled right now, across workers",
+        multiprocess_mode="livesum",
+    )
+    DB_QUERIES = Counter("db_queries", "Database queries executed", ["alias"])
+    DB_QUERY_SECONDS = Counter(
+        "db_query_seconds", "Time spent executing database queries", ["alias"]
+    )
+    CACHE_REQUESTS = Counter(
+        "cache_requests",
+        "Cached value lookups by outcome (see config.caching)",
+        ["name", "outcome"],
+    )
+    CHECKOUTS = Counter("checkouts", "Checkout attempts by outcome", ["outcome"])
+    OVERSELLS_PREVENTED = Counter(
+        "oversells_prevented",
+        "Requests refused because they asked for more than is in stock",
+        ["stage"],
+    )
+
+
+def enabled():
+    return prometheus_client is not None and settings.METRICS_ENABLED
+
+
+def request_labels(request):
+    """(area, view) of a handled request, bounded by the URLconf"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved", "unresolved"
+    parts = match.route.split("/")
+    area = parts[1] if parts[0] == "api" and len(parts) > 1 else parts[0]
+    return area or "root", match.view_name or match.route
+
+
+def observe_request(request, status, seconds):
+    area, view = request_labels(request)
+    REQUESTS.labels(area, view, request.method, str(status)).inc()
+    REQUEST_LATENCY.labels(area, view, request.method).observe(seconds)
+
+
+def record_cache(name, outcome):
+    """config.caching.cache_stats observer"""
+    if enabled():
+        CACHE_REQUESTS.labels(name, outcome).inc()
+
+
+def record_checkout(outcome):
+    if enabled():
+        CHECKOUTS.labels(outcome).inc()
+
+
+def record_oversell_prevented(stage):
+    if enabled():
+        OVERSELLS_PREVENTED.labels(stage).inc()
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    if not enabled():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        alias = context["connection"].alias
+        DB_QUERIES.labels(alias).inc()
+        DB_QUERY_SECONDS.labels(alias).inc(time.perf_counter() - start)
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """connection_created receiver"""
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+def exposition():
+    """The current metrics in the Prometheus text format"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
+
+
+def metrics_view(request):
+    """
+    /metrics for Prometheus. Scrapes must send METRICS_TOKEN as a bearer
+    token; without one set, metrics are only served with DEBUG on.
+    """
+    if not enabled():
+        return HttpResponse("Metrics are disabled\n", status=404)
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not constant_time_compare(
+            request.headers.get("Authorization", ""), expected
+        ):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden("Set METRICS_TOKEN to serve metrics\n")
+    return HttpResponse(
+        exposition(), content_type=prometheus_client.CONTENT_TYPE_LATEST
+    )
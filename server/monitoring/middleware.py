@@ -0,0 +1,171 @@
+import random
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from . import metrics
+from .profiling import RequestProfile, requested_mode, requested_token, token_user
+from .slow_queries import reset_request, set_request
+from .stats import request_stats
+from .timing import start_timing, stop_timing
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    name = (match.view_name or match.route) if match else "unresolved"
+    return f"{request.method} {name}"
+
+
+class RequestTimingMiddleware:
+    """
+    Measure wall time, DB queries, DB time and serializer time for a
+    sample of requests (REQUEST_TIMING_SAMPLE_RATE). Sampled requests are
+    added to the per-view histograms and get a Server-Timing header;
+    everything else only pays for one random() call.
+
+    Requests carrying a valid staff profile token (see profiling.py) are
+    always timed, and also profiled with their SQL recorded. Every request
+    is made known to the slow-query log, so it can name the view.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        context = set_request(request)
+        try:
+            return self._handle(request)
+        finally:
+            reset_request(context)
+
+    async def __acall__(self, request):
+        context = set_request(request)
+        try:
+            return await self._ahandle(request)
+        finally:
+            reset_request(context)
+
+    def _handle(self, request):
+        token = requested_token(request)
+        if token:
+            profile = self._profile(request, token_user(token))
+            if profile is not None:
+                with self._timed(record_sql=True) as measurement, profile.running():
+                    response = self.get_response(request)
+                profile.save(response, **measurement)
+                return self._record(request, response, measurement)
+        if not self._sampled():
+            return self.get_response(request)
+        with self._timed() as measurement:
+            response = self.get_response(request)
+        return self._record(request, response, measurement)
+
+    async def _ahandle(self, request):
+        token = requested_token(request)
+        if token:
+            user_id = await sync_to_async(token_user)(token)
+            profile = self._profile(request, user_id)
+            if profile is not None:
+                with self._timed(record_sql=True) as measurement, profile.running():
+                    response = await self.get_response(request)
+                await sync_to_async(profile.save)(response, **measurement)
+                return self._record(request, response, measurement)
+        if not self._sampled():
+            return await self.get_response(request)
+        with self._timed() as measurement:
+            response = await self.get_response(request)
+        return self._record(request, response, measurement)
+
+    def _profile(self, request, user_id):
+        if user_id is None:
+            return None
+        return RequestProfile(request, user_id, requested_mode(request))
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or (
+            self.sample_rate > 0 and random.random() < self.sample_rate
+        )
+
+    @contextmanager
+    def _timed(self, record_sql=False):
+        timing, token = start_timing(record_sql)
+        measurement = {"timing": timing}
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            stop_timing(token)
+            measurement["wall_time"] = time.perf_counter() - start
+
+    def _record(self, request, response, measurement):
+        timing = measurement["timing"]
+        wall_ms = measurement["wall_time"] * 1000
+        db_ms = timing.db_time * 1000
+        serializer_ms = timing.serializer_time * 1000
+
+        request_stats.record(
+            view_label(request),
+            wall_ms=wall_ms,
+            db_ms=db_ms,
+            queries=timing.queries,
+            serializer_ms=serializer_ms,
+        )
+        response["Server-Timing"] = (
+            f"app;dur={wall_ms:.1f}, "
+            f'db;dur={db_ms:.1f};desc="{timing.queries} queries", '
+            f"ser;dur={serializer_ms:.1f}"
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Count and time every request for Prometheus (see metrics.py). Goes
+    first in MIDDLEWARE so the latency covers all other middleware.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not metrics.enabled():
+            return self.get_response(request)
+        metrics.IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.IN_PROGRESS.dec()
+        metrics.observe_request(
+            request, response.status_code, time.perf_counter() - start
+        )
+        return response
+
+    async def __acall__(self, request):
+        if not metrics.enabled():
+            return await self.get_response(request)
+        metrics.IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.IN_PROGRESS.dec()
+        metrics.observe_request(
+            request, response.status_code, time.perf_counter() - start
+        )
+        return response
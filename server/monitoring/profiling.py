@@ -0,0 +1,234 @@
+"""
+On-demand profiling of single requests, for staff.
+
+A staff member gets a signed token from /api/monitoring/profile-token/ and
+sends it back in an X-Profile header (or a ?profile= query parameter) on the
+request to investigate. That request is then run under a profiler and its
+SQL is recorded:
+
+- "sample" (the default): a thread samples the request's stack every
+  PROFILE_SAMPLE_INTERVAL seconds. The artifact is a folded-stacks file,
+  which flamegraph.pl, speedscope and similar tools read directly.
+- "cprofile" (?profile_mode=cprofile or X-Profile-Mode): the deterministic
+  cProfile profiler. The artifact is a pstats dump (snakeviz, flameprof).
+
+Reports are written to PROFILE_DIR and their id is returned in the
+X-Profile-Id response header. Requests without a token only pay for one
+header lookup.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from users.utils import get_auth_state
+
+TOKEN_SALT = "monitoring.profile"
+MODES = ("sample", "cprofile")
+ARTIFACTS = {"sample": "folded", "cprofile": "prof"}
+TOP_FUNCTIONS = 25
+
+
+def issue_token(user):
+    return signing.dumps({"user": user.pk}, salt=TOKEN_SALT)
+
+
+def token_user(token):
+    """
+    The id of the staff user a profile token was issued to, or None if it
+    is forged, expired or its user is no longer active staff
+    """
+    try:
+        payload = signing.loads(
+            token, salt=TOKEN_SALT, max_age=settings.PROFILE_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    state = get_auth_state(payload["user"])
+    if not state or not state["is_active"] or not state["is_staff"]:
+        return None
+    return payload["user"]
+
+
+def requested_token(request):
+    """The profile token sent with request, if any; cheap when absent"""
+    token = request.META.get("HTTP_X_PROFILE")
+    if not token and "profile=" in request.META.get("QUERY_STRING", ""):
+        token = request.GET.get("profile")
+    return token or None
+
+
+def requested_mode(request):
+    mode = request.META.get("HTTP_X_PROFILE_MODE") or request.GET.get("profile_mode")
+    return mode if mode in MODES else "sample"
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}"
+
+
+class StackSampler:
+    """Counts the stacks of one thread, sampled from a background thread"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def top(self):
+        """Frames by the share of samples they were on the stack for"""
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            for label in set(stack.split(";")):
+                inclusive[label] += count
+        return [
+            {"function": label, "samples": count}
+            for label, count in inclusive.most_common(TOP_FUNCTIONS)
+        ]
+
+
+class RequestProfile:
+    """Profiler state for one request, saved with save()"""
+
+    def __init__(self, request, user_id, mode):
+        self.id = str(uuid.uuid4())
+        self.request = request
+        self.user_id = user_id
+        self.mode = mode
+        self.sampler = None
+        self.profiler = None
+
+    @contextmanager
+    def running(self):
+        if self.mode == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.sampler = StackSampler(
+                threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL
+            )
+            self.sampler.start()
+        try:
+            yield self
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            else:
+                self.sampler.stop()
+
+    def _cprofile_top(self):
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in rows[
+                :TOP_FUNCTIONS
+            ]
+        ]
+
+    def save(self, response, timing, wall_time):
+        directory = Path(settings.PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        artifact = directory / f"{self.id}.{ARTIFACTS[self.mode]}"
+        if self.profiler is not None:
+            self.profiler.dump_stats(artifact)
+            top = self._cprofile_top()
+        else:
+            artifact.write_text(self.sampler.folded())
+            top = self.sampler.top()
+
+        report = {
+            "id": self.id,
+            "created": timezone.now().isoformat(),
+            "user": self.user_id,
+            "method": self.request.method,
+            "path": self.request.get_full_path(),
+            "status": response.status_code,
+            "mode": self.mode,
+            "wall_ms": round(wall_time * 1000, 3),
+            "db_ms": round(timing.db_time * 1000, 3),
+            "serializer_ms": round(timing.serializer_time * 1000, 3),
+            "queries": [
+                {"sql": sql, "ms": round(elapsed * 1000, 3)}
+                for sql, elapsed in timing.statements
+            ],
+            "top": top,
+            "artifact": artifact.name,
+        }
+        if self.sampler is not None:
+            report["samples"] = self.sampler.samples
+        (directory / f"{self.id}.json").write_text(json.dumps(report, indent=2))
+        prune(directory)
+        response["X-Profile-Id"] = self.id
+        return report
+
+
+def prune(directory):
+    """Keep only the newest PROFILE_KEEP reports"""
+    reports = sorted(directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+    for report in reports[: max(0, len(reports) - settings.PROFILE_KEEP)]:
+        for path in directory.glob(f"{report.stem}.*"):
+            path.unlink(missing_ok=True)
+
+
+def load_report(profile_id):
+    path = Path(settings.PROFILE_DIR) / f"{profile_id}.json"
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text())
+
+
+def list_reports():
+    directory = Path(settings.PROFILE_DIR)
+    if not directory.is_dir():
+        return []
+    reports = [json.loads(path.read_text()) for path in directory.glob("*.json")]
+    reports.sort(key=lambda report: report["created"], reverse=True)
+    return [
+        {
+            key: report[key]
+            for key in ("id", "created", "method", "path", "status", "mode", "wall_ms")
+        }
+        | {"queries": len(report["queries"])}
+        for report in reports
+    ]
@@ -0,0 +1,255 @@
+"""
+Slow-query log.
+
+Every connection gets an execute wrapper that times each statement. Those
+taking at least SLOW_QUERY_THRESHOLD_MS are appended to SLOW_QUERY_LOG as
+JSON Lines with the view being served, the project code location that ran
+the query and, for SELECTs, the query plan: EXPLAIN QUERY PLAN on SQLite,
+EXPLAIN on PostgreSQL (EXPLAIN ANALYZE with SLOW_QUERY_EXPLAIN_ANALYZE,
+which runs the query again). Plans are captured at most once per
+SLOW_QUERY_EXPLAIN_INTERVAL for each query fingerprint, the SQL with its
+literals and parameters stripped, which is also what `manage.py
+slow_queries` groups the log by. Each fingerprint is also logged as a
+warning at most once per interval, and at DEBUG level otherwise.
+"""
+
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.backends.utils import CursorWrapper
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_request = ContextVar("slow_query_request", default=None)
+_write_lock = threading.Lock()
+_explained = {}
+_warned = {}
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER = re.compile(r"%s|\?")
+IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+SPACE = re.compile(r"\s+")
+
+MONITORING_DIR = str(Path(__file__).resolve().parent)
+# Calls every execute wrapper, so the frames below it belong to wrappers
+RUN_WRAPPERS = CursorWrapper._execute_with_wrappers.__code__
+
+
+def fingerprint(sql):
+    """SQL with literals, parameters and IN lists replaced by placeholders"""
+    sql = STRING.sub("?", sql)
+    sql = NUMBER.sub("?", sql)
+    sql = PLACEHOLDER.sub("?", sql)
+    sql = IN_LIST.sub("(...)", sql)
+    return SPACE.sub(" ", sql).strip()
+
+
+def set_request(request):
+    return _request.set(request)
+
+
+def reset_request(token):
+    _request.reset(token)
+
+
+def current_view():
+    request = _request.get()
+    if request is None:
+        return None
+    from .middleware import view_label
+
+    return view_label(request)
+
+
+def caller_location():
+    """
+    The innermost frame in project code, skipping execute wrappers (this
+    one, metrics, a benchmark's counter...), this app and middleware. None
+    when the query ran entirely inside framework code (e.g. a DRF generic
+    view); the view label still says where it came from.
+    """
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    caller = frame
+    while caller is not None and caller.f_code is not RUN_WRAPPERS:
+        caller = caller.f_back
+    if caller is not None:
+        frame = caller
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(base_dir)
+            and not filename.startswith(MONITORING_DIR)
+            and not filename.endswith("middleware.py")
+            and "site-packages" not in filename
+        ):
+            relative = filename[len(base_dir) :].lstrip("/\\")
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def explain(connection, sql, params):
+    """
+    Query plan of a SELECT, run on a raw backend cursor so that it is not
+    timed or logged itself. Returns None for other statements.
+    """
+    if sql.split(None, 1)[0].upper() not in ("SELECT", "WITH"):
+        return None
+    options = {}
+    if connection.vendor == "postgresql" and settings.SLOW_QUERY_EXPLAIN_ANALYZE:
+        options["analyze"] = True
+    prefix = connection.ops.explain_query_prefix(**options)
+
+    savepoint = None
+    if connection.vendor == "postgresql" and connection.in_atomic_block:
+        # A failed EXPLAIN must not abort the request's transaction
+        savepoint = connection.savepoint()
+    try:
+        cursor = connection.create_cursor()
+        try:
+            cursor.execute(f"{prefix} {sql}", params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except DatabaseError as exc:
+        if savepoint:
+            connection.savepoint_rollback(savepoint)
+        return f"EXPLAIN failed: {exc}"
+    if savepoint:
+        connection.savepoint_commit(savepoint)
+
+    if connection.vendor == "sqlite":
+        # (id, parent, notused, detail); indent children under their parent
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node] + detail)
+        return "\n".join(lines)
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
+
+
+def first_in_interval(seen, key):
+    """
+    Whether key was not seen in the last SLOW_QUERY_EXPLAIN_INTERVAL
+    seconds, marking it seen if so
+    """
+    now = time.monotonic()
+    last = seen.get(key)
+    if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL:
+        return False
+    seen[key] = now
+    return True
+
+
+def plan_for(connection, sql, params, key):
+    if not first_in_interval(_explained, key):
+        return None
+    return explain(connection, sql, params)
+
+
+def record(connection, sql, params, many, elapsed):
+    key = fingerprint(sql)
+    entry = {
+        "time": timezone.now().isoformat(),
+        "ms": round(elapsed * 1000, 3),
+        "alias": connection.alias,
+        "vendor": connection.vendor,
+        "view": current_view(),
+        "location": caller_location(),
+        "fingerprint": key,
+        "sql": sql,
+        "plan": None if many else plan_for(connection, sql, params, key),
+    }
+    # Warn once per fingerprint and interval; repeats are in the log file
+    logger.log(
+        logging.WARNING if first_in_interval(_warned, key) else logging.DEBUG,
+        "Slow query (%.1f ms) in %s at %s: %s",
+        entry["ms"],
+        entry["view"],
+        entry["location"],
+        key,
+    )
+    path = Path(settings.SLOW_QUERY_LOG)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry) + "\n"
+    with _write_lock, path.open("a", encoding="utf-8") as log:
+        log.write(line)
+    return entry
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed = time.perf_counter() - start
+    if elapsed * 1000 >= threshold:
+        try:
+            record(context["connection"], sql, params, many, elapsed)
+        except Exception:  # never fail the query because logging it failed
+            logger.exception("Could not record slow query")
+    return result
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """connection_created receiver"""
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+def read_log(path, since=None):
+    path = Path(path)
+    if not path.is_file():
+        return
+    with path.open(encoding="utf-8") as log:
+        for line in log:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if since is None or entry["time"] >= since:
+                yield entry
+
+
+def aggregate(entries):
+    """Slow-query log entries grouped by fingerprint"""
+    groups = {}
+    for entry in entries:
+        group = groups.get(entry["fingerprint"])
+        if group is None:
+            group = groups[entry["fingerprint"]] = {
+                "fingerprint": entry["fingerprint"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "example": entry["sql"],
+                "plan": None,
+                "views": Counter(),
+                "locations": Counter(),
+            }
+        group["count"] += 1
+        group["total_ms"] += entry["ms"]
+        if entry["ms"] >= group["max_ms"]:
+            group["max_ms"] = entry["ms"]
+            group["example"] = entry["sql"]
+        if entry.get("plan"):
+            group["plan"] = entry["plan"]
+        group["views"][entry.get("view")] += 1
+        group["locations"][entry.get("location")] += 1
+
+    for group in groups.values():
+        group["total_ms"] = round(group["total_ms"], 3)
+        group["mean_ms"] = round(group["total_ms"] / group["count"], 3)
+    return list(groups.values())
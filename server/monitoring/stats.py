@@ -0,0 +1,122 @@
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds of the histogram buckets; the last bucket is unbounded
+MS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+
+class RollingHistogram:
+    """
+    Fixed-bucket histogram over a sliding time window.
+
+    Observations land in the slot for the current interval; slots older
+    than the window are dropped, so a snapshot reflects recent traffic
+    only. Recording is O(log buckets) under a lock.
+    """
+
+    def __init__(self, bounds=MS_BUCKETS, slot_seconds=60, slots=10):
+        self.bounds = tuple(bounds)
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def observe(self, value, now=None):
+        slot = int((now if now is not None else time.time()) // self.slot_seconds)
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            window = self._windows.get(slot)
+            if window is None:
+                window = self._windows[slot] = [[0] * (len(self.bounds) + 1), 0, 0.0]
+                self._expire(slot)
+            window[0][index] += 1
+            window[1] += 1
+            window[2] += value
+
+    def _expire(self, current_slot):
+        oldest = current_slot - self.slots + 1
+        for slot in [slot for slot in self._windows if slot < oldest]:
+            del self._windows[slot]
+
+    def snapshot(self, now=None):
+        current = int((now if now is not None else time.time()) // self.slot_seconds)
+        buckets = [0] * (len(self.bounds) + 1)
+        count = 0
+        total = 0.0
+        with self._lock:
+            self._expire(current)
+            for window in self._windows.values():
+                for i, value in enumerate(window[0]):
+                    buckets[i] += value
+                count += window[1]
+                total += window[2]
+
+        return {
+            "count": count,
+            "mean": round(total / count, 3) if count else 0.0,
+            "p50": self._percentile(buckets, count, 50),
+            "p95": self._percentile(buckets, count, 95),
+            "p99": self._percentile(buckets, count, 99),
+            "buckets": {
+                **{f"le_{bound}": buckets[i] for i, bound in enumerate(self.bounds)},
+                "le_inf": buckets[-1],
+            },
+        }
+
+    def _percentile(self, buckets, count, pct):
+        """Upper bound of the bucket holding the pct-th observation"""
+        if not count:
+            return 0
+        target = pct / 100 * count
+        seen = 0
+        for i, value in enumerate(buckets):
+            seen += value
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else None
+        return None
+
+
+class RequestStats:
+    """Per-view histograms of request cost, kept in this process"""
+
+    METRICS = {
+        "wall_ms": MS_BUCKETS,
+        "db_ms": MS_BUCKETS,
+        "queries": COUNT_BUCKETS,
+        "serializer_ms": MS_BUCKETS,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view, **values):
+        histograms = self._views.get(view)
+        if histograms is None:
+            with self._lock:
+                histograms = self._views.setdefault(
+                    view,
+                    {
+                        name: RollingHistogram(bounds)
+                        for name, bounds in self.METRICS.items()
+                    },
+                )
+        for name, value in values.items():
+            histograms[name].observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            views = dict(self._views)
+        return {
+            view: {name: histogram.snapshot() for name, histogram in histograms.items()}
+            for view, histograms in sorted(views.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+request_stats = RequestStats()
@@ -0,0 +1,14 @@
+from .test_stats import RollingHistogramTests
+from .test_middleware import RequestTimingMiddlewareTests
+from .test_metrics import MetricsTests
+from .test_profiling import ProfilingTests
+from .test_slow_queries import SlowQueriesCommandTests, SlowQueryLogTests
+
+__all__ = [
+    "MetricsTests",
+    "ProfilingTests",
+    "RollingHistogramTests",
+    "RequestTimingMiddlewareTests",
+    "SlowQueriesCommandTests",
+    "SlowQueryLogTests",
+]
@@ -0,0 +1,154 @@
+import os
+import subprocess
+import sys
+import tempfile
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APITestCase
+from cart.models import Cart, CartItem
+from products.models import Product
+
+User = get_user_model()
+
+
+def sample(metric, **labels):
+    return REGISTRY.get_sample_value(metric, labels) or 0.0
+
+
+class MetricsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="shopper@example.com", password="test123"
+        )
+        self.product = Product.objects.create(
+            title="Metered Product", price=10, inventory_count=1, category="Tools"
+        )
+
+    def checkout(self, quantity):
+        cart, _ = Cart.objects.get_or_create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.product, quantity=quantity)
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("order-list-create"), {})
+        self.client.force_authenticate(user=None)
+        return response
+
+    def test_requests_are_counted_and_timed_per_view(self):
+        labels = {
+            "area": "products",
+            "view": "product-list",
+            "method": "GET",
+        }
+        before = sample("http_requests_total", status="200", **labels)
+        latency_before = sample("http_request_duration_seconds_count", **labels)
+        queries_before = sample("db_queries_total", alias="default")
+
+        self.client.get(reverse("product-list"))
+
+        self.assertEqual(
+            sample("http_requests_total", status="200", **labels), before + 1
+        )
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", **labels),
+            latency_before + 1,
+        )
+        self.assertGreater(sample("db_queries_total", alias="default"), queries_before)
+
+    def test_cache_outcomes(self):
+        name = "products:categories"
+        misses = sample("cache_requests_total", name=name, outcome="miss")
+        hits = sample("cache_requests_total", name=name, outcome="hit")
+
+        self.client.get(reverse("product-list-categories"))
+        self.client.get(reverse("product-list-categories"))
+
+        self.assertEqual(
+            sample("cache_requests_total", name=name, outcome="miss"), misses + 1
+        )
+        self.assertEqual(
+            sample("cache_requests_total", name=name, outcome="hit"), hits + 1
+        )
+
+    def test_checkout_outcomes_and_oversells(self):
+        success = sample("checkouts_total", outcome="success")
+        out_of_stock = sample("checkouts_total", outcome="out_of_stock")
+        prevented = sample("oversells_prevented_total", stage="checkout")
+
+        self.assertEqual(self.checkout(2).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            sample("checkouts_total", outcome="out_of_stock"), out_of_stock + 1
+        )
+        self.assertEqual(
+            sample("oversells_prevented_total", stage="checkout"), prevented + 1
+        )
+
+        CartItem.objects.all().delete()
+        self.assertEqual(self.checkout(1).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sample("checkouts_total", outcome="success"), success + 1)
+
+    @override_settings(DEBUG=True)
+    def test_exposition(self):
+        self.client.get(reverse("product-list"))
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b'http_requests_total{area="products"', response.content)
+        self.assertIn(b"http_requests_in_progress", response.content)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_token(self):
+        self.assertEqual(
+            self.client.get(reverse("metrics")).status_code, status.HTTP_403_FORBIDDEN
+        )
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_no_token_is_refused_outside_debug(self):
+        self.assertEqual(
+            self.client.get(reverse("metrics")).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        self.assertEqual(
+            self.client.get(reverse("metrics")).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_workers_are_aggregated(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "config.settings",
+            "PROMETHEUS_MULTIPROC_DIR": directory.name,
+        }
+
+        def run(code):
+            return subprocess.run(
+                [sys.executable, "-c", f"import django; django.setup(); {code}"],
+                cwd=settings.BASE_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+
+        for _ in range(2):
+            run(
+                "from monitoring.metrics import record_checkout; "
+                "record_checkout('success'); record_checkout('success')"
+            )
+        output = run(
+            "from monitoring.metrics import exposition; " "print(exposition().decode())"
+        )
+        self.assertIn('checkouts_total{outcome="success"} 4.0', output)
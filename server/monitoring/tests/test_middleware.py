@@ -0,0 +1,73 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from products.models import Product
+from ..stats import request_stats
+
+User = get_user_model()
+
+
+class RequestTimingMiddlewareTests(APITestCase):
+    def setUp(self):
+        request_stats.reset()
+        self.stats_url = reverse("request-stats")
+        self.product_list_url = reverse("product-list")
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        Product.objects.create(title="Product 1", price=10.00, inventory_count=5)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_server_timing_header(self):
+        """Test that sampled requests report their cost"""
+        response = self.client.get(self.product_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        header = response["Server-Timing"]
+        self.assertIn("app;dur=", header)
+        self.assertIn("db;dur=", header)
+        self.assertIn("ser;dur=", header)
+        self.assertNotIn('desc="0 queries"', header)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_stats_are_aggregated_per_view(self):
+        """Test that the staff endpoint exposes per-view histograms"""
+        self.client.get(self.product_list_url)
+        self.client.get(self.product_list_url)
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.stats_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        views = response.data["views"]
+        self.assertEqual(views["GET product-list"]["wall_ms"]["count"], 2)
+        self.assertGreater(views["GET product-list"]["queries"]["mean"], 0)
+        self.assertEqual(views["GET product-list"]["serializer_ms"]["count"], 2)
+
+        response = self.client.delete(self.stats_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertNotIn("GET product-list", request_stats.snapshot())
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+    async def test_async_views_are_timed(self):
+        """Test that the middleware also measures async (ASGI) requests"""
+        response = await self.async_client.get(reverse("catalog-product-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('desc="0 queries"', response["Server-Timing"])
+        self.assertIn("GET catalog-product-list", request_stats.snapshot())
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_untouched(self):
+        """Test that a zero sample rate disables instrumentation"""
+        response = self.client.get(self.product_list_url)
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(request_stats.snapshot(), {})
+
+    def test_stats_require_staff(self):
+        """Test that request stats are staff only"""
+        response = self.client.get(self.stats_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
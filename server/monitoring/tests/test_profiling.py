@@ -0,0 +1,123 @@
+import tempfile
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from products.models import Product
+from ..profiling import issue_token
+
+User = get_user_model()
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(PROFILE_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.product_list_url = reverse("product-list")
+        self.staff = User.objects.create_user(
+            email="staff@example.com", password="staff123", is_staff=True
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", password="customer123"
+        )
+        Product.objects.create(title="Product 1", price=10.00, inventory_count=5)
+
+    def report(self, profile_id):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(
+            reverse("profile-detail", kwargs={"profile_id": profile_id})
+        )
+        self.client.force_authenticate(user=None)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_token_is_staff_only(self):
+        """Test that only staff can get a profile token"""
+        url = reverse("profile-token")
+        self.assertEqual(
+            self.client.post(url).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("token", response.data)
+
+    def test_profiled_request_records_sql(self):
+        """Test that a profiled request stores its SQL and a flamegraph file"""
+        response = self.client.get(
+            self.product_list_url, HTTP_X_PROFILE=issue_token(self.staff)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = self.report(response["X-Profile-Id"])
+        self.assertEqual(report["mode"], "sample")
+        self.assertEqual(report["path"], self.product_list_url)
+        self.assertTrue(
+            any("products_product" in query["sql"] for query in report["queries"])
+        )
+
+        self.client.force_authenticate(user=self.staff)
+        artifact = self.client.get(
+            reverse("profile-artifact", kwargs={"profile_id": report["id"]})
+        )
+        self.assertEqual(artifact.status_code, status.HTTP_200_OK)
+        self.assertEqual(artifact["Content-Type"], "text/plain")
+
+        listing = self.client.get(reverse("profile-list"))
+        self.assertEqual(listing.data["profiles"][0]["id"], report["id"])
+
+    def test_cprofile_mode_via_query_parameter(self):
+        """Test deterministic profiling requested in the query string"""
+        response = self.client.get(
+            self.product_list_url,
+            {"profile": issue_token(self.staff), "profile_mode": "cprofile"},
+        )
+
+        report = self.report(response["X-Profile-Id"])
+        self.assertEqual(report["mode"], "cprofile")
+        self.assertTrue(report["artifact"].endswith(".prof"))
+        self.assertTrue(
+            any("list" in function["function"] for function in report["top"])
+        )
+
+    async def test_async_views_are_profiled(self):
+        """Test that ASGI-native views can be profiled too"""
+        response = await self.async_client.get(
+            reverse("catalog-product-list"),
+            headers={"X-Profile": issue_token(self.staff)},
+        )
+        self.assertIn("X-Profile-Id", response)
+
+    def test_invalid_tokens_are_ignored(self):
+        """Test that forged, non-staff and demoted staff tokens do nothing"""
+        token = issue_token(self.staff)
+        for value in (token + "x", issue_token(self.customer)):
+            response = self.client.get(self.product_list_url, HTTP_X_PROFILE=value)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("X-Profile-Id", response)
+
+        self.staff.is_staff = False
+        self.staff.save()
+        response = self.client.get(self.product_list_url, HTTP_X_PROFILE=token)
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_unknown_profile(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(
+            reverse(
+                "profile-detail",
+                kwargs={"profile_id": "00000000-0000-0000-0000-000000000000"},
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
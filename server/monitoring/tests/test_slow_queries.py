@@ -0,0 +1,181 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from benchmarks.common import QueryCounter
+from products.models import Product
+from .. import slow_queries
+from ..slow_queries import aggregate, fingerprint
+
+User = get_user_model()
+
+
+class SlowQueryLogTests(APITestCase):
+    def setUp(self):
+        slow_queries._explained.clear()
+        slow_queries._warned.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log = Path(directory.name) / "slow.jsonl"
+        Product.objects.create(title="Product 1", price=10.00, inventory_count=5)
+
+    def entries(self):
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+    def test_fingerprint(self):
+        """Test that literals, parameters and IN lists are normalized"""
+        self.assertEqual(
+            fingerprint(
+                "SELECT * FROM t1 WHERE id IN (%s, %s,  %s) AND name = 'x''y'\n"
+                "LIMIT 21"
+            ),
+            "SELECT * FROM t1 WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+        self.assertEqual(
+            fingerprint("SELECT a FROM t WHERE b = %s"),
+            fingerprint("SELECT a FROM t WHERE b = 42"),
+        )
+
+    def test_fast_queries_are_not_logged(self):
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=10_000, SLOW_QUERY_LOG=self.log):
+            self.client.get(reverse("product-list"))
+        self.assertEqual(self.entries(), [])
+
+    def test_slow_queries_are_logged_with_view_and_plan(self):
+        """Test that slow SELECTs are logged with their view and query plan"""
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log):
+            response = self.client.get(
+                reverse("product-list"), {"category": "Electronics"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entries = [e for e in self.entries() if "products_product" in e["sql"]]
+        self.assertTrue(entries)
+        entry = entries[0]
+        self.assertEqual(entry["view"], "GET product-list")
+        self.assertEqual(entry["vendor"], "sqlite")
+        self.assertIn("?", entry["fingerprint"])
+        self.assertRegex(entry["plan"], "SCAN|SEARCH")
+
+    def test_location_points_at_project_code(self):
+        """Test that the calling code is the innermost project frame"""
+        cache.clear()
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log):
+            self.client.get(reverse("product-list-categories"))
+
+        entry = self.entries()[-1]
+        self.assertEqual(entry["view"], "GET product-list-categories")
+        self.assertRegex(entry["location"], r"products/views\.py:\d+ in categories")
+
+    def test_location_skips_other_execute_wrappers(self):
+        """Test that a wrapper running around this one is not the caller"""
+        counter = QueryCounter()
+        connection.execute_wrappers.insert(0, counter)
+        self.addCleanup(connection.execute_wrappers.remove, counter)
+        cache.clear()
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log):
+            self.client.get(reverse("product-list-categories"))
+
+        self.assertGreater(counter.queries, 0)
+        entry = self.entries()[-1]
+        self.assertRegex(entry["location"], r"products/views\.py:\d+ in categories")
+
+    def test_warns_once_per_fingerprint(self):
+        with override_settings(
+            SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log
+        ), self.assertLogs(slow_queries.logger, "DEBUG") as logs:
+            list(Product.objects.filter(price__gt=1))
+            list(Product.objects.filter(price__gt=2))
+
+        self.assertEqual([r.levelname for r in logs.records], ["WARNING", "DEBUG"])
+        self.assertEqual(len(self.entries()), 2)
+
+    def test_plans_are_captured_once_per_fingerprint(self):
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log):
+            list(Product.objects.filter(price__gt=1))
+            list(Product.objects.filter(price__gt=2))
+
+        first, second = self.entries()[-2:]
+        self.assertEqual(first["fingerprint"], second["fingerprint"])
+        self.assertIsNotNone(first["plan"])
+        self.assertIsNone(second["plan"])
+
+    def test_writes_are_logged_without_plan(self):
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log):
+            Product.objects.update(inventory_count=3)
+
+        entry = self.entries()[-1]
+        self.assertTrue(entry["sql"].startswith("UPDATE"))
+        self.assertIsNone(entry["plan"])
+
+
+class SlowQueriesCommandTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log = Path(directory.name) / "slow.jsonl"
+        lines = [
+            self.entry("SELECT a FROM t WHERE b = 1", 50, "2025-06-01", plan="SCAN t"),
+            self.entry("SELECT a FROM t WHERE b = 2", 70, "2025-06-02"),
+            self.entry("SELECT c FROM u", 100, "2025-06-03"),
+        ]
+        self.log.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    def entry(self, sql, ms, day, plan=None):
+        return {
+            "time": f"{day}T12:00:00+00:00",
+            "ms": ms,
+            "view": "GET product-list",
+            "location": "products/views.py:10 in list",
+            "fingerprint": fingerprint(sql),
+            "sql": sql,
+            "plan": plan,
+        }
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command("slow_queries", "--log", str(self.log), *args, stdout=out)
+        return out.getvalue()
+
+    def test_aggregate(self):
+        groups = aggregate(
+            json.loads(line) for line in self.log.read_text().splitlines()
+        )
+        by_fingerprint = {group["fingerprint"]: group for group in groups}
+        group = by_fingerprint["SELECT a FROM t WHERE b = ?"]
+        self.assertEqual(group["count"], 2)
+        self.assertEqual(group["total_ms"], 120)
+        self.assertEqual(group["mean_ms"], 60)
+        self.assertEqual(group["max_ms"], 70)
+        self.assertEqual(group["plan"], "SCAN t")
+
+    def test_top_offenders_by_total_time(self):
+        output = self.run_command("--plans")
+        self.assertLess(
+            output.index("SELECT a FROM t WHERE b = ?"), output.index("SELECT c FROM u")
+        )
+        self.assertIn("2 call(s), total 120.0 ms", output)
+        self.assertIn("view: GET product-list (2)", output)
+        self.assertIn("    SCAN t", output)
+
+    def test_sort_limit_and_since(self):
+        output = self.run_command("--sort", "max", "--limit", "1")
+        self.assertIn("SELECT c FROM u", output)
+        self.assertNotIn("FROM t", output)
+
+        output = self.run_command("--since", "2025-06-02")
+        self.assertIn("1 call(s), total 70.0 ms", output)
+
+    def test_empty_log(self):
+        self.log.write_text("")
+        self.assertIn("No slow queries logged", self.run_command())
@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+from ..stats import RollingHistogram
+
+
+class RollingHistogramTests(SimpleTestCase):
+    def test_percentiles_from_buckets(self):
+        """Test that percentiles report the bucket upper bound"""
+        histogram = RollingHistogram(bounds=(10, 100, 1000))
+        for value in [1] * 90 + [50] * 9 + [500]:
+            histogram.observe(value, now=0)
+
+        snapshot = histogram.snapshot(now=0)
+        self.assertEqual(snapshot["count"], 100)
+        self.assertEqual(snapshot["p50"], 10)
+        self.assertEqual(snapshot["p95"], 100)
+        self.assertEqual(snapshot["p99"], 100)
+        self.assertEqual(snapshot["buckets"]["le_1000"], 1)
+
+    def test_values_above_last_bound(self):
+        """Test the overflow bucket"""
+        histogram = RollingHistogram(bounds=(10,))
+        histogram.observe(99, now=0)
+
+        snapshot = histogram.snapshot(now=0)
+        self.assertEqual(snapshot["buckets"]["le_inf"], 1)
+        self.assertIsNone(snapshot["p50"])
+
+    def test_old_slots_expire(self):
+        """Test that observations outside the window are dropped"""
+        histogram = RollingHistogram(bounds=(10,), slot_seconds=60, slots=2)
+        histogram.observe(1, now=0)
+        histogram.observe(1, now=60)
+
+        self.assertEqual(histogram.snapshot(now=90)["count"], 2)
+        self.assertEqual(histogram.snapshot(now=120)["count"], 1)
+        self.assertEqual(histogram.snapshot(now=180)["count"], 0)
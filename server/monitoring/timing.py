@@ -0,0 +1,88 @@
+import time
+from contextvars import ContextVar
+
+_current = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    """
+    Cost of the request being handled: DB queries and serialization. With
+    record_sql, each statement and its duration is kept in statements.
+    """
+
+    def __init__(self, record_sql=False):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.statements = [] if record_sql else None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.db_time += elapsed
+            self.queries += 1
+            if self.statements is not None:
+                self.statements.append((sql, elapsed))
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """
+    Installed on every connection; forwards to the current request's
+    timing. The ContextVar follows a request into the threads the async
+    ORM runs queries in, which a per-request execute_wrapper() on the
+    request thread's connections would miss.
+    """
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """connection_created receiver"""
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+def start_timing(record_sql=False):
+    timing = RequestTiming(record_sql)
+    return timing, _current.set(timing)
+
+
+def stop_timing(token):
+    _current.reset(token)
+
+
+def current_timing():
+    return _current.get()
+
+
+def instrument_serializers():
+    """
+    Time top-level DRF serialization. Only the outermost .data access is
+    measured; nested serializers go through to_representation and are
+    included in their parent's time.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original.fget, "_timed", False):
+        return
+
+    def data(self):
+        timing = _current.get()
+        if timing is None:
+            return original.fget(self)
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            timing.serializer_time += time.perf_counter() - start
+
+    timed = property(data)
+    timed.fget._timed = True
+    BaseSerializer.data = timed
@@ -0,0 +1,26 @@
+from django.urls import path
+from .views import (
+    CacheStatsView,
+    ProfileArtifactView,
+    ProfileDetailView,
+    ProfileListView,
+    ProfileTokenView,
+    RequestStatsView,
+)
+
+urlpatterns = [
+    path("requests/", RequestStatsView.as_view(), name="request-stats"),
+    path("cache/", CacheStatsView.as_view(), name="cache-stats"),
+    path("profile-token/", ProfileTokenView.as_view(), name="profile-token"),
+    path("profiles/", ProfileListView.as_view(), name="profile-list"),
+    path(
+        "profiles/<uuid:profile_id>/",
+        ProfileDetailView.as_view(),
+        name="profile-detail",
+    ),
+    path(
+        "profiles/<uuid:profile_id>/artifact/",
+        ProfileArtifactView.as_view(),
+        name="profile-artifact",
+    ),
+]
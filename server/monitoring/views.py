@@ -0,0 +1,117 @@
+from pathlib import Path
+from django.conf import settings
+from django.http import FileResponse, Http404
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from config.caching import cache_stats
+from .profiling import issue_token, list_reports, load_report
+from .stats import request_stats
+
+
+class RequestStatsView(APIView):
+    """
+    Rolling per-view request cost histograms for this worker process
+    (staff only). DELETE clears them.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "sample_rate": settings.REQUEST_TIMING_SAMPLE_RATE,
+                "views": request_stats.snapshot(),
+            }
+        )
+
+    def delete(self, request):
+        request_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CacheStatsView(APIView):
+    """
+    Per-key hit/stale/miss/early-refresh counters of config.caching for
+    this worker process (staff only). DELETE clears them.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({"keys": cache_stats.snapshot()})
+
+    def delete(self, request):
+        cache_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileTokenView(APIView):
+    """
+    Issue a profile token (staff only). Sending it as X-Profile (or
+    ?profile=) profiles that request; see monitoring/profiling.py.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        return Response(
+            {
+                "token": issue_token(request.user),
+                "expires_in": settings.PROFILE_TOKEN_MAX_AGE,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ProfileListView(APIView):
+    """Stored request profiles, newest first (staff only)"""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    # Both profile views would otherwise be named monitoring_profiles_retrieve
+    @extend_schema(operation_id="monitoring_profiles_list")
+    def get(self, request):
+        return Response({"profiles": list_reports()})
+
+
+class ProfileDetailView(APIView):
+    """
+    One request profile: timings, every SQL statement with its duration and
+    the hottest functions (staff only)
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, profile_id):
+        report = load_report(profile_id)
+        if report is None:
+            raise Http404
+        return Response(report)
+
+
+class ProfileArtifactView(APIView):
+    """
+    The raw profile: folded stacks for flamegraph tools, or a pstats dump
+    for cProfile runs (staff only)
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, profile_id):
+        report = load_report(profile_id)
+        if report is None:
+            raise Http404
+        path = Path(settings.PROFILE_DIR) / report["artifact"]
+        if not path.is_file():
+            raise Http404
+        content_type = (
+            "text/plain" if report["mode"] == "sample" else "application/octet-stream"
+        )
+        return FileResponse(
+            path.open("rb"),
+            as_attachment=True,
+            filename=report["artifact"],
+            content_type=content_type,
+        )
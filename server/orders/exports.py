@@ -0,0 +1,157 @@
+import csv
+import json
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from config.batching import CHUNK_SIZE
+from .models import Order, OrderItem
+
+EXPORT_FIELDS = [
+    "order_id",
+    "created_at",
+    "status",
+    "user_id",
+    "user_email",
+    "shipping_address",
+    "order_total",
+    "item_id",
+    "product_id",
+    "product_title",
+    "category",
+    "quantity",
+    "unit_price",
+    "line_total",
+]
+
+
+def parse_export_filters(since=None, until=None, status=None):
+    """
+    Turn raw since/until dates (YYYY-MM-DD, both inclusive) and a
+    comma-separated status list into keyword arguments for
+    iter_order_lines. Returns (filters, error).
+    """
+    tz = timezone.get_current_timezone()
+    filters = {}
+
+    if since:
+        day = parse_date(since)
+        if day is None:
+            return None, "Invalid since date, expected YYYY-MM-DD"
+        filters["since"] = datetime.combine(day, time.min, tzinfo=tz)
+
+    if until:
+        day = parse_date(until)
+        if day is None:
+            return None, "Invalid until date, expected YYYY-MM-DD"
+        filters["until"] = datetime.combine(
+            day + timedelta(days=1), time.min, tzinfo=tz
+        )
+
+    if status:
+        statuses = [value.strip() for value in status.split(",") if value.strip()]
+        valid = {choice for choice, _ in Order.STATUS_CHOICES}
+        unknown = [value for value in statuses if value not in valid]
+        if unknown:
+            return None, f"Unknown status: {', '.join(unknown)}"
+        filters["statuses"] = statuses
+
+    return filters, None
+
+
+def iter_order_lines(since=None, until=None, statuses=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield one dict per order line, oldest order first.
+
+    Orders are read in keyset-paginated chunks (id > last id seen), with
+    their items fetched in one query per chunk, so memory use depends on
+    chunk_size and not on how many orders match.
+    """
+    orders = Order.objects.order_by("id")
+    if since is not None:
+        orders = orders.filter(created_at__gte=since)
+    if until is not None:
+        orders = orders.filter(created_at__lt=until)
+    if statuses:
+        orders = orders.filter(status__in=statuses)
+
+    last_id = 0
+    while True:
+        batch = list(
+            orders.filter(id__gt=last_id).values(
+                "id",
+                "created_at",
+                "status",
+                "user_id",
+                "user__email",
+                "shipping_address",
+                "total_price",
+            )[:chunk_size]
+        )
+        if not batch:
+            return
+
+        lines = defaultdict(list)
+        items = (
+            OrderItem.objects.filter(order_id__in=[order["id"] for order in batch])
+            .order_by("order_id", "id")
+            .values(
+                "id",
+                "order_id",
+                "product_id",
+                "product__title",
+                "product__category",
+                "quantity",
+                "price",
+            )
+        )
+        for item in items:
+            lines[item["order_id"]].append(item)
+
+        for order in batch:
+            for item in lines[order["id"]]:
+                yield {
+                    "order_id": order["id"],
+                    "created_at": order["created_at"],
+                    "status": order["status"],
+                    "user_id": order["user_id"],
+                    "user_email": order["user__email"],
+                    "shipping_address": order["shipping_address"],
+                    "order_total": order["total_price"],
+                    "item_id": item["id"],
+                    "product_id": item["product_id"],
+                    "product_title": item["product__title"],
+                    "category": item["product__category"],
+                    "quantity": item["quantity"],
+                    "unit_price": item["price"],
+                    "line_total": item["price"] * item["quantity"],
+                }
+
+        last_id = batch[-1]["id"]
+
+
+class _Echo:
+    """File-like object whose write() hands back what it was given"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+    for row in rows:
+        row["created_at"] = row["created_at"].isoformat()
+        yield writer.writerow(row)
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": (csv_lines, "text/csv"),
+    "jsonl": (jsonl_lines, "application/x-ndjson"),
+}
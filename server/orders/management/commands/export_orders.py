@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from orders.exports import EXPORT_FORMATS, iter_order_lines, parse_export_filters
+
+
+class Command(BaseCommand):
+    help = "Export order lines as CSV or JSON Lines, e.g. for a nightly cron job"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First day to include (YYYY-MM-DD)")
+        parser.add_argument("--until", help="Last day to include (YYYY-MM-DD)")
+        parser.add_argument(
+            "--status", help="Comma-separated statuses, e.g. paid,shipped"
+        )
+        parser.add_argument(
+            "--format", dest="file_format", choices=EXPORT_FORMATS, default="csv"
+        )
+        parser.add_argument("--output", help="File to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        filters, error = parse_export_filters(
+            since=options["since"], until=options["until"], status=options["status"]
+        )
+        if error:
+            raise CommandError(error)
+
+        writer, _ = EXPORT_FORMATS[options["file_format"]]
+        lines = writer(iter_order_lines(**filters))
+
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as out:
+                out.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -12,11 +12,23 @@ class Order(models.Model):
         ("cancelled", "Cancelled"),
     ]
 
+    # Legal status changes; delivered and cancelled orders are final
+    ALLOWED_TRANSITIONS = {
+        "pending": {"paid", "cancelled"},
+        "paid": {"shipped", "cancelled"},
+        "shipped": {"delivered"},
+        "delivered": set(),
+        "cancelled": set(),
+    }
+    TERMINAL_STATUSES = {"delivered", "cancelled"}
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     shipping_address = models.TextField(blank=True)
+    # Bumped on every change so cached responses and ETags go stale
+    version = models.PositiveIntegerField(default=1)
 
     class Meta:
         ordering = ["-created_at"]
@@ -24,6 +36,21 @@ class Order(models.Model):
     def __str__(self):
         return f"Order {self.id} - {self.user.email}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+    @property
+    def is_final(self):
+        return self.status in self.TERMINAL_STATUSES
+
+    def can_transition_to(self, status):
+        return status in self.ALLOWED_TRANSITIONS.get(self.status, set())
+
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, related_name="items", on_delete=models.CASCADE)
@@ -18,3 +18,12 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = ["id", "user", "created_at", "total_price", "status", "items"]
         read_only_fields = ["user", "created_at", "total_price", "status"]
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=10000,
+    )
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
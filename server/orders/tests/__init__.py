@@ -1,7 +1,15 @@
 from .test_models import OrderModelTests
-from .test_views import OrderViewsTests
+from .test_views import (
+    OrderViewsTests,
+    OrderBulkStatusTests,
+    OrderExportTests,
+    OrderDetailCacheTests,
+)
 
 __all__ = [
     "OrderModelTests",
     "OrderViewsTests",
+    "OrderBulkStatusTests",
+    "OrderExportTests",
+    "OrderDetailCacheTests",
 ]
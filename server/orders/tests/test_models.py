@@ -49,3 +49,25 @@ class OrderModelTests(TestCase):
         orders = Order.objects.all()
         self.assertEqual(orders[0], order2)  # Most recent first
         self.assertEqual(orders[1], order1)
+
+    def test_allowed_status_transitions(self):
+        """Test the order status state machine"""
+        order = Order.objects.create(user=self.user, total_price=10.00)
+
+        self.assertTrue(order.can_transition_to("paid"))
+        self.assertTrue(order.can_transition_to("cancelled"))
+        self.assertFalse(order.can_transition_to("shipped"))
+        self.assertFalse(order.can_transition_to("pending"))
+
+        order.status = "delivered"
+        self.assertFalse(order.can_transition_to("cancelled"))
+
+    def test_save_bumps_version(self):
+        """Test that every update of an order bumps its version"""
+        order = Order.objects.create(user=self.user, total_price=10.00)
+        self.assertEqual(order.version, 1)
+
+        order.status = "paid"
+        order.save(update_fields=["status"])
+        order.refresh_from_db()
+        self.assertEqual(order.version, 2)
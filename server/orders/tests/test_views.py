@@ -1,12 +1,23 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
+from django.core.management import call_command
+from django.utils import timezone
 from decimal import Decimal
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from config.caching import namespace_version
 from products.models import Product
 from cart.models import Cart, CartItem
-from ..models import Order
+from ..models import Order, OrderItem
+from ..exports import iter_order_lines
 
 User = get_user_model()
 
@@ -84,6 +95,18 @@ class OrderViewsTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("error", response.data)
 
+    def test_create_order_keeps_product_caches(self):
+        """Deducting stock does not invalidate cached catalog entries"""
+        self.client.force_authenticate(user=self.user)
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.product1, quantity=2)
+        version = namespace_version("products")
+
+        response = self.client.post(self.order_list_url, {})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(namespace_version("products"), version)
+
     def test_list_orders_authenticated(self):
         """Test user can only see their own orders"""
         self.client.force_authenticate(user=self.user)
@@ -141,3 +164,341 @@ class OrderViewsTests(APITestCase):
         response = self.client.get(detail_url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class OrderBulkStatusTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("order-bulk-status")
+        self.user = User.objects.create_user(
+            email="test@example.com", password="test123"
+        )
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        self.product = Product.objects.create(
+            title="Product 1", price=10.00, inventory_count=5
+        )
+
+    def create_order(self, status="pending", quantity=1):
+        order = Order.objects.create(
+            user=self.user, total_price=10.00 * quantity, status=status
+        )
+        OrderItem.objects.create(
+            order=order, product=self.product, quantity=quantity, price=10.00
+        )
+        return order
+
+    def test_bulk_status_requires_staff(self):
+        """Test that only staff can change order statuses"""
+        order = self.create_order()
+        data = {"ids": [order.id], "status": "paid"}
+
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_status_success(self):
+        """Test moving several orders to the next status"""
+        self.client.force_authenticate(user=self.admin_user)
+        orders = [self.create_order() for _ in range(3)]
+
+        response = self.client.post(
+            self.url,
+            {"ids": [order.id for order in orders], "status": "paid"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(response.data["failed"], {})
+        self.assertEqual(Order.objects.filter(status="paid").count(), 3)
+
+    def test_bulk_status_reports_failures(self):
+        """Test that illegal transitions and unknown ids are reported"""
+        self.client.force_authenticate(user=self.admin_user)
+        paid = self.create_order(status="paid")
+        pending = self.create_order()
+        delivered = self.create_order(status="delivered")
+
+        response = self.client.post(
+            self.url,
+            {"ids": [paid.id, pending.id, delivered.id, 9999], "status": "shipped"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.data["failed"]["not_found"], [9999])
+        self.assertEqual(
+            response.data["failed"]["illegal_transition"],
+            {"pending": [pending.id], "delivered": [delivered.id]},
+        )
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "pending")
+
+    def test_bulk_cancel_restores_stock(self):
+        """Test that cancelling orders puts their items back in stock"""
+        self.client.force_authenticate(user=self.admin_user)
+        first = self.create_order(quantity=2)
+        second = self.create_order(status="paid", quantity=3)
+        shipped = self.create_order(status="shipped", quantity=4)
+
+        response = self.client.post(
+            self.url,
+            {"ids": [first.id, second.id, shipped.id], "status": "cancelled"},
+            format="json",
+        )
+
+        self.assertEqual(response.data["updated"], 2)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.inventory_count, 10)  # 5 + 2 + 3
+
+        # Cancelling again is illegal and must not restock twice
+        response = self.client.post(
+            self.url, {"ids": [first.id], "status": "cancelled"}, format="json"
+        )
+        self.assertEqual(response.data["updated"], 0)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.inventory_count, 10)
+
+    def test_bulk_cancel_skips_orders_changed_meanwhile(self):
+        """Orders cancelled after being read are not restocked twice"""
+        self.client.force_authenticate(user=self.admin_user)
+        changed = self.create_order(quantity=2)
+        pending = self.create_order(quantity=3)
+        stale = {changed.id: "pending", pending.id: "pending"}
+        Order.objects.filter(pk=changed.pk).update(status="cancelled")
+
+        with mock.patch("orders.utils._current_statuses", return_value=stale):
+            response = self.client.post(
+                self.url,
+                {"ids": [changed.id, pending.id], "status": "cancelled"},
+                format="json",
+            )
+
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.data["failed"], {"conflict": [changed.id]})
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.inventory_count, 8)  # 5 + 3
+
+    def test_bulk_status_invalid_payload(self):
+        """Test that unknown statuses and empty id lists are rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+        for data in [{"ids": [1], "status": "lost"}, {"ids": [], "status": "paid"}]:
+            response = self.client.post(self.url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrderExportTests(APITestCase):
+    def setUp(self):
+        self.csv_url = reverse("order-export-csv")
+        self.jsonl_url = reverse("order-export-jsonl")
+        self.user = User.objects.create_user(
+            email="test@example.com", password="test123"
+        )
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        self.product = Product.objects.create(
+            title="Product 1", price=10.00, inventory_count=5, category="Books"
+        )
+        self.orders = []
+        for order_status in ["pending", "paid", "cancelled"]:
+            order = Order.objects.create(
+                user=self.user, total_price=20.00, status=order_status
+            )
+            OrderItem.objects.create(
+                order=order, product=self.product, quantity=2, price=10.00
+            )
+            self.orders.append(order)
+
+    def read_stream(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_requires_staff(self):
+        """Test that only staff can export orders"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.csv_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_csv(self):
+        """Test streaming every order line as CSV"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.csv_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(self.read_stream(response))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["order_id"], str(self.orders[0].id))
+        self.assertEqual(rows[0]["user_email"], "test@example.com")
+        self.assertEqual(rows[0]["category"], "Books")
+        self.assertEqual(Decimal(rows[0]["line_total"]), Decimal("20.00"))
+
+    def test_export_jsonl_filtered_by_status(self):
+        """Test JSON Lines export limited to some statuses"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.jsonl_url, {"status": "paid,cancelled"})
+
+        rows = [json.loads(line) for line in self.read_stream(response).splitlines()]
+        self.assertEqual([row["status"] for row in rows], ["paid", "cancelled"])
+        self.assertEqual(rows[0]["unit_price"], "10.00")
+
+    def test_export_filtered_by_date(self):
+        """Test that the date range excludes orders outside it"""
+        self.client.force_authenticate(user=self.admin_user)
+        Order.objects.filter(id=self.orders[0].id).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        since = (timezone.localdate() - timedelta(days=1)).isoformat()
+
+        response = self.client.get(self.jsonl_url, {"since": since})
+        rows = self.read_stream(response).splitlines()
+        self.assertEqual(len(rows), 2)
+
+    def test_export_reads_in_chunks(self):
+        """Test that keyset chunks do not drop or repeat lines"""
+        lines = list(iter_order_lines(chunk_size=2))
+        self.assertEqual(
+            [line["order_id"] for line in lines], [o.id for o in self.orders]
+        )
+
+    def test_export_invalid_filters(self):
+        """Test that bad dates and statuses are rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+        for params in [{"since": "yesterday"}, {"status": "lost"}]:
+            response = self.client.get(self.csv_url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_command(self):
+        """Test the management command writes the same export"""
+        out = io.StringIO()
+        call_command(
+            "export_orders", "--format", "jsonl", "--status", "paid", stdout=out
+        )
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["order_id"], self.orders[1].id)
+
+
+class OrderDetailCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", password="test123"
+        )
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        self.product = Product.objects.create(
+            title="Product 1", price=10.00, inventory_count=5
+        )
+        self.order = Order.objects.create(user=self.user, total_price=20.00)
+        for _ in range(3):
+            OrderItem.objects.create(
+                order=self.order, product=self.product, quantity=1, price=10.00
+            )
+        self.url = reverse("order-detail", args=[self.order.id])
+        self.client.force_authenticate(user=self.user)
+
+    def test_detail_sets_etag(self):
+        """Test that order detail responses carry an ETag"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], f'"order-{self.order.id}-pending-1"')
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test that a matching If-None-Match gets a 304 with one query"""
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_compressed_etag_returns_not_modified(self):
+        """Test that the weak ETag of a compressed response still matches"""
+        with self.settings(RESPONSE_COMPRESSION_MIN_SIZE=0):
+            etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_response_skips_items_and_products(self):
+        """Test that a repeat request is served from cache"""
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(len(second.data["items"]), 3)
+
+    def test_cached_media_urls_follow_the_request_host(self):
+        """Test that one cache entry serves each host its own image URLs"""
+        Product.objects.filter(pk=self.product.pk).update(image="products/a.png")
+        first = self.client.get(self.url, HTTP_HOST="shop.example.com")
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url, HTTP_HOST="evil.example.com")
+
+        self.assertEqual(
+            first.data["items"][0]["product"]["image_url"],
+            "http://shop.example.com/media/products/a.png",
+        )
+        self.assertEqual(
+            second.data["items"][0]["product"]["image"],
+            "http://evil.example.com/media/products/a.png",
+        )
+        self.assertEqual(
+            second.data["items"][0]["product"]["image_url"],
+            "http://evil.example.com/media/products/a.png",
+        )
+
+    def test_status_change_invalidates(self):
+        """Test that both status-change paths produce a fresh response"""
+        etag = self.client.get(self.url)["ETag"]
+
+        self.order.status = "paid"
+        self.order.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "paid")
+        etag = response["ETag"]
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.post(
+            reverse("order-bulk-status"),
+            {"ids": [self.order.id], "status": "cancelled"},
+            format="json",
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "cancelled")
+
+    def test_final_orders_are_long_lived(self):
+        """Test that delivered orders may be cached by the client"""
+        Order.objects.filter(id=self.order.id).update(status="delivered")
+
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response["Cache-Control"],
+            f"private, max-age={settings.FINAL_ORDER_CACHE_TIMEOUT}",
+        )
+
+    def test_cache_does_not_leak_between_users(self):
+        """Test that another user cannot read a cached order"""
+        self.client.get(self.url)
+        other_user = User.objects.create_user(
+            email="other@example.com", password="test123"
+        )
+        self.client.force_authenticate(user=other_user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
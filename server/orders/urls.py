@@ -1,7 +1,25 @@
 from django.urls import path
-from .views import OrderListCreateView, OrderDetailView
+from .views import (
+    OrderListCreateView,
+    OrderDetailView,
+    OrderBulkStatusView,
+    OrderExportView,
+)
 
 urlpatterns = [
     path("", OrderListCreateView.as_view(), name="order-list-create"),
     path("<int:pk>/", OrderDetailView.as_view(), name="order-detail"),
+    path("bulk-status/", OrderBulkStatusView.as_view(), name="order-bulk-status"),
+    path(
+        "export.csv",
+        OrderExportView.as_view(),
+        {"file_format": "csv"},
+        name="order-export-csv",
+    ),
+    path(
+        "export.jsonl",
+        OrderExportView.as_view(),
+        {"file_format": "jsonl"},
+        name="order-export-jsonl",
+    ),
 ]
@@ -0,0 +1,153 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from config.batching import chunks
+from products.models import Product
+from analytics.utils import retract_orders
+from .models import Order, OrderItem
+
+
+def order_etag(order):
+    return f'"order-{order.pk}-{order.status}-{order.version}"'
+
+
+def order_cache_key(order):
+    """
+    Cache key for a serialized order. The version makes every change land
+    on a new key. The payload is cached with relative media URLs (see
+    absolute_media_urls), so the request's host is not part of it.
+    """
+    return f"orders:detail:{order.pk}:v{order.version}:user{order.user_id}"
+
+
+def absolute_media_urls(data, request):
+    """
+    Make the product image URLs of a serialized order absolute for request,
+    as serializing with the request in context would have
+    """
+    for item in data["items"]:
+        product = item["product"]
+        for field in ("image", "image_url"):
+            if product[field] and product[field].startswith(settings.MEDIA_URL):
+                product[field] = request.build_absolute_uri(product[field])
+    return data
+
+
+def order_cache_timeout(order):
+    if order.is_final:
+        return settings.FINAL_ORDER_CACHE_TIMEOUT
+    return settings.ORDER_CACHE_TIMEOUT
+
+
+def restore_stock(order_ids):
+    """
+    Put the items of the given orders back into inventory: one aggregate
+    query per chunk of orders and one UPDATE per chunk of products
+    """
+    quantities = defaultdict(int)
+    for chunk in chunks(order_ids):
+        rows = (
+            OrderItem.objects.filter(order_id__in=chunk)
+            .values("product_id")
+            .annotate(total=Sum("quantity"))
+            .order_by()
+        )
+        for row in rows:
+            quantities[row["product_id"]] += row["total"]
+
+    for chunk in chunks(quantities.items()):
+        Product.objects.filter(id__in=[product_id for product_id, _ in chunk]).update(
+            inventory_count=F("inventory_count")
+            + Case(
+                *[
+                    When(id=product_id, then=Value(quantity))
+                    for product_id, quantity in chunk
+                ],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+
+
+def _current_statuses(order_ids):
+    """{id: status} of the given orders, locked where the database can"""
+    current = {}
+    for chunk in chunks(order_ids):
+        current.update(
+            Order.objects.select_for_update()
+            .filter(id__in=chunk)
+            .values_list("id", "status")
+            .order_by()
+        )
+    return current
+
+
+def _move(order_ids, status, new_status):
+    return Order.objects.filter(id__in=order_ids, status=status).update(
+        status=new_status, version=F("version") + 1
+    )
+
+
+def transition_orders(order_ids, new_status):
+    """
+    Move many orders to new_status at once.
+
+    Orders are grouped by their current status and each group is moved with
+    a single UPDATE guarded by that status, so the state machine is enforced
+    in SQL. Cancelling restores stock and retracts the sales rollups of the
+    orders that were actually moved.
+
+    Returns (updated_ids, failures) where failures maps a reason to the
+    offending order ids: "not_found" lists unknown ids, "illegal_transition"
+    maps each current status to the ids stuck in it and "conflict" lists ids
+    whose status changed while they were being moved.
+    """
+    order_ids = list(dict.fromkeys(order_ids))
+    updated = []
+    illegal = defaultdict(list)
+    conflicts = []
+
+    with transaction.atomic():
+        current = _current_statuses(order_ids)
+
+        movable = defaultdict(list)
+        for order_id in order_ids:
+            status = current.get(order_id)
+            if status is None:
+                continue
+            if new_status in Order.ALLOWED_TRANSITIONS.get(status, set()):
+                movable[status].append(order_id)
+            else:
+                illegal[status].append(order_id)
+
+        for status, ids in movable.items():
+            for chunk in chunks(ids):
+                savepoint = transaction.savepoint()
+                if _move(chunk, status, new_status) == len(chunk):
+                    transaction.savepoint_commit(savepoint)
+                    updated.extend(chunk)
+                    continue
+                # Some orders changed after they were read (SQLite has no
+                # row locks). Undo the chunk and move its orders one by one
+                # to learn which of them this call moved.
+                transaction.savepoint_rollback(savepoint)
+                for order_id in chunk:
+                    if _move([order_id], status, new_status):
+                        updated.append(order_id)
+                    else:
+                        conflicts.append(order_id)
+
+        if new_status == "cancelled" and updated:
+            restore_stock(updated)
+            retract_orders(updated)
+
+    failures = {}
+    not_found = [order_id for order_id in order_ids if order_id not in current]
+    if not_found:
+        failures["not_found"] = not_found
+    if illegal:
+        failures["illegal_transition"] = dict(illegal)
+    if conflicts:
+        failures["conflict"] = conflicts
+    return updated, failures
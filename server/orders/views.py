@@ -1,11 +1,27 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils.http import parse_etags
 from .models import Order, OrderItem
 from cart.models import Cart
 from products.models import Product
-from .serializers import OrderSerializer
-
+from .serializers import OrderSerializer, BulkStatusSerializer
+from .utils import (
+    transition_orders,
+    order_etag,
+    absolute_media_urls,
+    order_cache_key,
+    order_cache_timeout,
+)
+from .exports import EXPORT_FORMATS, iter_order_lines, parse_export_filters
+from analytics.utils import record_order
+from products.popularity import record
+from monitoring.metrics import record_checkout, record_oversell_prevented
 
 # Create your views here.
 
@@ -13,6 +29,7 @@ from .serializers import OrderSerializer
 class OrderListCreateView(generics.ListCreateAPIView):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
     def get_queryset(self):
         return Order.objects.filter(user=self.request.user)
@@ -25,11 +42,13 @@ class OrderListCreateView(generics.ListCreateAPIView):
         try:
             cart = Cart.objects.get(user=user)
         except Cart.DoesNotExist:
+            record_checkout("empty_cart")
             return Response(
                 {"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST
             )
 
         if not cart.items.exists():
+            record_checkout("empty_cart")
             return Response(
                 {"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST
             )
@@ -42,22 +61,25 @@ class OrderListCreateView(generics.ListCreateAPIView):
         )
 
         total_price = 0
+        purchased = []
 
         for item in cart.items.all():
             product = item.product
 
-            # Stock check
-            if product.inventory_count < item.quantity:
+            # Deduct stock, unless another checkout took it first. A single
+            # UPDATE leaves the popularity counters and product caches alone
+            deducted = Product.objects.filter(
+                pk=product.pk, inventory_count__gte=item.quantity
+            ).update(inventory_count=F("inventory_count") - item.quantity)
+            if not deducted:
                 transaction.set_rollback(True)
+                record_checkout("out_of_stock")
+                record_oversell_prevented("checkout")
                 return Response(
                     {"error": f"Not enough stock for {product.title}"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Deduct stock
-            product.inventory_count -= item.quantity
-            product.save()
-
             # Create order item
             OrderItem.objects.create(
                 order=order,
@@ -66,21 +88,126 @@ class OrderListCreateView(generics.ListCreateAPIView):
                 price=product.price,
             )
             total_price += product.price * item.quantity
+            purchased.append(product.id)
 
         # Update order total
         order.total_price = total_price
         order.save()
 
+        # Add the sale to the reporting rollups
+        record_order(order)
+
         # Clear cart
         cart.items.all().delete()
+        transaction.on_commit(lambda: record_checkout("success"))
+        transaction.on_commit(lambda: record_purchases(purchased))
 
         serializer = self.get_serializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+def record_purchases(product_ids):
+    for product_id in product_ids:
+        record(product_id, "purchase")
+
+
 class OrderDetailView(generics.RetrieveAPIView):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
     def get_queryset(self):
         return Order.objects.filter(user=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Check the order's status and version with one narrow query, then
+        answer 304 if the client already has this version, or serve the
+        serialized order from cache when possible
+        """
+        order = generics.get_object_or_404(
+            self.get_queryset().only("id", "user_id", "status", "version"),
+            pk=kwargs["pk"],
+        )
+        if self._client_has(request, order):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=self._headers(order)
+            )
+
+        data = cache.get(order_cache_key(order))
+        if data is None:
+            order = generics.get_object_or_404(
+                self.get_queryset().prefetch_related("items__product"),
+                pk=kwargs["pk"],
+            )
+            # Without the request, media URLs stay relative to any host
+            data = self.get_serializer_class()(order).data
+            cache.set(order_cache_key(order), data, order_cache_timeout(order))
+
+        return Response(
+            absolute_media_urls(data, request), headers=self._headers(order)
+        )
+
+    def _client_has(self, request, order):
+        # Weak comparison: compressed responses carry the ETag as W/"..."
+        etags = {
+            etag.removeprefix("W/")
+            for etag in parse_etags(request.headers.get("If-None-Match", ""))
+        }
+        return "*" in etags or order_etag(order) in etags
+
+    def _headers(self, order):
+        if order.is_final:
+            cache_control = f"private, max-age={settings.FINAL_ORDER_CACHE_TIMEOUT}"
+        else:
+            cache_control = "private, no-cache"
+        return {"ETag": order_etag(order), "Cache-Control": cache_control}
+
+
+class OrderBulkStatusView(generics.GenericAPIView):
+    """
+    Move many orders to a new status in one request (staff only).
+    Orders whose current status does not allow the change are reported
+    back, grouped by reason, and left untouched.
+    """
+
+    serializer_class = BulkStatusSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        new_status = serializer.validated_data["status"]
+        updated, failures = transition_orders(
+            serializer.validated_data["ids"], new_status
+        )
+        return Response(
+            {"status": new_status, "updated": len(updated), "failed": failures}
+        )
+
+
+class OrderExportView(APIView):
+    """
+    Stream every order line matching ?since=&until=&status= as CSV or
+    JSON Lines (staff only). Rows are written as they are read, so the
+    export size is not limited by server memory.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, file_format, *args, **kwargs):
+        filters, error = parse_export_filters(
+            since=request.query_params.get("since"),
+            until=request.query_params.get("until"),
+            status=request.query_params.get("status"),
+        )
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        writer, content_type = EXPORT_FORMATS[file_format]
+        response = StreamingHttpResponse(
+            writer(iter_order_lines(**filters)), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="orders.{file_format}"'
+        return response
@@ -0,0 +1,153 @@
+"""
+Async (ASGI-native) versions of the catalog read endpoints.
+
+They return the same JSON as ProductViewSet's list, retrieve and
+list_categories actions, but query through Django's async ORM, so under an
+ASGI server a request waiting on the database does not hold a worker
+thread. Filtering, search and the active-product rules come from
+ProductViewSet itself; only pagination and database access are redone here.
+"""
+
+import math
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from config.caching import aget_or_set, aversioned_key
+from config.renderers import dumps
+from config.routers import replica_reads
+from users.authentication import AsyncJWTAuthentication, authenticate_async
+from .models import Product
+from .pagination import acached_count, count_is_cacheable
+from .popularity import arecord
+from .views import ProductViewSet
+
+
+def api_response(data, status=200):
+    """JSON rendered byte-for-byte like the DRF views"""
+    return HttpResponse(dumps(data), status=status, content_type="application/json")
+
+
+def api_error(exc):
+    """Render an APIException the way DRF's exception handler does"""
+    if isinstance(exc, Http404):
+        exc = exceptions.NotFound(*exc.args)
+    detail = exc.detail
+    if not isinstance(detail, (dict, list)):
+        detail = {"detail": detail}
+    response = api_response(detail, status=exc.status_code)
+    if exc.status_code == 401:
+        response["WWW-Authenticate"] = AsyncJWTAuthentication().authenticate_header(
+            request=None
+        )
+    return response
+
+
+def catalog_view(request, action):
+    """ProductViewSet bound to this request, for its queryset and filters"""
+    drf_request = Request(request)
+    drf_request.user = request.user
+    view = ProductViewSet(
+        action=action, request=drf_request, format_kwarg=None, args=(), kwargs={}
+    )
+    view.headers = {}
+    return view
+
+
+async def paginate(view, queryset):
+    """Async equivalent of PageNumberPagination.get_paginated_response"""
+    request = view.request
+    page_size = api_settings.PAGE_SIZE
+    if count_is_cacheable(request.query_params):
+        count = await acached_count(queryset)
+    else:
+        count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+
+    page_number = request.query_params.get("page", 1)
+    if page_number == "last":
+        page_number = num_pages
+    try:
+        page_number = int(page_number)
+    except (TypeError, ValueError):
+        page_number = 0
+    if not 1 <= page_number <= num_pages:
+        raise exceptions.NotFound("Invalid page.")
+
+    offset = (page_number - 1) * page_size
+    products = [product async for product in queryset[offset : offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_url = previous_url = None
+    if page_number < num_pages:
+        next_url = replace_query_param(url, "page", page_number + 1)
+    if page_number > 1:
+        previous_url = (
+            remove_query_param(url, "page")
+            if page_number == 2
+            else replace_query_param(url, "page", page_number - 1)
+        )
+    return {
+        "count": count,
+        "next": next_url,
+        "previous": previous_url,
+        "results": view.get_serializer(products, many=True).data,
+    }
+
+
+@replica_reads
+@require_safe
+async def product_list(request):
+    try:
+        await authenticate_async(request)
+        view = catalog_view(request, "list")
+        data = await paginate(view, view.filter_queryset(view.get_queryset()))
+    except exceptions.APIException as exc:
+        return api_error(exc)
+    return api_response(data)
+
+
+@replica_reads
+@require_safe
+async def product_detail(request, pk):
+    try:
+        await authenticate_async(request)
+        view = catalog_view(request, "retrieve")
+        product = await view.filter_queryset(view.get_queryset()).filter(pk=pk).afirst()
+        if product is None:
+            raise Http404("No Product matches the given query.")
+    except (exceptions.APIException, Http404) as exc:
+        return api_error(exc)
+    await arecord(product.pk, "view")
+    return api_response(view.get_serializer(product).data)
+
+
+@replica_reads
+@require_safe
+async def product_categories(request):
+    try:
+        await authenticate_async(request)
+    except exceptions.APIException as exc:
+        return api_error(exc)
+
+    async def categories():
+        queryset = (
+            Product.objects.values_list("category", flat=True)
+            .distinct()
+            .exclude(category="")
+        )
+        return [category async for category in queryset]
+
+    return api_response(
+        {
+            "categories": await aget_or_set(
+                await aversioned_key("products", "categories"),
+                categories,
+                settings.CATEGORY_CACHE_TIMEOUT,
+                name="products:categories",
+            )
+        }
+    )
@@ -0,0 +1,482 @@
+"""
+Deterministic synthetic data for benchmarks and query-plan tests.
+
+Rows are generated in fixed-size blocks, each from its own RNG seeded with
+(seed, kind, block number), so the same seed and counts always produce the
+same data no matter how many worker processes insert it.
+"""
+
+import random
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderItem
+from .models import Product
+
+User = get_user_model()
+
+BLOCK_SIZE = 1000
+USER_EMAIL_DOMAIN = "generated.example.com"
+USER_PASSWORD = "generated-pass-123"
+
+# (category, typical price, nouns) - categories are drawn with a Zipf skew
+# in this order, so Electronics is the largest and Pet Supplies the smallest
+CATEGORIES = [
+    ("Electronics", 250, ["Headphones", "Speaker", "Laptop", "Monitor", "Camera"]),
+    ("Clothing", 35, ["T-shirt", "Jacket", "Hoodie", "Jeans", "Dress"]),
+    ("Home & Garden", 60, ["Lamp", "Planter", "Rug", "Cushion", "Vase"]),
+    ("Books", 18, ["Novel", "Cookbook", "Biography", "Atlas", "Guide"]),
+    ("Sports", 55, ["Yoga Mat", "Dumbbell", "Racket", "Football", "Bike Helmet"]),
+    ("Beauty", 25, ["Serum", "Lipstick", "Moisturiser", "Perfume", "Shampoo"]),
+    ("Toys", 30, ["Puzzle", "Robot Kit", "Doll", "Board Game", "Building Set"]),
+    ("Home Appliances", 120, ["Blender", "Kettle", "Toaster", "Air Fryer", "Vacuum"]),
+    ("Furniture", 300, ["Desk", "Office Chair", "Bookshelf", "Sofa", "Bed Frame"]),
+    ("Wearables", 180, ["Smartwatch", "Fitness Tracker", "Smart Ring", "Earbuds"]),
+    ("Office", 25, ["Notebook", "Pen Set", "Desk Organiser", "Stapler", "Planner"]),
+    ("Pet Supplies", 22, ["Dog Bed", "Cat Tree", "Leash", "Pet Bowl", "Chew Toy"]),
+]
+ADJECTIVES = [
+    "Classic",
+    "Premium",
+    "Compact",
+    "Wireless",
+    "Portable",
+    "Ergonomic",
+    "Eco",
+    "Deluxe",
+    "Smart",
+    "Vintage",
+    "Ultra",
+    "Essential",
+    "Pro",
+    "Mini",
+]
+FEATURES = [
+    "long battery life",
+    "a durable build",
+    "a lightweight design",
+    "fast charging",
+    "water resistance",
+    "soft-touch materials",
+    "a two-year warranty",
+    "easy assembly",
+    "recycled packaging",
+    "a minimalist look",
+    "adjustable settings",
+    "premium finish",
+]
+
+
+class ZipfSampler:
+    """
+    Draws indexes in [0, n) with probability proportional to 1 / rank^s.
+    When shuffle_seed is given, ranks are mapped to a fixed random
+    permutation so popularity is not correlated with insertion order.
+    """
+
+    def __init__(self, n, s=1.1, shuffle_seed=None):
+        self.cumulative = array(
+            "d", accumulate(1 / rank**s for rank in range(1, n + 1))
+        )
+        self.total = self.cumulative[-1] if n else 0.0
+        self.order = None
+        if shuffle_seed is not None:
+            self.order = array("l", range(n))
+            random.Random(shuffle_seed).shuffle(self.order)
+
+    def sample(self, rng):
+        rank = min(
+            bisect_left(self.cumulative, rng.random() * self.total),
+            len(self.cumulative) - 1,
+        )
+        return self.order[rank] if self.order is not None else rank
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we generate"""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(
+                field, "auto_now_add", False
+            ):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _rng(seed, kind, block):
+    return random.Random(f"{seed}:{kind}:{block}")
+
+
+def _blocks(count):
+    return [
+        (block, min(BLOCK_SIZE, count - block * BLOCK_SIZE))
+        for block in range((count + BLOCK_SIZE - 1) // BLOCK_SIZE)
+    ]
+
+
+def _timestamp(rng, now, days):
+    return now - timedelta(seconds=rng.random() * days * 86400)
+
+
+# Worker state, set once per process (see _init_worker)
+_state = {}
+
+
+def _init_worker(state):
+    django.setup()
+    _state.update(state)
+
+
+def _product_block(args):
+    block, size = args
+    seed, now, days = _state["seed"], _state["now"], _state["days"]
+    rng = _rng(seed, "products", block)
+    categories = _state["category_sampler"]
+    products = []
+    for i in range(size):
+        number = block * BLOCK_SIZE + i
+        category, base_price, nouns = CATEGORIES[categories.sample(rng)]
+        noun = rng.choice(nouns)
+        adjective = rng.choice(ADJECTIVES)
+        created_at = _timestamp(rng, now, days)
+        price = Decimal(
+            str(round(max(1.0, rng.lognormvariate(0, 0.5) * base_price), 2))
+        )
+        features = rng.sample(FEATURES, 2)
+        products.append(
+            Product(
+                title=f"{adjective} {noun} {number}",
+                description=(
+                    f"{adjective} {noun.lower()} from our {category.lower()} range "
+                    f"with {features[0]} and {features[1]}."
+                ),
+                price=price,
+                inventory_count=0 if rng.random() < 0.05 else rng.randint(1, 500),
+                category=category,
+                image_url=f"https://picsum.photos/seed/product{number}/500/500",
+                created_at=created_at,
+                updated_at=created_at,
+                is_active=rng.random() >= 0.02,
+            )
+        )
+    return products
+
+
+def _insert_products(products):
+    with explicit_timestamps(Product):
+        Product.objects.bulk_create(products, batch_size=_state["batch_size"])
+    return len(products)
+
+
+def _user_block(args):
+    block, size = args
+    seed, now, days = _state["seed"], _state["now"], _state["days"]
+    rng = _rng(seed, "users", block)
+    users = []
+    for i in range(size):
+        number = block * BLOCK_SIZE + i
+        users.append(
+            User(
+                email=f"user{number}@{USER_EMAIL_DOMAIN}",
+                username=f"user{number}",
+                first_name=rng.choice(
+                    [
+                        "Ada",
+                        "Chidi",
+                        "Grace",
+                        "Tunde",
+                        "Amara",
+                        "Kofi",
+                        "Zainab",
+                        "Emeka",
+                    ]
+                ),
+                last_name=rng.choice(
+                    ["Okafor", "Adeyemi", "Mensah", "Balogun", "Eze", "Bello", "Nwosu"]
+                ),
+                password=_state["password"],
+                date_joined=_timestamp(rng, now, days),
+            )
+        )
+    return users
+
+
+def _insert_users(users):
+    User.objects.bulk_create(users, batch_size=_state["batch_size"])
+    return len(users)
+
+
+def _pick_products(rng, count):
+    """Distinct product positions for one order or cart, by popularity"""
+    sampler = _state["product_sampler"]
+    picked = []
+    while len(picked) < count:
+        position = sampler.sample(rng)
+        if position not in picked:
+            picked.append(position)
+    return picked
+
+
+def _basket_size(rng, limit):
+    """1 item most of the time, geometrically fewer larger baskets"""
+    size = 1
+    while size < limit and rng.random() < 0.45:
+        size += 1
+    return size
+
+
+def _order_status(rng, age):
+    roll = rng.random()
+    if age > timedelta(days=14):
+        return "cancelled" if roll < 0.08 else "shipped" if roll < 0.1 else "delivered"
+    if roll < 0.3:
+        return "pending"
+    if roll < 0.55:
+        return "paid"
+    if roll < 0.8:
+        return "shipped"
+    return "delivered" if roll < 0.95 else "cancelled"
+
+
+def _order_block(args):
+    block, size = args
+    seed, now, days = _state["seed"], _state["now"], _state["days"]
+    rng = _rng(seed, "orders", block)
+    product_ids, prices, user_ids = (
+        _state["product_ids"],
+        _state["prices"],
+        _state["user_ids"],
+    )
+    buyers = _state["buyer_sampler"]
+    limit = min(8, len(product_ids))
+
+    orders, baskets = [], []
+    for _ in range(size):
+        created_at = _timestamp(rng, now, days)
+        basket = [
+            (position, rng.choices((1, 2, 3), (80, 15, 5))[0])
+            for position in _pick_products(rng, _basket_size(rng, limit))
+        ]
+        total = sum(prices[position] * quantity for position, quantity in basket)
+        orders.append(
+            Order(
+                user_id=user_ids[buyers.sample(rng)],
+                created_at=created_at,
+                total_price=Decimal(total) / 100,
+                status=_order_status(rng, now - created_at),
+                shipping_address=f"{rng.randint(1, 999)} Market Road, Lagos",
+            )
+        )
+        baskets.append(basket)
+    return orders, baskets
+
+
+def _insert_orders(rows):
+    orders, baskets = rows
+    product_ids, prices = _state["product_ids"], _state["prices"]
+    with explicit_timestamps(Order):
+        Order.objects.bulk_create(orders, batch_size=_state["batch_size"])
+    OrderItem.objects.bulk_create(
+        [
+            OrderItem(
+                order_id=order.id,
+                product_id=product_ids[position],
+                quantity=quantity,
+                price=Decimal(prices[position]) / 100,
+            )
+            for order, basket in zip(orders, baskets)
+            for position, quantity in basket
+        ],
+        batch_size=_state["batch_size"],
+    )
+    return len(orders)
+
+
+def _cart_block(args):
+    block, size = args
+    seed, now = _state["seed"], _state["now"]
+    rng = _rng(seed, "carts", block)
+    owners = _state["cart_owners"]
+    limit = min(5, len(_state["product_ids"]))
+
+    carts, baskets = [], []
+    for i in range(size):
+        created_at = _timestamp(rng, now, 30)
+        carts.append(
+            Cart(
+                user_id=owners[block * BLOCK_SIZE + i],
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+        baskets.append(
+            [
+                (position, rng.randint(1, 3))
+                for position in _pick_products(rng, _basket_size(rng, limit))
+            ]
+        )
+    return carts, baskets
+
+
+def _insert_carts(rows):
+    carts, baskets = rows
+    product_ids = _state["product_ids"]
+    with explicit_timestamps(Cart, CartItem):
+        Cart.objects.bulk_create(carts, batch_size=_state["batch_size"])
+        CartItem.objects.bulk_create(
+            [
+                CartItem(
+                    cart_id=cart.id,
+                    product_id=product_ids[position],
+                    quantity=quantity,
+                    created_at=cart.created_at,
+                    updated_at=cart.created_at,
+                )
+                for cart, basket in zip(carts, baskets)
+                for position, quantity in basket
+            ],
+            batch_size=_state["batch_size"],
+        )
+    return len(carts)
+
+
+def _run(build, insert, count, workers, state, progress):
+    """
+    Build blocks of rows, in worker processes when workers > 1, and insert
+    them here in block order so primary keys come out the same every run
+    """
+    _state.update(state)
+    blocks = _blocks(count)
+    if workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(state,)
+        ) as pool:
+            for rows in pool.map(build, blocks):
+                progress(insert(rows))
+    else:
+        for args in blocks:
+            progress(insert(build(args)))
+
+
+def flush_generated_data():
+    """Remove orders, carts, products and generated users"""
+    OrderItem.objects.all().delete()
+    Order.objects.all().delete()
+    Cart.objects.all().delete()
+    Product.objects.all().delete()
+    User.objects.filter(email__endswith=f"@{USER_EMAIL_DOMAIN}").delete()
+
+
+def generate(
+    products=10000,
+    users=2000,
+    orders=20000,
+    carts=500,
+    seed=42,
+    days=365,
+    workers=1,
+    batch_size=1000,
+    end_date=None,
+    log=print,
+):
+    """
+    Generate a catalog, users, open carts and an order history.
+
+    Categories and product popularity follow Zipf-like distributions,
+    order sizes are mostly single items with a geometric tail, and older
+    orders are mostly delivered. Timestamps fall in the `days` days before
+    midnight at the end of end_date (default: today), so a fixed seed and
+    end date reproduce the data exactly. Returns the row counts per kind.
+    """
+    end_date = end_date or timezone.localdate()
+    state = {
+        "seed": seed,
+        "now": datetime.combine(
+            end_date + timedelta(days=1),
+            time.min,
+            tzinfo=timezone.get_current_timezone(),
+        ),
+        "days": days,
+        "batch_size": batch_size,
+        "category_sampler": ZipfSampler(len(CATEGORIES), s=1.0),
+        "password": make_password(USER_PASSWORD),
+    }
+
+    def progress(label, total):
+        done = [0]
+
+        def report(count):
+            done[0] += count
+            if done[0] == total or done[0] % (BLOCK_SIZE * 10) == 0:
+                log(f"  {label}: {done[0]}/{total}")
+
+        return report
+
+    log(f"Generating {products} products...")
+    _run(
+        _product_block,
+        _insert_products,
+        products,
+        workers,
+        state,
+        progress("products", products),
+    )
+    log(f"Generating {users} users...")
+    _run(_user_block, _insert_users, users, workers, state, progress("users", users))
+
+    catalog = (
+        Product.objects.filter(is_active=True).order_by("id").values_list("id", "price")
+    )
+    state["product_ids"] = array("q")
+    state["prices"] = array("q")
+    for product_id, price in catalog.iterator(chunk_size=10000):
+        state["product_ids"].append(product_id)
+        state["prices"].append(int(price * 100))
+    state["user_ids"] = array(
+        "q",
+        User.objects.filter(email__endswith=f"@{USER_EMAIL_DOMAIN}")
+        .order_by("id")
+        .values_list("id", flat=True),
+    )
+
+    if not state["product_ids"] or not state["user_ids"]:
+        log("No active products or generated users; skipping carts and orders")
+        return {"products": products, "users": users, "orders": 0, "carts": 0}
+
+    state["product_sampler"] = ZipfSampler(
+        len(state["product_ids"]), s=1.07, shuffle_seed=f"{seed}:popularity"
+    )
+    state["buyer_sampler"] = ZipfSampler(
+        len(state["user_ids"]), s=0.8, shuffle_seed=f"{seed}:buyers"
+    )
+    carts = min(carts, len(state["user_ids"]))
+    owners = array("q", state["user_ids"])
+    random.Random(f"{seed}:cart-owners").shuffle(owners)
+    state["cart_owners"] = owners[:carts]
+
+    log(f"Generating {orders} orders...")
+    _run(
+        _order_block, _insert_orders, orders, workers, state, progress("orders", orders)
+    )
+    log(f"Generating {carts} carts...")
+    _run(_cart_block, _insert_carts, carts, workers, state, progress("carts", carts))
+
+    return {"products": products, "users": users, "orders": orders, "carts": carts}
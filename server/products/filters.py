@@ -0,0 +1,45 @@
+import django_filters
+from rest_framework import filters
+from .models import Product
+
+
+class ProductFilter(django_filters.FilterSet):
+    """Catalog filters; price and stock are served by the Product indexes"""
+
+    min_price = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
+    max_price = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
+    in_stock = django_filters.BooleanFilter(method="filter_in_stock")
+
+    class Meta:
+        model = Product
+        fields = ["category", "min_price", "max_price", "in_stock"]
+
+    def filter_in_stock(self, queryset, name, value):
+        if value:
+            return queryset.filter(inventory_count__gt=0)
+        return queryset.filter(inventory_count=0)
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that breaks ties by newest first, then by id, so products
+    with an equal sort key (e.g. popularity 0) do not move between pages.
+    The product_active_* indexes match these orderings.
+    """
+
+    # Friendlier names accepted in ?ordering=
+    aliases = {"newest": "-created_at", "oldest": "created_at"}
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        fields = [self.aliases.get(field, field) for field in fields]
+        return super().remove_invalid_fields(queryset, fields, view, request)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering:
+            fields = {field.lstrip("-") for field in ordering}
+            ordering = [
+                *ordering,
+                *[field for field in ("-created_at", "-id") if field[1:] not in fields],
+            ]
+        return ordering
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from products.recommendations import build_related_products
+
+
+class Command(BaseCommand):
+    help = (
+        'Update the "frequently bought together" products with the orders '
+        "placed since the last run"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recount every order and rebuild all related products",
+        )
+        parser.add_argument(
+            "--batch-orders",
+            type=int,
+            default=10000,
+            help="Orders read per query (default: 10000)",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_orders"] < 1:
+            raise CommandError("--batch-orders must be at least 1")
+
+        counts = build_related_products(
+            full=options["full"], batch_orders=options["batch_orders"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Counted {counts['orders']} order(s); stored {counts['pairs']} "
+                f"related product(s) for {counts['products']} product(s)"
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from products.similarity import build_similar_products
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the similar products of the products saved since the last run "
+        "and of the products whose lists they change"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-read every product and rebuild all similar products",
+        )
+
+    def handle(self, *args, **options):
+        counts = build_similar_products(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {counts['products']} product(s): {counts['changed']} "
+                f"changed, {counts['removed']} removed; updated similar products "
+                f"of {counts['updated']}"
+            )
+        )
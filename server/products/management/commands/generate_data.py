@@ -0,0 +1,116 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from analytics.utils import rebuild_rollups
+from products.datagen import USER_EMAIL_DOMAIN, flush_generated_data, generate
+
+User = get_user_model()
+
+DEMO_ACCOUNTS = [
+    (
+        "admin@kenkeputa.com",
+        "admin123",
+        {"is_staff": True, "is_superuser": True, "is_admin": True},
+    ),
+    ("customer@kenkeputa.com", "customer123", {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic, production-scale dataset of products, "
+        "users, carts and orders for benchmarks and query-plan tests"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10000)
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--orders", type=int, default=20000)
+        parser.add_argument("--carts", type=int, default=500)
+        parser.add_argument(
+            "--seed", type=int, default=42, help="Random seed (default: 42)"
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Days of order history"
+        )
+        parser.add_argument(
+            "--end-date",
+            help="Last day of generated history, YYYY-MM-DD (default: today)",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Worker processes generating rows"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per INSERT"
+        )
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete existing orders, carts, products and generated users first",
+        )
+        parser.add_argument(
+            "--skip-rollups",
+            action="store_true",
+            help="Do not rebuild the sales rollups",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("products", "users", "orders", "carts"):
+            if options[name] < 0:
+                raise CommandError(f"--{name} must not be negative")
+        if options["workers"] < 1 or options["batch_size"] < 1 or options["days"] < 1:
+            raise CommandError("--workers, --batch-size and --days must be at least 1")
+
+        end_date = None
+        if options["end_date"]:
+            end_date = parse_date(options["end_date"])
+            if end_date is None:
+                raise CommandError("--end-date must be a date in YYYY-MM-DD format")
+
+        if options["flush"]:
+            self.stdout.write("Deleting existing data...")
+            flush_generated_data()
+        elif User.objects.filter(email__endswith=f"@{USER_EMAIL_DOMAIN}").exists():
+            raise CommandError(
+                "Generated data already exists; rerun with --flush to replace it"
+            )
+
+        self.create_demo_accounts()
+
+        started = time.perf_counter()
+        counts = generate(
+            products=options["products"],
+            users=options["users"],
+            orders=options["orders"],
+            carts=options["carts"],
+            seed=options["seed"],
+            days=options["days"],
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            end_date=end_date,
+            log=self.stdout.write,
+        )
+
+        if counts["orders"] and not options["skip_rollups"]:
+            self.stdout.write("Rebuilding sales rollups...")
+            rebuild_rollups()
+
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {summary} in {time.perf_counter() - started:.1f}s"
+            )
+        )
+
+    def create_demo_accounts(self):
+        for email, password, extra in DEMO_ACCOUNTS:
+            if not User.objects.filter(email=email).exists():
+                User.objects.create_user(
+                    email=email,
+                    password=password,
+                    first_name="Demo",
+                    last_name=email.split("@")[0].title(),
+                    **extra,
+                )
+                self.stdout.write(f"Created demo account {email} / {password}")
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from config.storage import content_addressed_fields, rehash_field
+
+
+class Command(BaseCommand):
+    help = (
+        "Move uploaded media to content-addressed names, in batches of rows, "
+        "and update the rows that point at them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows read per query (default: 500)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the files that would be moved",
+        )
+        parser.add_argument(
+            "--delete-originals",
+            action="store_true",
+            help="Delete the old files once every row has been moved off them",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        replaced = []
+        for model, field in content_addressed_fields():
+            counts, names = rehash_field(
+                model,
+                field,
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+            replaced.extend((field.storage, name) for name in names)
+            self.stdout.write(
+                f"{model._meta.label}.{field.name}: {counts['rehashed']} rehashed, "
+                f"{counts['hashed']} already hashed, {counts['missing']} missing"
+            )
+
+        if options["delete_originals"] and not options["dry_run"]:
+            for storage, name in replaced:
+                storage.delete(name)
+            self.stdout.write(
+                self.style.SUCCESS(f"Deleted {len(replaced)} original file(s)")
+            )
+        if options["dry_run"]:
+            self.stdout.write("Dry run: nothing was changed")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_product_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="cart_add_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="popularity",
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="purchase_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="view_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
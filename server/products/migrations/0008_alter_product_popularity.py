@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0007_product_catalog_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="product",
+            name="popularity",
+            field=models.FloatField(default=0),
+        ),
+    ]
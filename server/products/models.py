@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 
 
 class Product(models.Model):
@@ -12,11 +13,115 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Written in batches by products.popularity, never by the request itself
+    view_count = models.PositiveBigIntegerField(default=0)
+    cart_add_count = models.PositiveBigIntegerField(default=0)
+    purchase_count = models.PositiveBigIntegerField(default=0)
+    popularity = models.FloatField(default=0)
+
+    class Meta:
+        # Public catalog pages (is_active only) are sorted by one of these
+        # keys, newest first among equals (see StableOrderingFilter), so a
+        # page is read off an index instead of sorting every product. The
+        # price index also serves min_price/max_price.
+        indexes = [
+            models.Index(
+                fields=["price", "-created_at", "-id"],
+                name="product_active_price",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="product_active_created",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["-popularity", "-created_at", "-id"],
+                name="product_active_popularity",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["title", "-created_at", "-id"],
+                name="product_active_title",
+                condition=Q(is_active=True),
+            ),
+        ]
+
+    # Only ever incremented in the database (see products.popularity)
+    COUNTER_FIELDS = ("view_count", "cart_add_count", "purchase_count", "popularity")
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # A full save of an existing product would write back the counters
+        # as they were loaded, losing any flush in between
+        full_update = not (
+            self._state.adding or args or kwargs.get("force_insert")
+        ) and kwargs.get("update_fields") is None
+        if full_update:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def name(self):
         """Alias for title to maintain compatibility with existing code"""
         return self.title
+
+
+class RelatedProduct(models.Model):
+    """
+    "Frequently bought together": the top products bought in the same
+    orders as product, best first. Rebuilt by products.recommendations.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="related_products"
+    )
+    related = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    # Orders containing both products, and that count normalized by how
+    # often each is bought at all (cosine similarity)
+    orders = models.PositiveIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "rank"], name="unique_related_product_rank"
+            )
+        ]
+        ordering = ["product", "rank"]
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class SimilarProduct(models.Model):
+    """
+    Products whose title, description and category read most like
+    product's, best first. Rebuilt by products.similarity.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="similar_products"
+    )
+    similar = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    # Cosine similarity of the two products' TF-IDF vectors
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "rank"], name="unique_similar_product_rank"
+            )
+        ]
+        ordering = ["product", "rank"]
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.similar_id} ({self.score:.3f})"
@@ -0,0 +1,67 @@
+"""
+Catalog pagination with cached counts.
+
+A sorted catalog page is an index range scan, but the page count needs
+COUNT(*) over every matching product, which grows with the catalog. Counts
+are cached per filtered query in the "products" namespace, so saving or
+deleting a product refreshes them at once; stock changes from carts and
+orders show up within CATALOG_COUNT_CACHE_TIMEOUT. Only filters with few
+distinct values (category, stock, ordering) are cached: a search term or
+price bound is rarely repeated, and would fill the cache with one-off
+entries.
+"""
+
+import hashlib
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
+from config.caching import aget_or_set, aversioned_key, get_or_set, versioned_key
+
+
+UNCACHED_PARAMS = (api_settings.SEARCH_PARAM, "min_price", "max_price")
+
+
+def count_is_cacheable(query_params):
+    return not any(query_params.get(param) for param in UNCACHED_PARAMS)
+
+
+def _query_digest(queryset):
+    # Neither ordering nor selected annotations (e.g. the per-user
+    # is_wishlisted) change the count, so they all share one entry
+    query = queryset.order_by().values("pk").query
+    return hashlib.sha256(str(query).encode()).hexdigest()[:32]
+
+
+def cached_count(queryset):
+    return get_or_set(
+        versioned_key("products", "count", _query_digest(queryset)),
+        queryset.count,
+        settings.CATALOG_COUNT_CACHE_TIMEOUT,
+        name="products:count",
+    )
+
+
+async def acached_count(queryset):
+    return await aget_or_set(
+        await aversioned_key("products", "count", _query_digest(queryset)),
+        queryset.acount,
+        settings.CATALOG_COUNT_CACHE_TIMEOUT,
+        name="products:count",
+    )
+
+
+class CachedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        return cached_count(self.object_list)
+
+
+class CatalogPagination(PageNumberPagination):
+    django_paginator_class = CachedCountPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not count_is_cacheable(request.query_params):
+            self.django_paginator_class = Paginator
+        return super().paginate_queryset(queryset, request, view)
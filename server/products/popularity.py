@@ -0,0 +1,157 @@
+"""
+Buffered product popularity counters.
+
+Product views, add-to-carts and purchases are counted in memory and written
+at most once per POPULARITY_FLUSH_INTERVAL seconds, in one transaction of
+one UPDATE per POPULARITY_FLUSH_BATCH products that adds the buffered counts
+and recomputes Product.popularity from POPULARITY_WEIGHTS. Reads never write
+to a hot product row themselves.
+
+The flush runs in whichever request records the first event after the
+interval has passed (a background thread would need its own database
+connection in every worker). Gunicorn workers flush what is left when they
+exit (config/gunicorn.py); a crash loses at most one interval's worth.
+"""
+
+import logging
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, models, transaction
+from django.db.models import Case, ExpressionWrapper, F, Value, When
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+# Event name -> Product counter field
+EVENTS = {
+    "view": "view_count",
+    "cart_add": "cart_add_count",
+    "purchase": "purchase_count",
+}
+
+
+class PopularityBuffer:
+    """Per-product event counts waiting to be written, shared by threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counts = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, product_id, event, count=1):
+        """Buffer count events; True when a flush is due"""
+        field = EVENTS[event]
+        with self._lock:
+            counts = self._counts.get(product_id)
+            if counts is None:
+                counts = self._counts[product_id] = dict.fromkeys(EVENTS.values(), 0)
+            counts[field] += count
+        return time.monotonic() - self._last_flush >= settings.POPULARITY_FLUSH_INTERVAL
+
+    def pending(self):
+        with self._lock:
+            return {
+                product_id: dict(counts) for product_id, counts in self._counts.items()
+            }
+
+    def flush(self):
+        """
+        Write everything buffered so far; returns the number of products
+        updated. Concurrent callers return 0 instead of waiting. Counts are
+        put back if the write fails, to be retried by the next flush.
+        """
+        if not self._flush_lock.acquire(blocking=False):
+            return 0
+        try:
+            with self._lock:
+                counts, self._counts = self._counts, {}
+                self._last_flush = time.monotonic()
+            if not counts:
+                return 0
+            try:
+                return self._write(counts)
+            except DatabaseError:
+                logger.exception("Could not flush product popularity counters")
+                self._restore(counts)
+                return 0
+        finally:
+            self._flush_lock.release()
+
+    def _restore(self, counts):
+        with self._lock:
+            for product_id, fields in counts.items():
+                current = self._counts.setdefault(
+                    product_id, dict.fromkeys(EVENTS.values(), 0)
+                )
+                for field, value in fields.items():
+                    current[field] += value
+
+    def _write(self, counts):
+        product_ids = sorted(counts)
+        batch_size = settings.POPULARITY_FLUSH_BATCH
+        updated = 0
+        # All batches or none, so a failed flush can put every count back
+        with transaction.atomic():
+            for start in range(0, len(product_ids), batch_size):
+                batch = product_ids[start : start + batch_size]
+                updated += Product.objects.filter(pk__in=batch).update(
+                    **increments({pk: counts[pk] for pk in batch})
+                )
+        return updated
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._last_flush = time.monotonic()
+
+
+def increments(counts):
+    """
+    UPDATE assignments adding counts ({product id: {field: n}}) to the
+    counters, and the popularity score recomputed from the new totals
+    """
+    totals = {}
+    assignments = {}
+    for field in EVENTS.values():
+        whens = [
+            When(pk=product_id, then=Value(fields[field]))
+            for product_id, fields in counts.items()
+            if fields[field]
+        ]
+        totals[field] = F(field)
+        if whens:
+            totals[field] = assignments[field] = F(field) + Case(
+                *whens, default=Value(0), output_field=models.PositiveBigIntegerField()
+            )
+
+    weights = settings.POPULARITY_WEIGHTS
+    score = sum(
+        (
+            totals[field] * Value(float(weights[event]))
+            for event, field in EVENTS.items()
+        ),
+        Value(0.0),
+    )
+    assignments["popularity"] = ExpressionWrapper(
+        score, output_field=models.FloatField()
+    )
+    return assignments
+
+
+popularity_buffer = PopularityBuffer()
+
+
+def record(product_id, event, count=1):
+    if popularity_buffer.add(product_id, event, count):
+        # Flushing inside the caller's transaction would hold every buffered
+        # product's row lock until it commits, and lose the counts if it
+        # rolled back; flush once it has committed instead
+        transaction.on_commit(popularity_buffer.flush)
+
+
+async def arecord(product_id, event, count=1):
+    if popularity_buffer.add(product_id, event, count):
+        await sync_to_async(popularity_buffer.flush)()
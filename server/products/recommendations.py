@@ -0,0 +1,232 @@
+"""
+"Frequently bought together" recommendations.
+
+The job counts, for every pair of products, the orders containing both:
+the co-occurrence matrix C = XᵀX of the order x product incidence matrix X,
+built with SciPy sparse matrices a batch of orders at a time. Rows and
+columns are product ids, and the diagonal holds each product's order count.
+Pairs are scored by cosine similarity, C[a, b] / sqrt(C[a, a] * C[b, b]),
+so a bestseller bought with everything does not top every list. The best
+RELATED_PRODUCTS_TOP_K per product are stored as RelatedProduct rows, which
+the related endpoint reads with one indexed query.
+
+The matrix is saved to RELATED_PRODUCTS_MATRIX with the ids and creation
+times of the orders counted in the last RELATED_PRODUCTS_ORDER_OVERLAP
+seconds before the newest one. The next run reads the orders created since
+then and adds those it has not counted yet. This way a checkout that
+committed after the previous run, behind orders with higher ids, is still
+counted. The run then rewrites the rows of the products in those orders and
+of their partners, whose scores change with the products' order counts.
+Cancelled orders are skipped, but one cancelled after it was counted stays
+counted until a full rebuild.
+"""
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from config.batching import CHUNK_SIZE, chunks
+from orders.models import Order, OrderItem
+from .models import Product, RelatedProduct
+
+
+NO_ORDERS = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+
+def load_matrix(path):
+    """
+    (co-occurrence matrix, (ids, creation timestamps) of the recently
+    counted orders), or (None, no orders) without a usable saved matrix
+    """
+    path = Path(path)
+    if not path.is_file():
+        return None, NO_ORDERS
+    with np.load(path) as saved:
+        if "recent_ids" not in saved.files:
+            return None, NO_ORDERS  # saved before recent orders were kept
+        matrix = sparse.csr_matrix(
+            (saved["data"], saved["indices"], saved["indptr"]),
+            shape=tuple(saved["shape"]),
+        )
+        return matrix, (saved["recent_ids"], saved["recent_times"])
+
+
+def save_matrix(path, matrix, recent):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp.npz")
+    np.savez_compressed(
+        temporary,
+        data=matrix.data,
+        indices=matrix.indices,
+        indptr=matrix.indptr,
+        shape=np.array(matrix.shape),
+        recent_ids=recent[0],
+        recent_times=recent[1],
+    )
+    os.replace(temporary, path)
+
+
+def cooccurrence(order_ids, product_ids, size):
+    """C = XᵀX for one batch of (order, product) lines, size x size"""
+    _, rows = np.unique(order_ids, return_inverse=True)
+    incidence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, product_ids)),
+        shape=(rows.max() + 1 if len(rows) else 0, size),
+    )
+    incidence.sum_duplicates()
+    incidence.data[:] = 1  # a product twice in one order counts once
+    return (incidence.T @ incidence).tocsr()
+
+
+def order_lines(since, counted, batch_orders):
+    """
+    (order ids, product ids) of the lines, and (ids, creation timestamps)
+    of the orders, for the orders created since `since` (every order with
+    None) that are not in counted. Reads a batch of orders at a time, so
+    no order is split.
+    """
+    orders = Order.objects.exclude(status="cancelled")
+    if since is not None:
+        orders = orders.filter(created_at__gte=since)
+    last = 0
+    while True:
+        batch = list(
+            orders.filter(pk__gt=last)
+            .order_by("pk")
+            .values_list("pk", "created_at")[:batch_orders]
+        )
+        if not batch:
+            return
+        last = batch[-1][0]
+        ids = np.array([pk for pk, _ in batch], dtype=np.int64)
+        times = np.array([created.timestamp() for _, created in batch])
+        new = ~np.isin(ids, counted)
+        ids, times = ids[new], times[new]
+        if not len(ids):
+            continue
+        lines = np.array(
+            OrderItem.objects.filter(
+                order_id__gte=ids[0], order_id__lte=ids[-1]
+            ).values_list("order_id", "product_id"),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        lines = lines[np.isin(lines[:, 0], ids)]
+        yield lines[:, 0], lines[:, 1], ids, times
+
+
+def top_related(matrix, products, k, min_orders):
+    """
+    The k best related products of each of products, as arrays of
+    (product, related, rank, orders, score) sorted by product then rank
+    """
+    diagonal = matrix.diagonal().astype(np.float64)
+    rows = matrix[products].tocoo()
+    product = np.asarray(products)[rows.row]
+    related, orders = rows.col, rows.data
+
+    keep = (related != product) & (orders >= min_orders)
+    product, related, orders = product[keep], related[keep], orders[keep]
+    score = orders / np.sqrt(diagonal[product] * diagonal[related])
+
+    # By product, then best score, most orders and lowest id first
+    order = np.lexsort((related, -orders, -score, product))
+    product, related, orders, score = (
+        product[order],
+        related[order],
+        orders[order],
+        score[order],
+    )
+
+    # Position of each pair within its product's run
+    starts = np.flatnonzero(np.r_[True, product[1:] != product[:-1]])
+    lengths = np.diff(np.r_[starts, len(product)])
+    rank = np.arange(len(product)) - np.repeat(starts, lengths)
+
+    keep = rank < k
+    return product[keep], related[keep], rank[keep], orders[keep], score[keep]
+
+
+@transaction.atomic
+def store_related(products, related, replace_all=False):
+    """Replace the RelatedProduct rows of products (of all with replace_all)"""
+    if replace_all:
+        RelatedProduct.objects.all().delete()
+    else:
+        for chunk in chunks(products):
+            RelatedProduct.objects.filter(product_id__in=chunk).delete()
+    RelatedProduct.objects.bulk_create(
+        [
+            RelatedProduct(
+                product_id=product,
+                related_id=related_id,
+                rank=rank,
+                orders=orders,
+                score=round(score, 6),
+            )
+            for product, related_id, rank, orders, score in zip(
+                *(values.tolist() for values in related)
+            )
+        ],
+        batch_size=CHUNK_SIZE,
+    )
+
+
+def build_related_products(full=False, batch_orders=10000):
+    """
+    Add the orders since the last run to the co-occurrence matrix (all
+    orders with full=True) and rewrite the related products of every
+    product whose co-occurrence row changed. Returns counts for reporting.
+    """
+    path = settings.RELATED_PRODUCTS_MATRIX
+    overlap = settings.RELATED_PRODUCTS_ORDER_OVERLAP
+    matrix, (recent_ids, recent_times) = (
+        (None, NO_ORDERS) if full else load_matrix(path)
+    )
+    since = None
+    if len(recent_times):
+        since = datetime.fromtimestamp(recent_times.max() - overlap, timezone.utc)
+    size = (Product.objects.aggregate(top=Max("pk"))["top"] or 0) + 1
+    if matrix is None:
+        matrix = sparse.csr_matrix((size, size), dtype=np.int32)
+    elif matrix.shape[0] < size:
+        matrix.resize((size, size))
+    size = matrix.shape[0]
+
+    touched = set()
+    orders = 0
+    lines = order_lines(since, recent_ids, batch_orders)
+    for order_ids, product_ids, ids, times in lines:
+        matrix = matrix + cooccurrence(order_ids, product_ids, size)
+        touched.update(np.unique(product_ids).tolist())
+        orders += len(ids)
+        recent_ids = np.r_[recent_ids, ids]
+        recent_times = np.r_[recent_times, times]
+    if len(recent_times):
+        keep = recent_times >= recent_times.max() - overlap
+        recent_ids, recent_times = recent_ids[keep], recent_times[keep]
+
+    if full:
+        products = matrix.diagonal().nonzero()[0]
+    else:
+        # A partner's score with a touched product depends on that
+        # product's order count, so the partner's list changes too
+        touched = np.array(sorted(touched), dtype=np.int64)
+        products = np.union1d(touched, matrix[touched].indices)
+    related = top_related(
+        matrix,
+        np.asarray(products, dtype=np.int64),
+        settings.RELATED_PRODUCTS_TOP_K,
+        settings.RELATED_PRODUCTS_MIN_ORDERS,
+    )
+    store_related(list(products), related, replace_all=full)
+    save_matrix(path, matrix, (recent_ids, recent_times))
+    return {
+        "orders": orders,
+        "products": len(products),
+        "pairs": len(related[0]),
+    }
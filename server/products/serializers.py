@@ -4,10 +4,18 @@ from .models import Product
 
 class ProductSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField(read_only=True)
+    # Only present when the queryset is annotated (?with_wishlist=true)
+    is_wishlisted = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Product
         fields = "__all__"
+        read_only_fields = (
+            "view_count",
+            "cart_add_count",
+            "purchase_count",
+            "popularity",
+        )
 
     def get_image_url(self, obj):
         """
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from config.caching import bump_namespace
+from .models import Product
+
+# Saves of only these fields change nothing cached under "products"; stock
+# changes reach the catalog counts within CATALOG_COUNT_CACHE_TIMEOUT
+UNCACHED_FIELDS = frozenset({"inventory_count", "updated_at"})
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_caches(sender, instance, update_fields=None, **kwargs):
+    """Move every cached "products" entry (e.g. the category list) to a new key"""
+    if update_fields and update_fields <= UNCACHED_FIELDS:
+        return
+    bump_namespace("products")
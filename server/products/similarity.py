@@ -0,0 +1,279 @@
+"""
+Content-based "similar products".
+
+Each active product is a TF-IDF vector of the words and word pairs in its
+title and description, plus its category. Terms are hashed into N_FEATURES
+columns, so there is no vocabulary to keep in sync, and title and category
+terms weigh FIELD_WEIGHTS times more than description terms. Similarity is
+the cosine of two vectors. The best SIMILAR_PRODUCTS_TOP_K per product are
+stored as SimilarProduct rows, which the similar endpoint reads with one
+indexed query. Unlike "frequently bought together" (products.recommendations)
+this covers products nobody has ordered yet.
+
+The term counts, each product's updated_at and its neighbours are saved in
+SIMILAR_PRODUCTS_INDEX. The next run only reads the text of products saved
+since, and recomputes the neighbours of those products, of the products
+that listed a changed or removed one, and of the products a changed one now
+outscores the last neighbour of. Other lists keep the IDF weights of the run
+that computed them until a full rebuild.
+"""
+
+import os
+import re
+import zlib
+from pathlib import Path
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.db import transaction
+from config.batching import CHUNK_SIZE, chunks
+from .models import Product, SimilarProduct
+
+N_FEATURES = 2**18
+FIELD_WEIGHTS = {"title": 2.0, "description": 1.0, "category": 2.0}
+# Candidate pairs (products sharing a term) scored at once, to bound memory
+BLOCK_CELLS = 4_000_000
+
+WORD = re.compile(r"\w+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it its of on or that the this "
+    "to with".split()
+)
+
+
+def terms(text):
+    """Lowercased words of text, minus stop words, and adjacent word pairs"""
+    words = [word for word in WORD.findall(text.lower()) if word not in STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def term_counts(texts):
+    """
+    Field-weighted counts of hashed terms, one CSR row per (title,
+    description, category)
+    """
+    rows, columns, values = [], [], []
+    for row, (title, description, category) in enumerate(texts):
+        category = category.strip().lower()
+        fields = {
+            "title": terms(title),
+            "description": terms(description),
+            "category": [f"category:{category}"] if category else [],
+        }
+        for field, field_terms in fields.items():
+            for term in field_terms:
+                rows.append(row)
+                columns.append(zlib.crc32(term.encode()) % N_FEATURES)
+                values.append(FIELD_WEIGHTS[field])
+    counts = sparse.csr_matrix(
+        (np.array(values, dtype=np.float32), (rows, columns)),
+        shape=(len(texts), N_FEATURES),
+    )
+    counts.sum_duplicates()
+    return counts
+
+
+def tfidf(counts):
+    """L2-normalized rows of sublinear term frequency times smoothed IDF"""
+    documents = np.bincount(counts.indices, minlength=N_FEATURES)
+    idf = np.log((1 + counts.shape[0]) / (1 + documents)) + 1
+    vectors = counts.astype(np.float64)
+    vectors.data = (1 + np.log(vectors.data)) * idf[vectors.indices]
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).dot(vectors).tocsr()
+
+
+def candidates(vectors, rows):
+    """
+    (offset into rows, sparse similarity of those rows to every row) in
+    blocks. Only products sharing a term with a row are scored, by walking
+    each term's postings, and a block holds at most BLOCK_CELLS of them
+    (or a single row).
+    """
+    postings = vectors.T.tocsr()
+    documents = np.diff(postings.indptr)
+    # Products reached through each row's terms, with repeats: an upper
+    # bound on its scored pairs
+    reached = vectors.copy()
+    reached.data = documents[vectors.indices].astype(np.float64)
+    costs = np.asarray(reached.sum(axis=1)).ravel()
+    total = np.cumsum(costs[rows])
+    start = 0
+    while start < len(rows):
+        done = total[start - 1] if start else 0
+        end = max(start + 1, np.searchsorted(total, done + BLOCK_CELLS, "right"))
+        yield start, (vectors[rows[start:end]] @ postings).tocsr()
+        start = end
+
+
+def nearest(vectors, rows, k, min_score):
+    """
+    The k most similar rows to each of rows, best first, as (positions,
+    scores) arrays of len(rows) x k padded with -1 and 0
+    """
+    positions = np.full((len(rows), k), -1, dtype=np.int64)
+    scores = np.zeros((len(rows), k), dtype=np.float64)
+    for start, similarity in candidates(vectors, rows):
+        row = np.repeat(np.arange(similarity.shape[0]), np.diff(similarity.indptr))
+        column, score = similarity.indices, similarity.data
+        keep = (column != rows[start + row]) & (score > 0) & (score >= min_score)
+        row, column, score = row[keep], column[keep], score[keep]
+        # Best score first, lowest id (position) first among equals
+        order = np.lexsort((column, -score, row))
+        row, column, score = row[order], column[order], score[order]
+        rank = np.arange(len(row)) - np.searchsorted(row, row)
+        top = rank < k
+        positions[start + row[top], rank[top]] = column[top]
+        scores[start + row[top], rank[top]] = score[top]
+    return positions, scores
+
+
+def load_index(path):
+    """The arrays saved by save_index(), or None"""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    with np.load(path) as saved:
+        index = dict(saved)
+    index["counts"] = sparse.csr_matrix(
+        (index.pop("data"), index.pop("indices"), index.pop("indptr")),
+        shape=(len(index["ids"]), N_FEATURES),
+    )
+    return index
+
+
+def save_index(path, ids, stamps, counts, neighbours, scores):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp.npz")
+    np.savez_compressed(
+        temporary,
+        ids=ids,
+        stamps=stamps,
+        data=counts.data,
+        indices=counts.indices,
+        indptr=counts.indptr,
+        neighbours=neighbours,
+        scores=scores,
+    )
+    os.replace(temporary, path)
+
+
+def product_texts(ids):
+    """(title, description, category) of each of ids, in order"""
+    texts = {}
+    for chunk in chunks(ids):
+        texts.update(
+            (pk, (title, description, category))
+            for pk, title, description, category in Product.objects.filter(
+                pk__in=chunk
+            ).values_list("pk", "title", "description", "category")
+        )
+    return [texts.get(pk, ("", "", "")) for pk in ids]
+
+
+@transaction.atomic
+def store_similar(cleared, products, neighbours, scores, replace_all=False):
+    """
+    Replace the SimilarProduct rows of cleared (of all products with
+    replace_all) with the neighbour ids (-1 for none) and scores of products
+    """
+    if replace_all:
+        SimilarProduct.objects.all().delete()
+    else:
+        for chunk in chunks(cleared):
+            SimilarProduct.objects.filter(product_id__in=chunk).delete()
+    SimilarProduct.objects.bulk_create(
+        [
+            SimilarProduct(
+                product_id=product,
+                similar_id=similar,
+                rank=rank,
+                score=round(score, 6),
+            )
+            for product, row, row_scores in zip(
+                products.tolist(), neighbours.tolist(), scores.tolist()
+            )
+            for rank, (similar, score) in enumerate(zip(row, row_scores))
+            if similar >= 0
+        ],
+        batch_size=CHUNK_SIZE,
+    )
+
+
+def build_similar_products(full=False):
+    """
+    Update the similar products of every product whose list the products
+    saved since the last run (all of them with full=True) can change.
+    Returns counts for reporting.
+    """
+    path = settings.SIMILAR_PRODUCTS_INDEX
+    k = settings.SIMILAR_PRODUCTS_TOP_K
+    min_score = settings.SIMILAR_PRODUCTS_MIN_SCORE
+    index = None if full else load_index(path)
+    if index is not None and index["neighbours"].shape[1] != k:
+        index = None  # top-K changed since the index was saved
+
+    current = list(
+        Product.objects.filter(is_active=True)
+        .order_by("pk")
+        .values_list("pk", "updated_at")
+    )
+    ids = np.array([pk for pk, _ in current], dtype=np.int64)
+    stamps = np.array([updated.timestamp() for _, updated in current])
+
+    kept = np.zeros(len(ids), dtype=bool)
+    saved = np.zeros(len(ids), dtype=np.int64)  # row in the saved index
+    if index is not None and len(index["ids"]):
+        saved = np.minimum(np.searchsorted(index["ids"], ids), len(index["ids"]) - 1)
+        kept = (index["ids"][saved] == ids) & (index["stamps"][saved] == stamps)
+    changed = ids[~kept]
+    previous = np.empty(0, dtype=np.int64) if index is None else index["ids"]
+    removed = np.setdiff1d(previous, ids)
+
+    # Counts in id order: saved rows for unchanged products, fresh ones else
+    fresh = term_counts(product_texts(changed.tolist()))
+    if kept.any():
+        stacked = sparse.vstack([index["counts"][saved[kept]], fresh]).tocsr()
+        counts = stacked[np.argsort(np.r_[np.flatnonzero(kept), np.flatnonzero(~kept)])]
+    else:
+        counts = fresh
+    vectors = tfidf(counts)
+
+    neighbours = np.full((len(ids), k), -1, dtype=np.int64)
+    scores = np.zeros((len(ids), k), dtype=np.float64)
+    if kept.any():
+        neighbours[kept] = index["neighbours"][saved[kept]]
+        scores[kept] = index["scores"][saved[kept]]
+        # Lists holding a product that changed or is gone, and lists a
+        # changed product now gets into
+        stale = np.isin(neighbours, np.r_[changed, removed]).any(axis=1)
+        beaten = np.zeros(len(ids), dtype=bool)
+        if len(changed):
+            best = np.zeros(len(ids))
+            for _, reach in candidates(vectors, np.flatnonzero(~kept)):
+                best = np.maximum(best, reach.max(axis=0).toarray().ravel())
+            beaten = (best >= min_score) & (best > scores[:, -1])
+        affected = np.flatnonzero(~kept | stale | beaten)
+    else:
+        affected = np.arange(len(ids))
+
+    found, found_scores = nearest(vectors, affected, k, min_score)
+    neighbours[affected] = np.where(found >= 0, ids[np.maximum(found, 0)], -1)
+    scores[affected] = found_scores
+
+    store_similar(
+        np.union1d(ids[affected], removed).tolist(),
+        ids[affected],
+        neighbours[affected],
+        scores[affected],
+        replace_all=index is None,
+    )
+    save_index(path, ids, stamps, counts, neighbours, scores)
+    return {
+        "products": len(ids),
+        "changed": len(changed),
+        "removed": len(removed),
+        "updated": len(affected),
+    }
@@ -1,7 +1,31 @@
 from .test_models import ProductModelTests
 from .test_views import ProductViewSetTests
+from .test_datagen import DataGeneratorTests
+from .test_async_views import AsyncCatalogViewTests
+from .test_popularity import PopularityBufferTests, PopularityEventTests
+from .test_recommendations import (
+    RelatedProductsBuildTests,
+    RelatedProductsEndpointTests,
+)
+from .test_similarity import SimilarProductsBuildTests, SimilarProductsEndpointTests
+from .test_catalog_filters import (
+    CatalogCountCacheTests,
+    CatalogFilterTests,
+    CatalogQueryPlanTests,
+)
 
 __all__ = [
     "ProductModelTests",
     "ProductViewSetTests",
+    "DataGeneratorTests",
+    "AsyncCatalogViewTests",
+    "PopularityBufferTests",
+    "PopularityEventTests",
+    "RelatedProductsBuildTests",
+    "RelatedProductsEndpointTests",
+    "SimilarProductsBuildTests",
+    "SimilarProductsEndpointTests",
+    "CatalogCountCacheTests",
+    "CatalogFilterTests",
+    "CatalogQueryPlanTests",
 ]
@@ -0,0 +1,127 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from ..models import Product
+from ..popularity import popularity_buffer
+
+User = get_user_model()
+
+
+# Popularity counters must not be flushed between the responses compared
+@override_settings(POPULARITY_FLUSH_INTERVAL=3600)
+class AsyncCatalogViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(15):
+            Product.objects.create(
+                title=f"Phone {i}" if i % 2 else f"Laptop {i}",
+                description="Refurbished" if i % 3 == 0 else "",
+                price=100 + i,
+                inventory_count=i,
+                category="Electronics" if i % 2 else "Computers",
+            )
+        cls.inactive = Product.objects.create(
+            title="Retired Phone", price=10, category="Electronics", is_active=False
+        )
+        cls.admin_user = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        cls.admin_auth = {
+            "Authorization": "Bearer "
+            + str(RefreshToken.for_user(cls.admin_user).access_token)
+        }
+
+    def setUp(self):
+        popularity_buffer.reset()
+
+    async def assert_matches_sync(self, sync_url, async_url, headers=None):
+        sync_response = await sync_to_async(self.client.get)(sync_url, headers=headers)
+        async_response = await self.async_client.get(async_url, headers=headers)
+
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        # Pagination links point at each view's own URL
+        self.assertEqual(
+            async_response.content.decode().replace("/catalog/products/", "/products/"),
+            sync_response.content.decode(),
+        )
+        return async_response
+
+    def test_views_are_async(self):
+        """Test that the catalog read path runs natively under ASGI"""
+        for url in (
+            reverse("catalog-product-list"),
+            reverse("catalog-product-detail", args=[self.inactive.pk]),
+            reverse("catalog-product-categories"),
+        ):
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+
+    async def test_list_matches_sync_view(self):
+        """Test that pages, filters and search match the DRF viewset"""
+        sync_url = reverse("product-list")
+        async_url = reverse("catalog-product-list")
+        for query in (
+            "",
+            "?page=2",
+            "?category=Electronics",
+            "?search=laptop",
+            "?min_price=105&max_price=110&in_stock=true&ordering=-price",
+            "?ordering=title",
+            "?min_price=cheap",
+        ):
+            with self.subTest(query=query):
+                await self.assert_matches_sync(sync_url + query, async_url + query)
+
+    async def test_list_hides_inactive_products_from_customers(self):
+        """Test that only staff see inactive products"""
+        url = reverse("catalog-product-list") + "?search=retired"
+
+        response = await self.async_client.get(url)
+        self.assertEqual(response.json()["count"], 0)
+
+        response = await self.assert_matches_sync(
+            reverse("product-list") + "?search=retired", url, headers=self.admin_auth
+        )
+        self.assertEqual(response.json()["count"], 1)
+
+    async def test_detail_matches_sync_view(self):
+        product = await Product.objects.filter(is_active=True).afirst()
+        await self.assert_matches_sync(
+            reverse("product-detail", args=[product.pk]),
+            reverse("catalog-product-detail", args=[product.pk]),
+        )
+
+    async def test_detail_of_inactive_product(self):
+        """Test that inactive products are 404 for customers only"""
+        for headers in (None, self.admin_auth):
+            await self.assert_matches_sync(
+                reverse("product-detail", args=[self.inactive.pk]),
+                reverse("catalog-product-detail", args=[self.inactive.pk]),
+                headers=headers,
+            )
+
+    async def test_categories_match_sync_view(self):
+        await self.assert_matches_sync(
+            reverse("product-list-categories"), reverse("catalog-product-categories")
+        )
+
+    async def test_invalid_page(self):
+        response = await self.async_client.get(
+            reverse("catalog-product-list") + "?page=9"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"detail": "Invalid page."})
+
+    async def test_invalid_token(self):
+        response = await self.async_client.get(
+            reverse("catalog-product-list"),
+            headers={"Authorization": "Bearer not-a-token"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+
+    async def test_read_only(self):
+        response = await self.async_client.post(reverse("catalog-product-list"))
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,179 @@
+from unittest import skipUnless
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from ..models import Product
+
+
+class CatalogFilterTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = {
+            title: Product.objects.create(
+                title=title, price=price, inventory_count=stock, category="Audio"
+            )
+            for title, price, stock in [
+                ("Headphones", "149.99", 4),
+                ("Earbuds", "49.99", 0),
+                ("Speaker", "99.00", 12),
+                ("Amplifier", "99.00", 1),
+            ]
+        }
+        Product.objects.create(title="Retired Radio", price=75, is_active=False)
+
+    def titles(self, **params):
+        response = self.client.get(reverse("product-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [product["title"] for product in response.data["results"]]
+
+    def test_price_range(self):
+        self.assertEqual(
+            set(self.titles(min_price="50", max_price="99")), {"Speaker", "Amplifier"}
+        )
+        self.assertEqual(self.titles(min_price="100"), ["Headphones"])
+
+    def test_in_stock(self):
+        self.assertNotIn("Earbuds", self.titles(in_stock="true"))
+        self.assertEqual(self.titles(in_stock="false"), ["Earbuds"])
+
+    def test_ordering(self):
+        # Equal prices are newest first
+        self.assertEqual(
+            self.titles(ordering="price"),
+            ["Earbuds", "Amplifier", "Speaker", "Headphones"],
+        )
+        self.assertEqual(
+            self.titles(ordering="-price"),
+            ["Headphones", "Amplifier", "Speaker", "Earbuds"],
+        )
+        self.assertEqual(
+            self.titles(ordering="title"),
+            ["Amplifier", "Earbuds", "Headphones", "Speaker"],
+        )
+        self.assertEqual(
+            self.titles(ordering="newest"),
+            ["Amplifier", "Speaker", "Earbuds", "Headphones"],
+        )
+        self.assertEqual(
+            self.titles(ordering="price,-title"),
+            ["Earbuds", "Speaker", "Amplifier", "Headphones"],
+        )
+
+    def test_unknown_ordering_is_ignored(self):
+        self.assertEqual(
+            self.titles(ordering="inventory_count"),
+            ["Amplifier", "Speaker", "Earbuds", "Headphones"],
+        )
+
+    def test_invalid_price(self):
+        response = self.client.get(reverse("product-list"), {"min_price": "cheap"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("min_price", response.data)
+
+
+class CatalogCountCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        for price, category in ((10, "Audio"), (20, "Audio"), (30, "Video")):
+            Product.objects.create(
+                title=f"Product {price}", price=price, category=category
+            )
+
+    def count(self, **params):
+        response = self.client.get(reverse("product-list"), params)
+        return response.data["count"]
+
+    def counted(self, **params):
+        """Whether fetching the count ran a COUNT query"""
+        with CaptureQueriesContext(connection) as queries:
+            self.count(**params)
+        return any("COUNT(" in query["sql"] for query in queries.captured_queries)
+
+    def test_count_is_cached_per_filter(self):
+        self.assertEqual(self.count(category="Audio"), 2)
+        self.assertFalse(self.counted(category="Audio", ordering="-price"))
+        self.assertEqual(self.count(category="Video"), 1)
+
+    def test_search_and_price_counts_are_not_cached(self):
+        for params in ({"search": "Product 1"}, {"min_price": "15"}):
+            self.assertTrue(self.counted(**params))
+            self.assertTrue(self.counted(**params))
+        self.assertEqual(self.count(min_price="15"), 2)
+
+    def test_saving_a_product_refreshes_counts(self):
+        self.assertEqual(self.count(), 3)
+        Product.objects.create(title="Product 40", price=40)
+        self.assertEqual(self.count(), 4)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite's")
+class CatalogQueryPlanTests(APITestCase):
+    """Sorted and filtered catalog pages read an index, not a full sort"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create(
+            Product(
+                title=f"Product {i}",
+                price=i % 50,
+                inventory_count=i % 3,
+                popularity=i % 7,
+                is_active=i % 10 != 0,
+            )
+            for i in range(200)
+        )
+
+    def page_plan(self, **params):
+        """EXPLAIN QUERY PLAN of the page query of a catalog request"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("product-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        (sql,) = [
+            query["sql"]
+            for query in queries.captured_queries
+            if "products_product" in query["sql"] and " LIMIT " in query["sql"]
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_index_ordered(self, plan, index):
+        self.assertTrue(any(f"USING INDEX {index}" in step for step in plan), plan)
+        # A right-part sort only orders rows with equal leading keys
+        self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan)
+
+    def test_sorted_pages_use_an_index(self):
+        for ordering, index in [
+            ("", "product_active_created"),
+            ("newest", "product_active_created"),
+            ("price", "product_active_price"),
+            ("-price", "product_active_price"),
+            ("-popularity", "product_active_popularity"),
+            ("title", "product_active_title"),
+        ]:
+            with self.subTest(ordering=ordering):
+                params = {"ordering": ordering} if ordering else {}
+                self.assert_index_ordered(self.page_plan(**params), index)
+
+    def test_fully_indexed_orderings_do_not_sort(self):
+        for ordering in ["price", "-popularity", "title", "newest"]:
+            with self.subTest(ordering=ordering):
+                plan = self.page_plan(ordering=ordering)
+                self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
+
+    def test_price_filters_search_the_price_index(self):
+        plan = self.page_plan(
+            min_price="10", max_price="20", in_stock="true", ordering="price"
+        )
+        self.assertTrue(
+            any(
+                step.startswith("SEARCH") and "product_active_price" in step
+                for step in plan
+            ),
+            plan,
+        )
+        self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
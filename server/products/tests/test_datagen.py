@@ -0,0 +1,89 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from cart.models import Cart
+from orders.models import Order, OrderItem
+from ..models import Product
+from ..datagen import USER_EMAIL_DOMAIN, generate, flush_generated_data
+
+User = get_user_model()
+
+
+def quiet(*args):
+    pass
+
+
+class DataGeneratorTests(TestCase):
+    options = {
+        "products": 120,
+        "users": 30,
+        "orders": 80,
+        "carts": 10,
+        "seed": 7,
+        "end_date": date(2025, 6, 30),
+        "log": quiet,
+    }
+
+    def snapshot(self):
+        return (
+            list(
+                Product.objects.order_by("title").values_list(
+                    "title", "price", "category", "inventory_count", "created_at"
+                )
+            ),
+            list(
+                Order.objects.order_by("created_at").values_list(
+                    "total_price", "status", "created_at", "user__email"
+                )
+            ),
+        )
+
+    def test_generate_row_counts(self):
+        """Test that the requested number of rows is created"""
+        counts = generate(**self.options)
+
+        self.assertEqual(counts["products"], 120)
+        self.assertEqual(Product.objects.count(), 120)
+        self.assertEqual(
+            User.objects.filter(email__endswith=USER_EMAIL_DOMAIN).count(), 30
+        )
+        self.assertEqual(Order.objects.count(), 80)
+        self.assertEqual(Cart.objects.count(), 10)
+        self.assertTrue(OrderItem.objects.exists())
+
+    def test_same_seed_same_data(self):
+        """Test that a fixed seed and end date reproduce the data"""
+        generate(**self.options)
+        first = self.snapshot()
+
+        flush_generated_data()
+        generate(**self.options)
+        self.assertEqual(self.snapshot(), first)
+
+        flush_generated_data()
+        generate(**{**self.options, "seed": 8})
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_order_totals_match_items(self):
+        """Test that generated order totals add up"""
+        generate(**self.options)
+
+        for order in Order.objects.prefetch_related("items")[:20]:
+            self.assertEqual(
+                order.total_price, sum(item.subtotal for item in order.items.all())
+            )
+
+    def test_command_refuses_to_duplicate(self):
+        """Test that the command needs --flush to regenerate"""
+        args = ["--products", "10", "--users", "5", "--orders", "5", "--carts", "1"]
+        call_command("generate_data", *args, stdout=StringIO())
+        self.assertTrue(User.objects.filter(email="admin@kenkeputa.com").exists())
+
+        with self.assertRaises(CommandError):
+            call_command("generate_data", *args, stdout=StringIO())
+
+        call_command("generate_data", *args, "--flush", stdout=StringIO())
+        self.assertEqual(Product.objects.count(), 10)
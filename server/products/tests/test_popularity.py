@@ -0,0 +1,281 @@
+import threading
+import time
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from ..models import Product
+from .. import popularity
+from ..popularity import PopularityBuffer, popularity_buffer, record
+
+User = get_user_model()
+
+WEIGHTS = {"view": 1, "cart_add": 5, "purchase": 20}
+
+
+@override_settings(POPULARITY_FLUSH_INTERVAL=3600, POPULARITY_WEIGHTS=WEIGHTS)
+class PopularityBufferTests(TestCase):
+    def setUp(self):
+        self.buffer = PopularityBuffer()
+        self.products = [
+            Product.objects.create(title=f"Product {i}", price=10, inventory_count=10)
+            for i in range(3)
+        ]
+
+    def updates(self, queries):
+        return sum(
+            query["sql"].startswith("UPDATE") for query in queries.captured_queries
+        )
+
+    def test_flush_is_one_update(self):
+        first, second, third = self.products
+        for _ in range(3):
+            self.buffer.add(first.pk, "view")
+        self.buffer.add(second.pk, "cart_add")
+        self.buffer.add(second.pk, "purchase", 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.updates(queries), 1)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        third.refresh_from_db()
+        self.assertEqual(first.view_count, 3)
+        self.assertEqual(first.popularity, 3)
+        self.assertEqual(
+            (second.view_count, second.cart_add_count, second.purchase_count), (0, 1, 2)
+        )
+        self.assertEqual(second.popularity, 5 + 40)
+        self.assertEqual(third.popularity, 0)
+        self.assertEqual(self.buffer.pending(), {})
+
+    def test_counts_accumulate_across_flushes(self):
+        product = self.products[0]
+        self.buffer.add(product.pk, "view")
+        self.buffer.flush()
+        self.buffer.add(product.pk, "purchase")
+        self.buffer.flush()
+
+        product.refresh_from_db()
+        self.assertEqual((product.view_count, product.purchase_count), (1, 1))
+        self.assertEqual(product.popularity, 21)
+
+    @override_settings(POPULARITY_FLUSH_BATCH=2)
+    def test_large_flushes_are_batched(self):
+        for product in self.products:
+            self.buffer.add(product.pk, "view")
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(self.updates(queries), 2)
+
+    @override_settings(POPULARITY_FLUSH_BATCH=2)
+    def test_failed_batch_rolls_back_the_flush(self):
+        for product in self.products:
+            self.buffer.add(product.pk, "view")
+        increments = popularity.increments
+        batches = []
+
+        def fail_second_batch(counts):
+            batches.append(counts)
+            if len(batches) == 2:
+                raise OperationalError("locked")
+            return increments(counts)
+
+        with mock.patch.object(
+            popularity, "increments", side_effect=fail_second_batch
+        ), self.assertLogs("products.popularity", "ERROR"):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(len(batches), 2)
+
+        self.buffer.flush()
+        self.assertEqual(
+            list(Product.objects.order_by("pk").values_list("view_count", flat=True)),
+            [1, 1, 1],
+        )
+
+    def test_flush_is_due_after_the_interval(self):
+        self.assertFalse(self.buffer.add(self.products[0].pk, "view"))
+        with override_settings(POPULARITY_FLUSH_INTERVAL=0):
+            self.assertTrue(self.buffer.add(self.products[0].pk, "view"))
+
+    def test_failed_write_keeps_the_counts(self):
+        product = self.products[0]
+        self.buffer.add(product.pk, "view", 2)
+        with mock.patch.object(
+            PopularityBuffer, "_write", side_effect=OperationalError("locked")
+        ), self.assertLogs("products.popularity", "ERROR"):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.buffer.add(product.pk, "view")
+
+        self.buffer.flush()
+        product.refresh_from_db()
+        self.assertEqual(product.view_count, 3)
+
+    def test_concurrent_adds_and_flushes_lose_nothing(self):
+        written = {}
+        active = []
+        overlaps = []
+
+        def slow_write(counts):
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.001)  # widen the window for racing adds
+            for product_id, fields in counts.items():
+                totals = written.setdefault(product_id, {})
+                for field, value in fields.items():
+                    totals[field] = totals.get(field, 0) + value
+            active.pop()
+            return len(counts)
+
+        threads, adds = 8, 2000
+        start = threading.Barrier(threads + 2)
+        done = threading.Event()
+
+        def adder(index):
+            start.wait()
+            for i in range(adds):
+                self.buffer.add(i % 5, "view" if index % 2 else "cart_add")
+
+        def flusher():
+            start.wait()
+            while not done.is_set():
+                self.buffer.flush()
+
+        with mock.patch.object(self.buffer, "_write", side_effect=slow_write):
+            workers = [
+                threading.Thread(target=adder, args=(i,)) for i in range(threads)
+            ]
+            flushers = [threading.Thread(target=flusher) for _ in range(2)]
+            for thread in workers + flushers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            done.set()
+            for thread in flushers:
+                thread.join()
+            self.buffer.flush()
+
+        self.assertEqual(max(overlaps), 1)
+        total = sum(value for fields in written.values() for value in fields.values())
+        self.assertEqual(total, threads * adds)
+        self.assertEqual(
+            sum(fields["view_count"] for fields in written.values()),
+            threads // 2 * adds,
+        )
+
+
+@override_settings(POPULARITY_FLUSH_INTERVAL=3600, POPULARITY_WEIGHTS=WEIGHTS)
+class PopularityEventTests(APITestCase):
+    def setUp(self):
+        popularity_buffer.reset()
+        self.addCleanup(popularity_buffer.reset)
+        self.user = User.objects.create_user(
+            email="shopper@example.com", password="test123"
+        )
+        self.product = Product.objects.create(
+            title="Popular Product", price=10, inventory_count=10
+        )
+
+    def pending(self):
+        return popularity_buffer.pending().get(self.product.pk, {})
+
+    def test_retrieve_counts_a_view_without_writing(self):
+        url = reverse("product-detail", args=[self.product.pk])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.assertFalse(
+            [query for query in queries if query["sql"].startswith("UPDATE")]
+        )
+        self.assertEqual(self.pending()["view_count"], 1)
+
+    async def test_async_retrieve_counts_a_view(self):
+        url = reverse("catalog-product-detail", args=[self.product.pk])
+        response = await self.async_client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.pending()["view_count"], 1)
+
+    def test_flush_due_is_written_by_the_request(self):
+        url = reverse("product-detail", args=[self.product.pk])
+        with override_settings(
+            POPULARITY_FLUSH_INTERVAL=0
+        ), self.captureOnCommitCallbacks(execute=True):
+            self.client.get(url)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.view_count, 1)
+        self.assertEqual(self.pending(), {})
+
+    def test_add_to_cart_and_checkout(self):
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("add-to-cart"), {"product": self.product.id})
+        self.assertEqual(self.pending()["cart_add_count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("order-list-create"), {})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.pending()["purchase_count"], 1)
+
+    def test_flush_waits_for_the_callers_transaction(self):
+        with override_settings(POPULARITY_FLUSH_INTERVAL=0):
+            with self.captureOnCommitCallbacks() as callbacks:
+                with transaction.atomic():
+                    record(self.product.pk, "view")
+                    self.assertEqual(self.pending()["view_count"], 1)
+            self.assertEqual(callbacks, [popularity_buffer.flush])
+            callbacks[0]()
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.view_count, 1)
+
+    def test_rolled_back_cart_add_is_not_counted(self):
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.client.post(reverse("add-to-cart"), {"product": self.product.id})
+                transaction.set_rollback(True)
+        self.assertEqual(self.pending(), {})
+
+    def test_order_by_popularity(self):
+        Product.objects.create(
+            title="Bestseller", price=10, popularity=50, inventory_count=1
+        )
+        older = Product.objects.create(title="Older", price=10, inventory_count=1)
+        Product.objects.filter(pk=older.pk).update(
+            created_at=self.product.created_at.replace(year=2000)
+        )
+
+        response = self.client.get(reverse("product-list"), {"ordering": "-popularity"})
+        titles = [product["title"] for product in response.data["results"]]
+        # Ties are broken newest first
+        self.assertEqual(titles, ["Bestseller", "Popular Product", "Older"])
+
+    def test_counters_are_read_only(self):
+        staff = User.objects.create_user(
+            email="staff@example.com", password="staff123", is_staff=True
+        )
+        self.client.force_authenticate(user=staff)
+        self.client.patch(
+            reverse("product-detail", args=[self.product.pk]),
+            {"popularity": 1000, "view_count": 1000},
+        )
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.popularity, self.product.view_count), (0, 0))
+
+    def test_saving_a_stale_product_keeps_flushed_counts(self):
+        stale = Product.objects.get(pk=self.product.pk)
+        popularity_buffer.add(self.product.pk, "view", 3)
+        popularity_buffer.flush()
+
+        stale.title = "Renamed"
+        stale.save()
+
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.title, self.product.view_count), ("Renamed", 3))
@@ -0,0 +1,258 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order, OrderItem
+from ..models import Product, RelatedProduct
+from ..recommendations import build_related_products, load_matrix
+
+User = get_user_model()
+
+
+class RecommendationTestMixin:
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.matrix_path = Path(directory) / "cooccurrence.npz"
+        settings = override_settings(
+            RELATED_PRODUCTS_MATRIX=str(self.matrix_path),
+            RELATED_PRODUCTS_TOP_K=2,
+            RELATED_PRODUCTS_MIN_ORDERS=1,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user(
+            email="buyer@example.com", password="test123"
+        )
+        self.products = {
+            name: Product.objects.create(title=name, price=10, inventory_count=100)
+            for name in ["phone", "case", "charger", "cable", "lamp"]
+        }
+
+    def order(self, *names, status="paid"):
+        order = Order.objects.create(user=self.user, total_price=0, status=status)
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=self.products[name], quantity=1, price=10)
+            for name in names
+        )
+        return order
+
+    def related(self, name):
+        return list(
+            RelatedProduct.objects.filter(product=self.products[name]).values_list(
+                "related__title", "rank", "orders"
+            )
+        )
+
+
+class RelatedProductsBuildTests(RecommendationTestMixin, TestCase):
+    def test_ranked_by_normalized_co_occurrence(self):
+        self.order("phone", "case")
+        self.order("phone", "case")
+        self.order("phone", "charger")
+        self.order("phone", "cable")
+        self.order("cable", "lamp")
+        self.order("cable", "lamp")
+
+        counts = build_related_products()
+
+        self.assertEqual(counts["orders"], 6)
+        # case (2 of 2 orders with phone) beats charger (1 of 1) and cable
+        # (1 of 3); top-K keeps two
+        self.assertEqual(self.related("phone"), [("case", 0, 2), ("charger", 1, 1)])
+        self.assertEqual(self.related("case"), [("phone", 0, 2)])
+        self.assertEqual(self.related("lamp"), [("cable", 0, 2)])
+        row = RelatedProduct.objects.get(
+            product=self.products["phone"], related=self.products["case"]
+        )
+        self.assertAlmostEqual(row.score, 2 / (4 * 2) ** 0.5, places=5)
+
+    def test_cancelled_orders_and_repeated_lines_are_ignored(self):
+        self.order("phone", "case", "case")
+        self.order("phone", "lamp", status="cancelled")
+
+        build_related_products()
+
+        self.assertEqual(self.related("phone"), [("case", 0, 1)])
+        self.assertEqual(self.related("lamp"), [])
+
+    @override_settings(RELATED_PRODUCTS_MIN_ORDERS=2)
+    def test_min_orders(self):
+        self.order("phone", "case")
+        self.order("phone", "case")
+        self.order("phone", "charger")
+
+        build_related_products()
+
+        self.assertEqual(self.related("phone"), [("case", 0, 2)])
+        self.assertEqual(self.related("charger"), [])
+
+    def test_incremental_run_counts_only_new_orders(self):
+        self.order("phone", "case")
+        self.order("cable", "lamp")
+        build_related_products()
+        lamp_rows = list(
+            RelatedProduct.objects.filter(product=self.products["lamp"]).values_list(
+                "pk", flat=True
+            )
+        )
+
+        self.order("phone", "charger")
+        last = self.order("phone", "charger")
+        counts = build_related_products(batch_orders=1)
+
+        self.assertEqual(counts["orders"], 2)
+        # phone, charger, and case, whose score with phone changed
+        self.assertEqual(counts["products"], 3)
+        self.assertEqual(self.related("phone"), [("charger", 0, 2), ("case", 1, 1)])
+        case = RelatedProduct.objects.get(
+            product=self.products["case"], related=self.products["phone"]
+        )
+        self.assertAlmostEqual(case.score, 1 / (1 * 3) ** 0.5, places=5)
+        # Products in no new order keep their rows untouched
+        self.assertEqual(
+            list(
+                RelatedProduct.objects.filter(
+                    product=self.products["lamp"]
+                ).values_list("pk", flat=True)
+            ),
+            lamp_rows,
+        )
+        matrix, (recent_ids, _) = load_matrix(self.matrix_path)
+        self.assertIn(last.pk, recent_ids)
+        self.assertEqual(
+            matrix[self.products["phone"].pk, self.products["phone"].pk], 3
+        )
+
+        self.assertEqual(build_related_products()["orders"], 0)
+
+    def test_late_order_with_a_lower_id_is_counted(self):
+        reserved = self.order().pk
+        Order.objects.filter(pk=reserved).delete()
+        self.order("phone", "case")
+        build_related_products()
+
+        # A checkout that took its id before the run but committed after it
+        late = Order.objects.create(
+            pk=reserved, user=self.user, total_price=0, status="paid"
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(order=late, product=self.products[name], quantity=1, price=10)
+            for name in ["phone", "charger"]
+        )
+        counts = build_related_products()
+
+        self.assertEqual(counts["orders"], 1)
+        self.assertEqual(self.related("charger"), [("phone", 0, 1)])
+        self.assertEqual(build_related_products()["orders"], 0)
+
+    @override_settings(RELATED_PRODUCTS_ORDER_OVERLAP=0)
+    def test_orders_before_the_overlap_window_are_not_reread(self):
+        self.order("phone", "case")
+        build_related_products()
+        self.order("phone", "charger")
+        build_related_products()
+
+        matrix, (recent_ids, _) = load_matrix(self.matrix_path)
+        self.assertEqual(len(recent_ids), 1)
+        self.assertEqual(build_related_products()["orders"], 0)
+
+    def test_full_rebuild_matches_incremental(self):
+        self.order("phone", "case")
+        build_related_products()
+        self.order("phone", "charger", "case")
+        build_related_products()
+        incremental = sorted(
+            RelatedProduct.objects.values_list(
+                "product", "related", "rank", "orders", "score"
+            )
+        )
+
+        build_related_products(full=True)
+
+        self.assertEqual(
+            sorted(
+                RelatedProduct.objects.values_list(
+                    "product", "related", "rank", "orders", "score"
+                )
+            ),
+            incremental,
+        )
+
+    def test_failed_full_rebuild_keeps_the_old_lists(self):
+        self.order("phone", "case")
+        build_related_products()
+        with mock.patch.object(
+            RelatedProduct.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertRaises(DatabaseError):
+            build_related_products(full=True)
+
+        self.assertTrue(RelatedProduct.objects.exists())
+
+    def test_new_products_grow_the_matrix(self):
+        self.order("phone", "case")
+        build_related_products()
+        self.products["tripod"] = Product.objects.create(
+            title="tripod", price=10, inventory_count=100
+        )
+        self.order("phone", "tripod")
+
+        build_related_products()
+
+        self.assertEqual(self.related("tripod"), [("phone", 0, 1)])
+
+    def test_command(self):
+        self.order("phone", "case")
+        out = StringIO()
+
+        call_command("build_related_products", "--full", stdout=out)
+
+        self.assertIn("Counted 1 order(s)", out.getvalue())
+        self.assertEqual(self.related("case"), [("phone", 0, 1)])
+
+
+class RelatedProductsEndpointTests(RecommendationTestMixin, APITestCase):
+    def test_related_products_in_rank_order(self):
+        self.order("phone", "case")
+        self.order("phone", "case")
+        self.order("phone", "charger")
+        build_related_products()
+
+        url = reverse("product-related", args=[self.products["phone"].pk])
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [product["title"] for product in response.data["related"]],
+            ["case", "charger"],
+        )
+
+    def test_inactive_products_are_left_out(self):
+        self.order("phone", "case")
+        self.order("phone", "charger")
+        build_related_products()
+        Product.objects.filter(pk=self.products["case"].pk).update(is_active=False)
+
+        response = self.client.get(
+            reverse("product-related", args=[self.products["phone"].pk])
+        )
+
+        self.assertEqual(
+            [product["title"] for product in response.data["related"]], ["charger"]
+        )
+
+    def test_no_recommendations_yet(self):
+        response = self.client.get(
+            reverse("product-related", args=[self.products["lamp"].pk])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"related": []})
@@ -0,0 +1,192 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .. import similarity
+from ..models import Product, SimilarProduct
+from ..similarity import build_similar_products, terms
+
+CATALOG = {
+    "laptop": ("Gaming Laptop", "Fast gaming laptop with RGB keyboard", "Electronics"),
+    "ultrabook": ("Thin Laptop", "Light laptop for travel and work", "Electronics"),
+    "keyboard": ("Gaming Keyboard", "Mechanical RGB keyboard", "Electronics"),
+    "mug": ("Coffee Mug", "Ceramic mug for coffee and tea", "Kitchen"),
+    "teapot": ("Tea Pot", "Ceramic pot for loose leaf tea", "Kitchen"),
+}
+
+
+class SimilarityTestMixin:
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings = override_settings(
+            SIMILAR_PRODUCTS_INDEX=str(Path(directory) / "similarity.npz"),
+            SIMILAR_PRODUCTS_TOP_K=2,
+            SIMILAR_PRODUCTS_MIN_SCORE=0.05,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.products = {name: self.create(*text) for name, text in CATALOG.items()}
+
+    def create(self, title, description, category):
+        return Product.objects.create(
+            title=title,
+            description=description,
+            category=category,
+            price=10,
+            inventory_count=10,
+        )
+
+    def similar(self, name):
+        return list(
+            SimilarProduct.objects.filter(product=self.products[name]).values_list(
+                "similar__title", flat=True
+            )
+        )
+
+
+class SimilarProductsBuildTests(SimilarityTestMixin, TestCase):
+    def test_terms(self):
+        self.assertEqual(
+            terms("The Gaming-Laptop for work"),
+            ["gaming", "laptop", "work", "gaming laptop", "laptop work"],
+        )
+
+    def test_similar_by_text_and_category(self):
+        counts = build_similar_products()
+
+        self.assertEqual(counts["products"], 5)
+        self.assertEqual(self.similar("laptop"), ["Gaming Keyboard", "Thin Laptop"])
+        self.assertEqual(self.similar("mug"), ["Tea Pot"])
+        self.assertEqual(self.similar("teapot"), ["Coffee Mug"])
+        scores = SimilarProduct.objects.filter(
+            product=self.products["laptop"]
+        ).values_list("score", flat=True)
+        self.assertEqual(list(scores), sorted(scores, reverse=True))
+
+    @override_settings(SIMILAR_PRODUCTS_MIN_SCORE=0.99)
+    def test_min_score(self):
+        build_similar_products()
+        self.assertFalse(SimilarProduct.objects.exists())
+
+    def test_small_blocks_give_the_same_lists(self):
+        build_similar_products()
+        whole = sorted(SimilarProduct.objects.values_list("product", "similar", "rank"))
+
+        with mock.patch.object(similarity, "BLOCK_CELLS", 1):
+            build_similar_products(full=True)
+
+        self.assertEqual(
+            sorted(SimilarProduct.objects.values_list("product", "similar", "rank")),
+            whole,
+        )
+
+    def test_incremental_run_reads_only_changed_products(self):
+        build_similar_products()
+
+        with mock.patch.object(
+            similarity, "product_texts", wraps=similarity.product_texts
+        ) as texts:
+            counts = build_similar_products()
+        self.assertEqual((counts["changed"], counts["updated"]), (0, 0))
+        texts.assert_called_once_with([])
+
+        self.products["kettle"] = self.create("Tea Kettle", "Kettle for tea", "Kitchen")
+        with mock.patch.object(
+            similarity, "product_texts", wraps=similarity.product_texts
+        ) as texts:
+            counts = build_similar_products()
+        texts.assert_called_once_with([self.products["kettle"].pk])
+        self.assertEqual(counts["changed"], 1)
+        self.assertIn("Tea Kettle", self.similar("teapot"))
+        self.assertIn("Tea Pot", self.similar("kettle"))
+
+    def test_edited_and_removed_products_leave_lists(self):
+        build_similar_products()
+        keyboard = self.products["keyboard"]
+        keyboard.title = "Desk Lamp"
+        keyboard.description = "Warm light"
+        keyboard.category = "Home"
+        keyboard.save()
+        Product.objects.filter(pk=self.products["mug"].pk).update(is_active=False)
+
+        counts = build_similar_products()
+
+        self.assertEqual((counts["changed"], counts["removed"]), (1, 1))
+        self.assertNotIn("Desk Lamp", self.similar("laptop"))
+        self.assertEqual(self.similar("teapot"), [])
+        self.assertEqual(self.similar("mug"), [])
+
+    def test_full_rebuild(self):
+        build_similar_products()
+        self.create("Tea Kettle", "Kettle for tea", "Kitchen")
+        build_similar_products()
+        incremental = sorted(
+            SimilarProduct.objects.values_list("product", "similar", "rank")
+        )
+
+        build_similar_products(full=True)
+
+        self.assertEqual(
+            sorted(SimilarProduct.objects.values_list("product", "similar", "rank")),
+            incremental,
+        )
+
+    def test_failed_full_rebuild_keeps_the_old_lists(self):
+        build_similar_products()
+        with mock.patch.object(
+            SimilarProduct.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertRaises(DatabaseError):
+            build_similar_products(full=True)
+
+        self.assertEqual(self.similar("mug"), ["Tea Pot"])
+
+    def test_command(self):
+        out = StringIO()
+
+        call_command("build_similar_products", "--full", stdout=out)
+
+        self.assertIn("Indexed 5 product(s)", out.getvalue())
+        self.assertEqual(self.similar("mug"), ["Tea Pot"])
+
+
+class SimilarProductsEndpointTests(SimilarityTestMixin, APITestCase):
+    def test_similar_products_in_rank_order(self):
+        build_similar_products()
+
+        url = reverse("product-similar", args=[self.products["laptop"].pk])
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [product["title"] for product in response.data["similar"]],
+            ["Gaming Keyboard", "Thin Laptop"],
+        )
+
+    def test_inactive_products_are_left_out(self):
+        build_similar_products()
+        Product.objects.filter(pk=self.products["keyboard"].pk).update(is_active=False)
+
+        response = self.client.get(
+            reverse("product-similar", args=[self.products["laptop"].pk])
+        )
+
+        self.assertEqual(
+            [product["title"] for product in response.data["similar"]],
+            ["Thin Laptop"],
+        )
+
+    def test_not_indexed_yet(self):
+        response = self.client.get(
+            reverse("product-similar", args=[self.products["mug"].pk])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"similar": []})
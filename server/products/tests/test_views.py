@@ -95,6 +95,30 @@ class ProductViewSetTests(APITestCase):
         self.assertIn("Clothing", response.data["categories"])
         self.assertEqual(len(response.data["categories"]), 2)
 
+    def test_list_categories_is_cached_until_products_change(self):
+        """The category list is cached and rebuilt when a product is saved"""
+        self.client.get(self.categories_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.categories_url)
+        self.assertEqual(len(response.data["categories"]), 2)
+
+        Product.objects.create(
+            title="Garden Hose",
+            description="Twenty metre hose",
+            price=25.00,
+            inventory_count=5,
+            category="Garden",
+        )
+        response = self.client.get(self.categories_url)
+        self.assertIn("Garden", response.data["categories"])
+
+    def test_stock_only_saves_keep_categories_cached(self):
+        self.client.get(self.categories_url)
+        self.product1.inventory_count = 3
+        self.product1.save(update_fields=["inventory_count"])
+        with self.assertNumQueries(0):
+            self.client.get(self.categories_url)
+
     def test_create_product_requires_admin(self):
         """Test that only admins can create products"""
         # Try as regular user
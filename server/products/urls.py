@@ -1,7 +1,18 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from .views import ProductViewSet
+from .async_views import product_categories, product_detail, product_list
 
 router = DefaultRouter()
 router.register(r"products", ProductViewSet, basename="product")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    # Async (ASGI-native) read-only versions of the catalog endpoints
+    path("catalog/products/", product_list, name="catalog-product-list"),
+    path("catalog/products/<int:pk>/", product_detail, name="catalog-product-detail"),
+    path(
+        "catalog/products/categories/list/",
+        product_categories,
+        name="catalog-product-categories",
+    ),
+]
@@ -2,8 +2,13 @@ from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from .models import Product
+from django.conf import settings
+from config.caching import get_or_set, versioned_key
+from wishlist.utils import annotate_wishlisted
+from .filters import ProductFilter, StableOrderingFilter
+from .models import Product, RelatedProduct, SimilarProduct
+from .pagination import CatalogPagination
+from .popularity import record
 from .serializers import ProductSerializer
 
 
@@ -18,28 +23,67 @@ class ProductViewSet(viewsets.ModelViewSet):
     queryset = Product.objects.all().order_by("-created_at")
     serializer_class = ProductSerializer
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    pagination_class = PageNumberPagination
-    filterset_fields = ["category"]
+    replica_reads = True
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, StableOrderingFilter]
+    pagination_class = CatalogPagination
+    filterset_class = ProductFilter
     search_fields = ["title", "description", "category"]
-    pagination_class = PageNumberPagination
+    ordering_fields = ["price", "created_at", "popularity", "title"]
 
     def get_queryset(self):
         """Override to ensure we're always using the base queryset"""
+        queryset = Product.objects.all().order_by("-created_at")
         if not self.request.user.is_staff:
-            queryset = Product.objects.all().order_by("-created_at")
             queryset = queryset.filter(is_active=True)
-            return queryset
-        return Product.objects.all().order_by("-created_at")
+        if self.request.query_params.get("with_wishlist") in ("true", "1"):
+            queryset = annotate_wishlisted(queryset, self.request.user)
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        record(response.data["id"], "view")
+        return response
+
+    def ranked_products(self, model, field):
+        """The active products in the precomputed model rows of this product"""
+        product = self.get_object()
+        rows = (
+            model.objects.filter(product=product, **{f"{field}__is_active": True})
+            .select_related(field)
+            .order_by("rank")
+        )
+        products = [getattr(row, field) for row in rows]
+        return self.get_serializer(products, many=True).data
+
+    @action(detail=True, methods=["get"])
+    def related(self, request, pk=None):
+        """Products frequently bought together with this one, best first"""
+        return Response({"related": self.ranked_products(RelatedProduct, "related")})
+
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None):
+        """Products whose text reads most like this one's, best first"""
+        return Response({"similar": self.ranked_products(SimilarProduct, "similar")})
 
     @action(detail=False, methods=["get"], url_path="categories/list")
     def list_categories(self, request):
-        categories = (
-            Product.objects.values_list("category", flat=True)
-            .distinct()
-            .exclude(category="")  # don’t include empty categories
+        def categories():
+            return list(
+                Product.objects.values_list("category", flat=True)
+                .distinct()
+                .exclude(category="")  # don’t include empty categories
+            )
+
+        return Response(
+            {
+                "categories": get_or_set(
+                    versioned_key("products", "categories"),
+                    categories,
+                    settings.CATEGORY_CACHE_TIMEOUT,
+                    name="products:categories",
+                )
+            }
         )
-        return Response({"categories": list(categories)})
 
     def perform_destroy(self, instance):
         if instance.orderitem_set.exists():
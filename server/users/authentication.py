@@ -0,0 +1,93 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import TokenUser
+from .utils import get_auth_state
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that builds request.user from the token instead of
+    loading the users row on every request.
+
+    The user's id comes from the signed token; email, is_active, is_staff
+    and the password hash (for CHECK_REVOKE_TOKEN) come from the short-lived
+    auth state cache, which is dropped whenever a user is saved, so
+    deactivation, demotion and password changes take effect on the next
+    request. Any other field is loaded on first use (see TokenUser).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        state = get_auth_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not state["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if (
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+                != state["password_hash"]
+            ):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        known = {
+            api_settings.USER_ID_FIELD: user_id,
+            "email": state["email"],
+            "is_active": state["is_active"],
+            "is_staff": state["is_staff"],
+        }
+        fields = [
+            field.attname
+            for field in TokenUser._meta.concrete_fields
+            if field.attname in known
+        ]
+        return TokenUser.from_db(
+            DEFAULT_DB_ALIAS, fields, [known[name] for name in fields]
+        )
+
+
+class AsyncJWTAuthentication(StatelessJWTAuthentication):
+    """
+    Token authentication for plain Django async views, which DRF's
+    authentication machinery does not run for. Reading and validating the
+    token is CPU-only; only an auth state cache miss goes to the database.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user = await sync_to_async(self.get_user)(validated_token)
+        return user, validated_token
+
+
+async def authenticate_async(request):
+    """
+    Authenticate an async view's request the way DRF would for a sync view:
+    sets and returns request.user, AnonymousUser without credentials.
+    Raises AuthenticationFailed/InvalidToken for bad credentials.
+    """
+    result = await AsyncJWTAuthentication().aauthenticate(request)
+    request.user = result[0] if result else AnonymousUser()
+    return request.user
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_auth_state_cache(app_configs, **kwargs):
+    """
+    Token authentication caches each user's state (users.utils). Saving a
+    user only clears that entry in the saving process's cache, so with a
+    per-process cache, other workers accept a deactivated user or a revoked
+    token until the entry expires.
+    """
+    if not isinstance(caches["default"], LocMemCache):
+        return []
+    return [
+        checks.Warning(
+            "Token authentication state is cached per process: deactivation "
+            "and password changes reach other worker processes only after "
+            f"USER_AUTH_CACHE_TIMEOUT ({settings.USER_AUTH_CACHE_TIMEOUT}s).",
+            hint="Set CACHE_BACKEND=file or redis when running several processes.",
+            id="users.W001",
+        )
+    ]
@@ -55,3 +55,21 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+class TokenUser(User):
+    """
+    A user built from a validated access token without a query (see
+    users.authentication). Only the fields the token and the auth state
+    cache provide are loaded; reading any other field loads all of them
+    with a single query.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using, fields, from_queryset)
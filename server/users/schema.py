@@ -0,0 +1,10 @@
+"""OpenAPI extensions, imported only when the schema is generated"""
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """Document StatelessJWTAuthentication as the same bearer JWT scheme"""
+
+    target_class = "users.authentication.StatelessJWTAuthentication"
+    match_subclasses = True
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import TokenUser, User
+from .utils import invalidate_auth_state
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=TokenUser)
+def drop_cached_auth_state(sender, instance, **kwargs):
+    """
+    Deactivation, staff changes and password changes must reach token
+    authentication immediately, not when the cache entry expires
+    """
+    invalidate_auth_state(instance.pk)
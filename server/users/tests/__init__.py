@@ -1,9 +1,15 @@
 from .test_models import UserModelTests
 from .test_serializers import RegisterSerializerTests
 from .test_views import UserViewsTests
+from .test_authentication import (
+    AuthStateCacheCheckTests,
+    StatelessJWTAuthenticationTests,
+)
 
 __all__ = [
     "UserModelTests",
     "RegisterSerializerTests",
     "UserViewsTests",
+    "StatelessJWTAuthenticationTests",
+    "AuthStateCacheCheckTests",
 ]
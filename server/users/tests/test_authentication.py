@@ -0,0 +1,163 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from .. import authentication
+from ..models import TokenUser
+from ..utils import invalidate_auth_state
+from ..checks import check_auth_state_cache
+
+User = get_user_model()
+
+
+def user_queries(queries):
+    return [q["sql"] for q in queries if "users_user" in q["sql"]]
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="test123",
+            first_name="Ada",
+            last_name="Lovelace",
+            username="ada",
+        )
+        self.orders_url = reverse("order-list-create")
+        self.me_url = reverse("me")
+
+    def authenticate(self, user=None):
+        token = RefreshToken.for_user(user or self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return token
+
+    def test_cached_requests_do_not_load_the_user(self):
+        """Test that only the first request reads the users table"""
+        self.authenticate()
+        self.client.get(self.orders_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.orders_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(queries.captured_queries), [])
+
+    def test_full_user_is_loaded_lazily_in_one_query(self):
+        """Test that /me loads the remaining fields with one query"""
+        self.authenticate()
+        self.client.get(self.orders_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.me_url)
+
+        self.assertEqual(response.data["username"], "ada")
+        self.assertEqual(response.data["email"], "user@example.com")
+        self.assertEqual(len(user_queries(queries.captured_queries)), 1)
+
+    def test_email_change_applies_immediately(self):
+        """Test that email comes from the user, not the token"""
+        self.authenticate()
+        self.client.get(self.orders_url)
+
+        self.user.email = "ada@example.com"
+        self.user.save()
+
+        self.assertEqual(self.client.get(self.me_url).data["email"], "ada@example.com")
+
+    def test_deactivation_applies_immediately(self):
+        self.authenticate()
+        self.assertEqual(self.client.get(self.orders_url).status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.orders_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data["code"], "user_inactive")
+
+    def test_bulk_updates_apply_after_invalidation(self):
+        self.authenticate()
+        self.client.get(self.orders_url)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        invalidate_auth_state(self.user.pk)
+
+        response = self.client.get(self.orders_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_demotion_applies_immediately(self):
+        """Test that is_staff comes from the user, not a stale claim"""
+        admin = User.objects.create_user(
+            email="admin@example.com", password="admin123", is_staff=True
+        )
+        self.authenticate(user=admin)
+        export_url = reverse("order-export-csv")
+        self.assertEqual(self.client.get(export_url).status_code, 200)
+
+        admin.is_staff = False
+        admin.save()
+
+        response = self.client.get(export_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deleted_user(self):
+        self.authenticate()
+        self.client.get(self.orders_url)
+
+        self.user.delete()
+
+        response = self.client.get(self.orders_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data["code"], "user_not_found")
+
+    def test_password_change_revokes_tokens(self):
+        with mock.patch.object(
+            authentication.api_settings, "CHECK_REVOKE_TOKEN", True
+        ), mock.patch.object(tokens.api_settings, "CHECK_REVOKE_TOKEN", True):
+            self.authenticate()
+            self.assertEqual(self.client.get(self.orders_url).status_code, 200)
+
+            self.user.set_password("new-password-456")
+            self.user.save()
+
+            response = self.client.get(self.orders_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data["code"], "password_changed")
+
+    def test_token_user_loads_deferred_fields_together(self):
+        user = TokenUser.from_db("default", ["id"], [self.user.id])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, "Ada")
+            self.assertEqual(user.last_name, "Lovelace")
+            self.assertEqual(user.username, "ada")
+        self.assertEqual(user, self.user)
+
+
+class AuthStateCacheCheckTests(SimpleTestCase):
+    def test_per_process_cache_is_reported(self):
+        locmem = "django.core.cache.backends.locmem.LocMemCache"
+        with override_settings(CACHES={"default": {"BACKEND": locmem}}):
+            self.assertEqual(
+                [error.id for error in check_auth_state_cache(None)], ["users.W001"]
+            )
+
+    def test_shared_cache_passes(self):
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": "/tmp/kenkeputa-check-cache",
+                }
+            }
+        ):
+            self.assertEqual(check_auth_state_cache(None), [])
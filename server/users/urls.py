@@ -1,10 +1,10 @@
 from django.urls import path
-from .views import RegisterView, MeView
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .views import RegisterView, LoginView, MeView
+from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     path("signup/", RegisterView.as_view(), name="signup"),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/", LoginView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("me/", MeView.as_view(), name="me"),
 ]
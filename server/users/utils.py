@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+AUTH_STATE_KEY = "auth:state:{}"
+
+
+def get_auth_state(user_id):
+    """
+    What authentication needs to know about a user on every request, from
+    a short-lived cache entry that is dropped whenever the user is saved or
+    deleted. Returns None for unknown users.
+
+    The entry is only dropped in the cache of the process that saved the
+    user, so other processes see the change within USER_AUTH_CACHE_TIMEOUT
+    unless the cache is shared (see users.checks). QuerySet.update() sends
+    no signal; call invalidate_auth_state() after updating users that way.
+    """
+    key = AUTH_STATE_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        from .models import User
+
+        row = (
+            User.objects.filter(pk=user_id)
+            .values("email", "is_active", "is_staff", "password")
+            .first()
+        )
+        # Unknown users are cached as False so bad tokens cannot bypass it
+        state = False
+        if row is not None:
+            state = {
+                "email": row["email"],
+                "is_active": row["is_active"],
+                "is_staff": row["is_staff"],
+                "password_hash": get_md5_hash_password(row["password"]),
+            }
+        cache.set(key, state, settings.USER_AUTH_CACHE_TIMEOUT)
+    return state or None
+
+
+def invalidate_auth_state(user_id):
+    cache.delete(AUTH_STATE_KEY.format(user_id))
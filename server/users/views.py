@@ -6,6 +6,7 @@ from .serializers import RegisterSerializer, UserSerializer
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.response import Response
+from config.throttling import TOKEN_BUCKET_THROTTLES
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
@@ -16,6 +17,8 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = TOKEN_BUCKET_THROTTLES
+    throttle_scope = "register"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -37,6 +40,11 @@ class RegisterView(generics.CreateAPIView):
         )
 
 
+class LoginView(TokenObtainPairView):
+    throttle_classes = TOKEN_BUCKET_THROTTLES
+    throttle_scope = "login"
+
+
 class MeView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UserSerializer
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import models
+from products.models import Product
+
+
+class WishlistItem(models.Model):
+    """
+    A product a user saved for later. The unique (user, product) index
+    answers "which of these products are wishlisted" on its own.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="wishlist"
+    )
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="wishlisted_by"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "product"], name="unique_wishlist_item"
+            )
+        ]
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.product_id}"
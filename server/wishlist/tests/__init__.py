@@ -0,0 +1,13 @@
+from .test_models import WishlistItemModelTests
+from .test_views import (
+    WishlistViewTests,
+    WishlistContainsTests,
+    ProductWishlistAnnotationTests,
+)
+
+__all__ = [
+    "WishlistItemModelTests",
+    "WishlistViewTests",
+    "WishlistContainsTests",
+    "ProductWishlistAnnotationTests",
+]
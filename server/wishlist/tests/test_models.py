@@ -0,0 +1,39 @@
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from products.models import Product
+from ..models import WishlistItem
+from ..utils import wishlisted_ids
+
+User = get_user_model()
+
+
+class WishlistItemModelTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="test123"
+        )
+        self.product = Product.objects.create(
+            title="Test Product", price=29.99, inventory_count=100
+        )
+
+    def test_product_is_wishlisted_once_per_user(self):
+        """Test that the same product cannot be wishlisted twice"""
+        WishlistItem.objects.create(user=self.user, product=self.product)
+        with self.assertRaises(IntegrityError):
+            WishlistItem.objects.create(user=self.user, product=self.product)
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite's")
+    def test_membership_check_reads_only_the_unique_index(self):
+        """Test that the bulk membership query is one covering index search"""
+        with CaptureQueriesContext(connection) as queries:
+            wishlisted_ids(self.user, [1, 2, 3])
+        (query,) = queries.captured_queries
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            (plan,) = [row[-1] for row in cursor.fetchall()]
+        self.assertIn("COVERING INDEX", plan)
+        self.assertIn("(user_id=? AND product_id=?)", plan)
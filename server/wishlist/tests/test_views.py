@@ -0,0 +1,215 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from products.models import Product
+from ..models import WishlistItem
+
+User = get_user_model()
+
+
+class WishlistViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="test123"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@example.com", password="test123"
+        )
+        self.products = [
+            Product.objects.create(
+                title=f"Product {i}", price=10 + i, inventory_count=5
+            )
+            for i in range(4)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def add(self, product_id):
+        return self.client.post(reverse("wishlist"), {"product": product_id})
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(
+            self.client.get(reverse("wishlist")).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_add_is_idempotent(self):
+        response = self.add(self.products[0].id)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data, {"product": self.products[0].id, "is_wishlisted": True}
+        )
+        self.assertEqual(self.add(self.products[0].id).status_code, status.HTTP_200_OK)
+        self.assertEqual(WishlistItem.objects.filter(user=self.user).count(), 1)
+
+    def test_add_rejects_unknown_and_inactive_products(self):
+        self.products[1].is_active = False
+        self.products[1].save()
+        for product_id in (999999, self.products[1].id, "abc", ""):
+            with self.subTest(product=product_id):
+                response = self.add(product_id)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("error", response.data)
+
+    def test_list_is_newest_first_and_per_user(self):
+        self.add(self.products[0].id)
+        self.add(self.products[2].id)
+        WishlistItem.objects.create(user=self.other_user, product=self.products[3])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("wishlist"))
+
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [product["id"] for product in response.data["results"]],
+            [self.products[2].id, self.products[0].id],
+        )
+        self.assertTrue(
+            all(product["is_wishlisted"] for product in response.data["results"])
+        )
+
+    def test_remove(self):
+        self.add(self.products[0].id)
+        url = reverse("wishlist-item", args=[self.products[0].id])
+
+        self.assertEqual(
+            self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT
+        )
+        self.assertFalse(WishlistItem.objects.exists())
+        # Removing again is not an error
+        self.assertEqual(
+            self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT
+        )
+
+
+class WishlistContainsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="test123"
+        )
+        self.products = [
+            Product.objects.create(title=f"Product {i}", price=10, inventory_count=5)
+            for i in range(5)
+        ]
+        for product in self.products[1:4:2]:
+            WishlistItem.objects.create(user=self.user, product=product)
+        other = User.objects.create_user(email="other@example.com", password="x")
+        WishlistItem.objects.create(user=other, product=self.products[0])
+        self.client.force_authenticate(user=self.user)
+
+    def contains(self, ids):
+        return self.client.get(reverse("wishlist-contains"), {"ids": ids})
+
+    def test_one_query_for_many_ids(self):
+        ids = ",".join(str(product.id) for product in self.products)
+        with self.assertNumQueries(1):
+            response = self.contains(ids)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {"wishlisted": [self.products[1].id, self.products[3].id]},
+        )
+
+    def test_no_ids(self):
+        with self.assertNumQueries(0):
+            response = self.contains("")
+        self.assertEqual(response.data, {"wishlisted": []})
+
+    def test_invalid_ids(self):
+        response = self.contains("1,two")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(WISHLIST_CONTAINS_MAX_IDS=3)
+    def test_too_many_ids(self):
+        response = self.contains("1,2,3,4")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.contains("1,2,2,3").status_code, status.HTTP_200_OK)
+
+
+class ProductWishlistAnnotationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="test123"
+        )
+        self.products = [
+            Product.objects.create(title=f"Product {i}", price=10, inventory_count=5)
+            for i in range(15)
+        ]
+        for product in self.products[::3]:
+            WishlistItem.objects.create(user=self.user, product=product)
+
+    def flags(self, response):
+        return {
+            product["id"]: product["is_wishlisted"]
+            for product in response.data["results"]
+        }
+
+    def test_product_pages_flag_wishlisted_products_without_extra_queries(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse("product-list")
+        self.client.get(url, {"with_wishlist": "true"})  # caches the count
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"with_wishlist": "true"})
+
+        wishlisted = {product.id for product in self.products[::3]}
+        self.assertEqual(
+            self.flags(response),
+            {id: id in wishlisted for id in self.flags(response)},
+        )
+        self.assertIn(True, self.flags(response).values())
+
+    def test_users_share_the_catalog_count(self):
+        other = User.objects.create_user(email="other@example.com", password="x")
+        url = reverse("product-list")
+        self.client.force_authenticate(user=self.user)
+        self.client.get(url, {"with_wishlist": "true"})  # caches the count
+
+        self.client.force_authenticate(user=other)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {"with_wishlist": "true"})
+        self.client.force_authenticate(user=None)
+        with CaptureQueriesContext(connection) as anonymous:
+            self.client.get(url)
+
+        for captured in (queries, anonymous):
+            self.assertFalse(
+                [q for q in captured.captured_queries if "COUNT(" in q["sql"]]
+            )
+
+    def test_detail(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(
+            reverse("product-detail", args=[self.products[0].id]),
+            {"with_wishlist": "1"},
+        )
+        self.assertIs(response.data["is_wishlisted"], True)
+
+    def test_async_catalog_matches(self):
+        token = RefreshToken.for_user(self.user).access_token
+        headers = {"Authorization": f"Bearer {token}"}
+        sync_response = self.client.get(
+            reverse("product-list"), {"with_wishlist": "true"}, headers=headers
+        )
+        async_response = self.client.get(
+            reverse("catalog-product-list"), {"with_wishlist": "true"}, headers=headers
+        )
+        self.assertEqual(
+            [product["is_wishlisted"] for product in async_response.json()["results"]],
+            [product["is_wishlisted"] for product in sync_response.data["results"]],
+        )
+
+    def test_anonymous_users_see_nothing_wishlisted(self):
+        response = self.client.get(reverse("product-list"), {"with_wishlist": "true"})
+        self.assertEqual(set(self.flags(response).values()), {False})
+
+    def test_field_is_left_out_unless_asked_for(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("product-list"))
+        self.assertNotIn("is_wishlisted", response.data["results"][0])
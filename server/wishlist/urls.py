@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import WishlistContainsView, WishlistItemView, WishlistView
+
+urlpatterns = [
+    path("", WishlistView.as_view(), name="wishlist"),
+    path("contains/", WishlistContainsView.as_view(), name="wishlist-contains"),
+    path("<int:product_id>/", WishlistItemView.as_view(), name="wishlist-item"),
+]
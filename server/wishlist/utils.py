@@ -0,0 +1,30 @@
+from django.db.models import BooleanField, Exists, OuterRef, Value
+from .models import WishlistItem
+
+
+def wishlisted_ids(user, product_ids):
+    """
+    The ids among product_ids that user has wishlisted, in one query
+    answered from the (user, product) index
+    """
+    return set(
+        WishlistItem.objects.filter(user=user, product_id__in=product_ids)
+        .order_by()
+        .values_list("product_id", flat=True)
+    )
+
+
+def annotate_wishlisted(queryset, user):
+    """
+    Add is_wishlisted to every product of queryset as a correlated EXISTS,
+    so a page of products stays one query. Always False for anonymous users.
+    """
+    if not user.is_authenticated:
+        return queryset.annotate(
+            is_wishlisted=Value(False, output_field=BooleanField())
+        )
+    return queryset.annotate(
+        is_wishlisted=Exists(
+            WishlistItem.objects.filter(user=user, product=OuterRef("pk"))
+        )
+    )
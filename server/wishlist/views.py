@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.db.models import BooleanField, Value
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from products.models import Product
+from products.serializers import ProductSerializer
+from .models import WishlistItem
+from .utils import wishlisted_ids
+
+
+class WishlistView(generics.ListCreateAPIView):
+    """
+    GET: the user's wishlisted products, most recently added first.
+    POST {"product": id}: add a product; adding it again is a no-op.
+    """
+
+    # Lets schema generation find the model without a signed-in user
+    queryset = Product.objects.none()
+    serializer_class = ProductSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return (
+            Product.objects.filter(
+                wishlisted_by__user=self.request.user, is_active=True
+            )
+            .annotate(is_wishlisted=Value(True, output_field=BooleanField()))
+            .order_by("-wishlisted_by__created_at", "-wishlisted_by__id")
+        )
+
+    def create(self, request, *args, **kwargs):
+        try:
+            product_id = int(request.data.get("product"))
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "product must be a product id"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not Product.objects.filter(pk=product_id, is_active=True).exists():
+            return Response(
+                {"error": "Product not found"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        _, created = WishlistItem.objects.get_or_create(
+            user=request.user, product_id=product_id
+        )
+        return Response(
+            {"product": product_id, "is_wishlisted": True},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class WishlistItemView(APIView):
+    """DELETE: remove a product from the wishlist (no-op if it is not there)"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def delete(self, request, product_id):
+        WishlistItem.objects.filter(user=request.user, product_id=product_id).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class WishlistContainsView(APIView):
+    """
+    GET ?ids=1,2,3: which of these products the user has wishlisted, for
+    drawing the heart on a page of product cards with one request
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        raw = request.query_params.get("ids", "")
+        try:
+            product_ids = {int(value) for value in raw.split(",") if value.strip()}
+        except ValueError:
+            return Response(
+                {"error": "ids must be comma-separated product ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(product_ids) > settings.WISHLIST_CONTAINS_MAX_IDS:
+            return Response(
+                {
+                    "error": f"At most {settings.WISHLIST_CONTAINS_MAX_IDS} "
+                    "ids per request"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        found = wishlisted_ids(request.user, product_ids) if product_ids else set()
+        return Response({"wishlisted": sorted(found)})